@@ -0,0 +1,127 @@
+# copyright (c) 2025 PaddlePaddle Authors. All Rights Reserve.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Micro benchmark of the inference preprocessing ops: NormalizeImage followed
+by ToCHWImage against the fused NormalizeCHWImage for detection inputs, and
+the per crop recognition resize and normalize loop against
+ResizeNormalizeBatch.
+
+    python benchmark/benchmark_preprocess.py --repeat 50
+"""
+
+from __future__ import print_function
+
+import argparse
+import math
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+__dir__ = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(__dir__, "..")))
+
+from ppocr.data.imaug.operators import (
+    NormalizeCHWImage,
+    NormalizeImage,
+    ResizeNormalizeBatch,
+    ToCHWImage,
+)
+
+DET_NORMALIZE = {
+    "std": [0.229, 0.224, 0.225],
+    "mean": [0.485, 0.456, 0.406],
+    "scale": "1./255.",
+    "order": "hwc",
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--det_size", type=int, nargs=2, default=[960, 736])
+    parser.add_argument("--rec_batch_num", type=int, default=6)
+    parser.add_argument("--rec_image_shape", type=str, default="3, 48, 320")
+    return parser.parse_args()
+
+
+def timeit(func, repeat):
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def rec_reference(crops, imgC, imgH, imgW):
+    norm_img_batch = []
+    for img in crops:
+        h, w = img.shape[:2]
+        ratio = w / float(h)
+        if math.ceil(imgH * ratio) > imgW:
+            resized_w = imgW
+        else:
+            resized_w = int(math.ceil(imgH * ratio))
+        resized_image = cv2.resize(img, (resized_w, imgH))
+        resized_image = resized_image.astype("float32")
+        resized_image = resized_image.transpose((2, 0, 1)) / 255
+        resized_image -= 0.5
+        resized_image /= 0.5
+        padding_im = np.zeros((imgC, imgH, imgW), dtype=np.float32)
+        padding_im[:, :, 0:resized_w] = resized_image
+        norm_img_batch.append(padding_im[np.newaxis, :])
+    return np.concatenate(norm_img_batch).copy()
+
+
+def main(args):
+    rng = np.random.default_rng(0)
+    height, width = args.det_size
+    det_img = rng.integers(0, 256, (height, width, 3)).astype(np.uint8)
+    normalize, to_chw = NormalizeImage(**DET_NORMALIZE), ToCHWImage()
+    fused = NormalizeCHWImage(**DET_NORMALIZE)
+    results = [
+        (
+            "det NormalizeImage+ToCHWImage",
+            timeit(lambda: to_chw(normalize({"image": det_img})), args.repeat),
+        ),
+        (
+            "det NormalizeCHWImage",
+            timeit(lambda: fused({"image": det_img}), args.repeat),
+        ),
+    ]
+
+    imgC, imgH, imgW = [int(v) for v in args.rec_image_shape.split(",")]
+    crops = [
+        rng.integers(0, 256, (imgH, int(w), 3)).astype(np.uint8)
+        for w in rng.integers(imgH, imgW, args.rec_batch_num)
+    ]
+    batch_op = ResizeNormalizeBatch(scale=1.0 / 255, mean=[0.5] * 3, std=[0.5] * 3)
+    results += [
+        (
+            "rec resize_norm_img loop",
+            timeit(lambda: rec_reference(crops, imgC, imgH, imgW), args.repeat),
+        ),
+        (
+            "rec ResizeNormalizeBatch",
+            timeit(lambda: batch_op(crops, (imgC, imgH, imgW)), args.repeat),
+        ),
+    ]
+    for name, elapse in results:
+        print("{:<32s}{:>10.3f} ms".format(name, elapse))
+
+
+if __name__ == "__main__":
+    main(parse_args())
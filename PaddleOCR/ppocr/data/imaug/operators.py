@@ -109,6 +109,108 @@ class ToCHWImage(object):
         return data
 
 
+class NormalizeCHWImage(object):
+    """
+    NormalizeImage with order "hwc" and ToCHWImage fused: uint8 HWC in,
+    normalized float32 CHW out in one pass per channel. (img * scale - mean) / std
+    is folded into img * alpha + beta and written straight into the CHW output,
+    without the float copy, the broadcast temporaries and the transpose copy.
+    """
+
+    def __init__(self, scale=None, mean=None, std=None, **kwargs):
+        if isinstance(scale, str):
+            scale = eval(scale)
+        scale = np.float32(scale if scale is not None else 1.0 / 255.0)
+        mean = np.array(mean if mean is not None else [0.485, 0.456, 0.406])
+        std = np.array(std if std is not None else [0.229, 0.224, 0.225])
+        self.alpha = (scale / std).astype("float32").reshape(-1)
+        self.beta = (-mean / std).astype("float32").reshape(-1)
+
+    def normalize(self, img, out):
+        """
+        args:
+            img(array): uint8 image with shape [H, W, C] or [H, W]
+            out(array): float32 output with shape [C, H, W], may be a view
+        """
+        if img.ndim == 2:
+            img = img[:, :, np.newaxis]
+        for c in range(out.shape[0]):
+            i = c if len(self.alpha) > 1 else 0
+            np.multiply(img[:, :, c], self.alpha[i], out=out[c], dtype=np.float32)
+            out[c] += self.beta[i]
+        return out
+
+    def __call__(self, data):
+        img = data["image"]
+        from PIL import Image
+
+        if isinstance(img, Image.Image):
+            img = np.array(img)
+        assert isinstance(img, np.ndarray), "invalid input 'img' in NormalizeCHWImage"
+        channels = img.shape[2] if img.ndim == 3 else 1
+        out = np.empty((channels,) + img.shape[:2], dtype=np.float32)
+        data["image"] = self.normalize(img, out)
+        return data
+
+
+class ResizeNormalizeBatch(object):
+    """
+    Resize text line crops to a fixed height keeping their aspect ratio, and
+    normalize and right pad them into one float32 batch of shape
+    [N, C, H, W] with NormalizeCHWImage. The batch is written into a buffer
+    that is reused by the next call, so it is only valid until then.
+    """
+
+    def __init__(self, scale=None, mean=None, std=None, **kwargs):
+        self.normalize_op = NormalizeCHWImage(scale=scale, mean=mean, std=std)
+        self.buffer = np.zeros((0,), dtype=np.float32)
+
+    def __call__(self, imgs, image_shape):
+        """
+        args:
+            imgs(list): uint8 crops with shape [h, w, C] or [h, w]
+            image_shape(list): [C, H, W], W is the padded batch width
+        return:
+            batch(array): float32 array with shape [N, C, H, W]
+        """
+        imgC, imgH, imgW = image_shape
+        size = len(imgs) * imgC * imgH * imgW
+        if self.buffer.size < size:
+            self.buffer = np.empty((max(size, 2 * self.buffer.size),), np.float32)
+        batch = self.buffer[:size].reshape(len(imgs), imgC, imgH, imgW)
+        for i, img in enumerate(imgs):
+            h, w = img.shape[:2]
+            ratio = w / float(h)
+            if math.ceil(imgH * ratio) > imgW:
+                resized_w = imgW
+            else:
+                resized_w = int(math.ceil(imgH * ratio))
+            if (h, w) != (imgH, resized_w):
+                img = cv2.resize(img, (resized_w, imgH))
+            self.normalize_op.normalize(img, batch[i, :, :, :resized_w])
+            batch[i, :, :, resized_w:] = 0
+        return batch
+
+
+def fuse_normalize_chw(op_param_list):
+    """
+    Replace NormalizeImage with order "hwc" directly followed by ToCHWImage in
+    a list of operator configs with the equivalent NormalizeCHWImage
+    """
+    fused = []
+    for op in op_param_list:
+        if (
+            fused
+            and list(op) == ["ToCHWImage"]
+            and list(fused[-1]) == ["NormalizeImage"]
+            and (fused[-1]["NormalizeImage"] or {}).get("order", "chw") == "hwc"
+        ):
+            fused[-1] = {"NormalizeCHWImage": fused[-1]["NormalizeImage"]}
+        else:
+            fused.append(op)
+    return fused
+
+
 class Fasttext(object):
     def __init__(self, path="None", **kwargs):
         import fasttext
@@ -49,6 +49,10 @@ class BaseRecLabelDecode(object):
         for i, char in enumerate(dict_character):
             self.dict[char] = i
         self.character = dict_character
+        # lookup tables of decode_batch and get_word_info
+        self.character_array = np.array(dict_character, dtype=object)
+        self.character_len = np.array([len(c) for c in dict_character], dtype=np.int64)
+        self.char_state = {c: self.get_char_state(c) for c in dict_character}
 
     def pred_reverse(self, pred):
         pred_re = []
@@ -69,6 +73,15 @@ class BaseRecLabelDecode(object):
     def add_special_char(self, dict_character):
         return dict_character
 
+    @staticmethod
+    def get_char_state(char):
+        """the grouping type of a single character, see get_word_info"""
+        if "\u4e00" <= char <= "\u9fff":
+            return "cn"
+        if char.isascii() and char.isalnum():
+            return "en&num"
+        return "splitter"
+
     def get_word_info(self, text, selection):
         """
         Group the decoded characters and record the corresponding decoded positions.
@@ -93,18 +106,15 @@ class BaseRecLabelDecode(object):
         valid_col = np.where(selection == True)[0]
 
         for c_i, char in enumerate(text):
-            if "\u4e00" <= char <= "\u9fff":
-                c_state = "cn"
-            elif bool(re.search("[a-zA-Z0-9]", char)):
-                c_state = "en&num"
-            else:
-                c_state = "splitter"
+            c_state = self.char_state.get(char)
+            if c_state is None:
+                c_state = self.get_char_state(char)
 
             if (
                 char == "."
                 and state == "en&num"
                 and c_i + 1 < len(text)
-                and bool(re.search("[0-9]", text[c_i + 1]))
+                and "0" <= text[c_i + 1] <= "9"
             ):  # grouping floating number
                 c_state = "en&num"
             if (
@@ -143,6 +153,10 @@ class BaseRecLabelDecode(object):
         return_word_box=False,
     ):
         """convert text-index into text-label."""
+        if isinstance(text_index, np.ndarray) and text_index.ndim == 2:
+            return self.decode_batch(
+                text_index, text_prob, is_remove_duplicate, return_word_box
+            )
         result_list = []
         ignored_tokens = self.get_ignored_tokens()
         batch_size = len(text_index)
@@ -188,6 +202,64 @@ class BaseRecLabelDecode(object):
                 result_list.append((text, np.mean(conf_list).tolist()))
         return result_list
 
+    def decode_batch(
+        self,
+        text_index,
+        text_prob=None,
+        is_remove_duplicate=False,
+        return_word_box=False,
+    ):
+        """
+        decode, vectorized over the batch: the selection of decoded columns,
+        the confidences and the index to character mapping are computed for
+        all samples at once, only the per sample strings are sliced in python
+        args:
+            text_index(array): indices with shape [batch_size, length]
+            text_prob(array): probabilities with shape [batch_size, length]
+        """
+        text_index = np.asarray(text_index)
+        selection = np.ones(text_index.shape, dtype=bool)
+        if is_remove_duplicate:
+            selection[:, 1:] = text_index[:, 1:] != text_index[:, :-1]
+        selection &= ~np.isin(text_index, self.get_ignored_tokens())
+        counts = selection.sum(axis=1)
+        if text_prob is not None:
+            text_prob = np.asarray(text_prob)
+            conf_sum = np.where(selection, text_prob, 0).sum(axis=1)
+            conf = conf_sum / np.maximum(counts, 1).astype(conf_sum.dtype)
+        else:
+            conf = np.ones(len(text_index))
+        conf = conf.tolist()
+
+        decoded = text_index[selection]
+        all_text = "".join(self.character_array[decoded].tolist())
+        char_end = np.cumsum(self.character_len[decoded]).tolist()
+        char_end.insert(0, 0)
+        row_end = np.cumsum(counts).tolist()
+        row_end.insert(0, 0)
+
+        result_list = []
+        for batch_idx in range(len(text_index)):
+            text = all_text[
+                char_end[row_end[batch_idx]] : char_end[row_end[batch_idx + 1]]
+            ]
+            if self.reverse:  # for arabic rec
+                text = self.pred_reverse(text)
+            if return_word_box:
+                word_list, word_col_list, state_list = self.get_word_info(
+                    text, selection[batch_idx]
+                )
+                result_list.append(
+                    (
+                        text,
+                        conf[batch_idx],
+                        [text_index.shape[1], word_list, word_col_list, state_list],
+                    )
+                )
+            else:
+                result_list.append((text, conf[batch_idx]))
+        return result_list
+
     def get_ignored_tokens(self):
         return [0]  # for ctc blank
 
@@ -0,0 +1,202 @@
+# copyright (c) 2025 PaddlePaddle Authors. All Rights Reserve.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Batched text crops for recognition.
+
+get_rotate_crop_image warps every box to its own size, rotates tall crops
+with np.rot90 and leaves the resize to the recognition height to
+resize_norm_img, so every crop is allocated and resampled twice. CropArena
+computes the perspective transforms of all boxes in one vectorized solve,
+folds the rotation and the resize into them, and warps each box once
+straight into a slot of a shared buffer at the recognition input height.
+Axis-aligned boxes skip the perspective warp and are resized from a slice
+of the image.
+"""
+
+import math
+
+import cv2
+import numpy as np
+
+__all__ = ["CropArena", "minarea_rect_points", "perspective_transforms"]
+
+
+def minarea_rect_points(points):
+    """
+    Corners of the minimum area rectangle of a polygon, ordered as
+    top-left, top-right, bottom-right, bottom-left
+    """
+    bounding_box = cv2.minAreaRect(np.array(points).astype(np.int32))
+    points = sorted(list(cv2.boxPoints(bounding_box)), key=lambda x: x[0])
+
+    index_a, index_b, index_c, index_d = 0, 1, 2, 3
+    if points[1][1] > points[0][1]:
+        index_a = 0
+        index_d = 1
+    else:
+        index_a = 1
+        index_d = 0
+    if points[3][1] > points[2][1]:
+        index_b = 2
+        index_c = 3
+    else:
+        index_b = 3
+        index_c = 2
+
+    return np.array(
+        [points[index_a], points[index_b], points[index_c], points[index_d]]
+    )
+
+
+def perspective_transforms(src, dst):
+    """
+    cv2.getPerspectiveTransform for a batch of quadrilaterals
+    args:
+        src(array): source corners with shape [N, 4, 2]
+        dst(array): destination corners with shape [N, 4, 2]
+    return:
+        transforms(array): matrices with shape [N, 3, 3]
+    """
+    src = np.asarray(src, dtype=np.float64)
+    dst = np.asarray(dst, dtype=np.float64)
+    n = len(src)
+    x, y = src[:, :, 0], src[:, :, 1]
+    u, v = dst[:, :, 0], dst[:, :, 1]
+    zeros, ones = np.zeros_like(x), np.ones_like(x)
+    rows_u = np.stack([x, y, ones, zeros, zeros, zeros, -x * u, -y * u], axis=2)
+    rows_v = np.stack([zeros, zeros, zeros, x, y, ones, -x * v, -y * v], axis=2)
+    a = np.concatenate([rows_u, rows_v], axis=1)
+    b = np.concatenate([u, v], axis=1)
+    h = np.linalg.solve(a, b[:, :, None])[:, :, 0]
+    return np.concatenate([h, np.ones((n, 1))], axis=1).reshape(n, 3, 3)
+
+
+class CropArena(object):
+    """
+    Crops of the text boxes of one image, height-normalized to the
+    recognition input height and stored back to back in one buffer.
+    The buffer is kept and grown as needed, so an arena reused for the
+    next image does not allocate again; crops of the previous fill are
+    overwritten.
+    """
+
+    def __init__(self, height):
+        self.height = height
+        self.buffer = np.zeros((0,), dtype=np.uint8)
+
+    def _reserve(self, size):
+        if self.buffer.size < size:
+            self.buffer = np.empty((max(size, 2 * self.buffer.size),), dtype=np.uint8)
+
+    def crop(self, img, boxes, box_type="quad"):
+        """
+        Crop text boxes of img, same geometry as get_rotate_crop_image /
+        get_minarea_rect_crop followed by the resize of resize_norm_img.
+        args:
+            img(array): image with shape [H, W, C] or [H, W]
+            boxes(list): boxes with shape [4, 2], or polygons for "poly"
+        return:
+            crops(list): views into the arena with shape [height, w_i(, C)]
+        """
+        if len(boxes) == 0:
+            return []
+        if box_type == "quad":
+            points = np.asarray(boxes, dtype=np.float32).reshape(-1, 4, 2)
+        else:
+            points = np.stack([minarea_rect_points(box) for box in boxes])
+        points = points.astype(np.float32)
+
+        crop_w = np.maximum(
+            np.linalg.norm(points[:, 0] - points[:, 1], axis=1),
+            np.linalg.norm(points[:, 2] - points[:, 3], axis=1),
+        ).astype(np.int64)
+        crop_h = np.maximum(
+            np.linalg.norm(points[:, 0] - points[:, 3], axis=1),
+            np.linalg.norm(points[:, 1] - points[:, 2], axis=1),
+        ).astype(np.int64)
+        crop_w, crop_h = np.maximum(crop_w, 1), np.maximum(crop_h, 1)
+        # tall crops are read rotated by 90 degrees counterclockwise
+        rotate = crop_h / crop_w >= 1.5
+        out_src_w = np.where(rotate, crop_h, crop_w)
+        out_src_h = np.where(rotate, crop_w, crop_h)
+        out_w = np.array(
+            [
+                max(1, math.ceil(self.height * w / float(h)))
+                for w, h in zip(out_src_w, out_src_h)
+            ]
+        )
+
+        # destination corners of the warp straight to the output size,
+        # rotation folded in: (x, y) -> (y, W - x)
+        sx = out_w / out_src_w
+        sy = self.height / out_src_h
+        w = crop_w.astype(np.float64)
+        h = crop_h.astype(np.float64)
+        zero = np.zeros_like(w)
+        dst_x = np.where(
+            rotate[:, None],
+            np.stack([zero, zero, h, h], axis=1),
+            np.stack([zero, w, w, zero], axis=1),
+        )
+        dst_y = np.where(
+            rotate[:, None],
+            np.stack([w, zero, zero, w], axis=1),
+            np.stack([zero, zero, h, h], axis=1),
+        )
+        dst = np.stack([dst_x * sx[:, None], dst_y * sy[:, None]], axis=2)
+
+        rounded = np.round(points)
+        axis_aligned = (
+            ~rotate
+            & np.all(rounded == points, axis=(1, 2))
+            & (points[:, 0, 1] == points[:, 1, 1])
+            & (points[:, 2, 1] == points[:, 3, 1])
+            & (points[:, 0, 0] == points[:, 3, 0])
+            & (points[:, 1, 0] == points[:, 2, 0])
+            & (points[:, 1, 0] - points[:, 0, 0] == crop_w)
+            & (points[:, 3, 1] - points[:, 0, 1] == crop_h)
+            & (points[:, 0, 0] >= 0)
+            & (points[:, 0, 1] >= 0)
+            & (points[:, 2, 0] <= img.shape[1])
+            & (points[:, 2, 1] <= img.shape[0])
+        )
+        transforms = perspective_transforms(points, dst)
+
+        channel_shape = img.shape[2:]
+        sizes = self.height * out_w * int(np.prod(channel_shape))
+        offsets = np.concatenate([[0], np.cumsum(sizes)])
+        self._reserve(int(offsets[-1]))
+        crops = []
+        for i in range(len(points)):
+            view = self.buffer[offsets[i] : offsets[i + 1]].reshape(
+                (self.height, int(out_w[i])) + channel_shape
+            )
+            if axis_aligned[i]:
+                x0, y0 = int(points[i, 0, 0]), int(points[i, 0, 1])
+                cv2.resize(
+                    img[y0 : y0 + crop_h[i], x0 : x0 + crop_w[i]],
+                    (int(out_w[i]), self.height),
+                    dst=view,
+                )
+            else:
+                cv2.warpPerspective(
+                    img,
+                    transforms[i],
+                    (int(out_w[i]), self.height),
+                    dst=view,
+                    borderMode=cv2.BORDER_REPLICATE,
+                    flags=cv2.INTER_LINEAR,
+                )
+            crops.append(view)
+        return crops
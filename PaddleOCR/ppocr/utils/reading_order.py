@@ -0,0 +1,142 @@
+# copyright (c) 2025 PaddlePaddle Authors. All Rights Reserve.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Reading order of detected text boxes.
+
+Boxes are grouped into lines by sweeping over their sorted y centers: a new
+line starts at the first center at least `y_tol` below the first center of
+the current line. Lines are read top to bottom and boxes within a line left
+to right. All steps are sorts, binary searches and cumulative sums, so
+ordering n boxes is O(n log n).
+
+With `columns=True`, vertical gutters between text columns are detected
+from the x extents of the boxes. Columns are read one after another, and
+boxes spanning several columns (titles, full-width paragraphs) split the
+page into sections that are read in between.
+"""
+
+import numpy as np
+
+__all__ = ["reading_order", "sort_boxes"]
+
+
+def _box_extents(boxes):
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(len(boxes), -1, 2)
+    x_min, x_max = boxes[:, :, 0].min(axis=1), boxes[:, :, 0].max(axis=1)
+    y_min, y_max = boxes[:, :, 1].min(axis=1), boxes[:, :, 1].max(axis=1)
+    return boxes, x_min, x_max, y_min, y_max
+
+
+def _line_ids(y_center, y_tol):
+    """
+    Line index of every box, increasing from top to bottom. A line is
+    anchored at its topmost center and holds the centers less than y_tol
+    below it, so densely spaced lines never chain into one.
+    """
+    order = np.argsort(y_center, kind="stable")
+    centers = y_center[order]
+    starts = [0]
+    while True:
+        start = np.searchsorted(centers, centers[starts[-1]] + y_tol, side="left")
+        if start >= len(centers):
+            break
+        starts.append(start)
+    new_line = np.zeros(len(centers), dtype=np.int64)
+    new_line[starts[1:]] = 1
+    line_ids = np.empty(len(y_center), dtype=np.int64)
+    line_ids[order] = np.cumsum(new_line)
+    return line_ids
+
+
+def _find_columns(x_min, x_max, min_column_gap, span_ratio):
+    """
+    Merge the x extents of the boxes narrower than span_ratio of the page
+    into column intervals separated by gutters of at least min_column_gap.
+    Returns the column start and end coordinates.
+    """
+    page_width = x_max.max() - x_min.min()
+    narrow = np.flatnonzero((x_max - x_min) < span_ratio * page_width)
+    if narrow.size == 0:
+        return x_min[:1], x_max[:1]
+    order = narrow[np.argsort(x_min[narrow], kind="stable")]
+    starts, ends = x_min[order], np.maximum.accumulate(x_max[order])
+    split = np.flatnonzero(starts[1:] - ends[:-1] >= min_column_gap) + 1
+    column_starts = starts[np.concatenate([[0], split])]
+    column_ends = ends[np.concatenate([split - 1, [len(order) - 1]])]
+    return column_starts, column_ends
+
+
+def reading_order(boxes, y_tol=10, columns=False, min_column_gap=None, span_ratio=0.5):
+    """
+    Compute the reading order of text boxes.
+
+    args:
+        boxes(array): boxes with shape [N, K, 2], K >= 2 points per box
+        y_tol(float): boxes whose y centers are less than this below the
+            topmost center of a line are on that line
+        columns(bool): detect text columns and read them one after another
+        min_column_gap(float): minimum gutter width between columns,
+            defaults to twice y_tol
+        span_ratio(float): boxes at least this fraction of the page wide
+            never define a column
+    return:
+        indices(array): box indices in reading order
+    """
+    if len(boxes) == 0:
+        return np.zeros((0,), dtype=np.int64)
+    boxes, x_min, x_max, y_min, y_max = _box_extents(boxes)
+    y_center = (y_min + y_max) / 2
+    line_ids = _line_ids(y_center, y_tol)
+    x_key = boxes[:, 0, 0]
+    if not columns:
+        return np.lexsort((x_key, line_ids))
+
+    if min_column_gap is None:
+        min_column_gap = 2 * y_tol
+    column_starts, column_ends = _find_columns(x_min, x_max, min_column_gap, span_ratio)
+    if len(column_starts) < 2:
+        return np.lexsort((x_key, line_ids))
+
+    # a box belongs to the column its left edge falls in and spans every
+    # column that starts before its right edge
+    first_column = np.clip(
+        np.searchsorted(column_starts, x_min, side="right") - 1, 0, None
+    )
+    last_column = np.searchsorted(column_starts, x_max, side="left") - 1
+    spanning = last_column > first_column
+    # a box starting in a gutter belongs to the following column
+    in_gutter = x_min > column_ends[first_column]
+    column = np.where(in_gutter & ~spanning, first_column + 1, first_column)
+    column = np.minimum(column, len(column_starts) - 1)
+
+    # spanning boxes separate sections: section k holds the column boxes
+    # between spanning boxes k - 1 and k, spanning box k is read after it
+    span_index = np.flatnonzero(spanning)
+    span_y = np.sort(y_center[span_index])
+    section = np.searchsorted(span_y, y_center, side="left")
+    kind = spanning.astype(np.int64)
+    column[span_index] = 0
+    return np.lexsort((x_key, line_ids, column, kind, section))
+
+
+def sort_boxes(dt_boxes, y_tol=10, columns=False, **kwargs):
+    """
+    Sort text boxes in reading order, see reading_order
+    args:
+        dt_boxes(array): detected text boxes with shape [N, 4, 2]
+    return:
+        sorted boxes(list) of arrays with shape [4, 2]
+    """
+    order = reading_order(dt_boxes, y_tol=y_tol, columns=columns, **kwargs)
+    return [dt_boxes[i] for i in order]
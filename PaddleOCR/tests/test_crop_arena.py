@@ -0,0 +1,97 @@
+import math
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "..")))
+
+from ppocr.utils.crop_arena import CropArena, perspective_transforms
+from tools.infer.utility import get_minarea_rect_crop, get_rotate_crop_image
+
+HEIGHT = 48
+
+
+def make_image(seed, height=600, width=800):
+    """A smooth random image, so resampling differences stay small."""
+    rng = np.random.default_rng(seed)
+    img = rng.integers(0, 255, (height // 40, width // 40, 3)).astype(np.uint8)
+    return cv2.resize(img, (width, height), interpolation=cv2.INTER_CUBIC)
+
+
+def reference_crop(img, box, box_type="quad"):
+    if box_type == "quad":
+        crop = get_rotate_crop_image(img, box.copy())
+    else:
+        crop = get_minarea_rect_crop(img, box)
+    h, w = crop.shape[:2]
+    return cv2.resize(crop, (int(math.ceil(HEIGHT * w / float(h))), HEIGHT))
+
+
+def test_axis_aligned_boxes_are_exact():
+    img = make_image(0)
+    boxes = [
+        np.array([[x, y], [x + w, y], [x + w, y + h], [x, y + h]], dtype=np.float32)
+        for x, y, w, h in [(10, 20, 200, 30), (300, 100, 45, 48), (0, 0, 800, 64)]
+    ]
+    crops = CropArena(HEIGHT).crop(img, boxes)
+    for crop, box in zip(crops, boxes):
+        np.testing.assert_array_equal(crop, reference_crop(img, box))
+
+
+@pytest.mark.parametrize("angle", [-8.0, 3.5, 30.0])
+def test_rotated_and_tall_boxes_match_reference(angle):
+    img = make_image(1)
+    rects = [((400, 300), (220, 24), angle), ((200, 300), (18, 150), angle)]
+    boxes = [cv2.boxPoints(rect) for rect in rects]
+    # start at the top-left corner like detected boxes
+    boxes = [
+        np.roll(np.float32(box), -int(np.argmin(box.sum(axis=1))), axis=0)
+        for box in boxes
+    ]
+    crops = CropArena(HEIGHT).crop(img, boxes)
+    for crop, box in zip(crops, boxes):
+        expected = reference_crop(img, box)
+        assert crop.shape == expected.shape
+        # one bilinear warp against a bicubic warp followed by a resize
+        assert np.abs(crop.astype(np.float32) - expected).mean() < 3
+
+
+def test_poly_boxes_use_min_area_rect():
+    img = make_image(2)
+    poly = np.array([[100, 100], [300, 90], [320, 130], [200, 140], [110, 135]])
+    crop = CropArena(HEIGHT).crop(img, [poly], box_type="poly")[0]
+    expected = reference_crop(img, poly, box_type="poly")
+    assert crop.shape == expected.shape
+    assert np.abs(crop.astype(np.float32) - expected).mean() < 2
+
+
+def test_crops_share_one_buffer():
+    img = make_image(3)
+    boxes = [
+        np.array([[10, 10 + i], [90, 10 + i], [90, 40 + i], [10, 40 + i]], np.float32)
+        for i in range(0, 200, 20)
+    ]
+    arena = CropArena(HEIGHT)
+    crops = arena.crop(img, boxes)
+    buffer = arena.buffer
+    for crop in crops:
+        assert crop.base is buffer
+        assert crop.flags["C_CONTIGUOUS"]
+    # a smaller fill reuses the buffer
+    arena.crop(img, boxes[:3])
+    assert arena.buffer is buffer
+    assert arena.crop(img, []) == []
+
+
+def test_perspective_transforms_map_corners():
+    rng = np.random.default_rng(4)
+    src = rng.uniform(0, 500, (6, 4, 2))
+    dst = rng.uniform(0, 100, (6, 4, 2))
+    transforms = perspective_transforms(src, dst)
+    for transform, s, d in zip(transforms, src, dst):
+        mapped = cv2.perspectiveTransform(s[None], transform)[0]
+        np.testing.assert_allclose(mapped, d, atol=1e-6)
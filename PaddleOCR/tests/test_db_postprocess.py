@@ -0,0 +1,140 @@
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "..")))
+
+from ppocr.postprocess.db_postprocess import DBPostProcess
+
+# The closed form is the exact offset, unclip + get_mini_boxes quantizes the
+# rectangle to integers on the way in and out of pyclipper. The accepted
+# difference is 2.5px of the bitmap for corners and short sides, and the
+# corner order must match unless get_mini_boxes decides it by less than that.
+UNCLIP_TOLERANCE = 2.5
+
+
+def make_text_page(seed, height=480, width=640):
+    """A probability map with rows of text-line blobs, some of them rotated."""
+    rng = np.random.default_rng(seed)
+    pred = rng.uniform(0, 0.2, (height, width)).astype(np.float32)
+    for y in range(12, height - 24, 18):
+        x = 6
+        while True:
+            w = int(rng.integers(20, 140))
+            if x + w >= width - 6:
+                break
+            rect = ((x + w / 2, y + 5), (w, 9), float(rng.uniform(-3, 3)))
+            points = cv2.boxPoints(rect).astype(np.int32)
+            cv2.fillPoly(pred, [points], float(rng.uniform(0.55, 1.0)))
+            x += w + int(rng.integers(6, 30))
+    return pred
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("dest_size", [(640, 480), (1280, 960), (500, 420)])
+def test_vectorized_boxes_match_per_contour_loop(seed, dest_size):
+    pred = make_text_page(seed)
+    bitmap = pred > 0.3
+    reference = DBPostProcess(box_thresh=0.6, unclip_ratio=1.5, use_vectorized=False)
+    vectorized = DBPostProcess(box_thresh=0.6, unclip_ratio=1.5)
+
+    ref_boxes, ref_scores = reference.boxes_from_bitmap(pred, bitmap, *dest_size)
+    boxes, scores = vectorized.boxes_from_bitmap(pred, bitmap, *dest_size)
+
+    assert len(ref_boxes) > 50
+    assert boxes.dtype == np.int32
+    assert boxes.shape == ref_boxes.shape
+    np.testing.assert_allclose(scores, ref_scores, atol=1e-6)
+    # UNCLIP_TOLERANCE scaled to the destination, plus the final rounding
+    scale = max(dest_size[0] / 640, dest_size[1] / 480)
+    assert np.abs(boxes - ref_boxes).max() <= UNCLIP_TOLERANCE * scale + 1
+
+
+def test_box_score_batch_with_overlapping_boxes():
+    rng = np.random.default_rng(3)
+    pred = rng.uniform(0, 1, (100, 100)).astype(np.float32)
+    boxes = np.array(
+        [
+            [[10, 10], [40, 10], [40, 30], [10, 30]],
+            [[30, 20], [60, 20], [60, 45], [30, 45]],
+            [[70, 70], [95, 68], [96, 80], [71, 82]],
+            [[-5, 90], [20, 90], [20, 105], [-5, 105]],
+        ],
+        dtype=np.float32,
+    )
+    post_process = DBPostProcess()
+    expected = [post_process.box_score_fast(pred, box) for box in boxes]
+    np.testing.assert_allclose(post_process.box_score_batch(pred, boxes), expected)
+
+
+def test_disjoint_boxes_sweep():
+    rng = np.random.default_rng(4)
+    xmin = rng.integers(0, 400, 300)
+    ymin = rng.integers(0, 400, 300)
+    xmax = xmin + rng.integers(0, 60, 300)
+    ymax = ymin + rng.integers(0, 20, 300)
+
+    picked = DBPostProcess._disjoint_boxes(xmin, xmax, ymin, ymax)
+
+    overlap = (
+        (xmin[:, None] <= xmax[None])
+        & (xmin[None] <= xmax[:, None])
+        & (ymin[:, None] <= ymax[None])
+        & (ymin[None] <= ymax[:, None])
+    )
+    np.fill_diagonal(overlap, False)
+    # picked boxes can share the label map, every other box overlaps one
+    assert not overlap[np.ix_(picked, picked)].any()
+    assert overlap[np.ix_(~picked, picked)].any(axis=1).all()
+
+
+def ordering_margin(box):
+    # how close get_mini_boxes is to picking a different first corner
+    box = box[np.argsort(box[:, 0], kind="stable")]
+    return min(
+        box[2, 0] - box[1, 0], abs(box[1, 1] - box[0, 1]), abs(box[3, 1] - box[2, 1])
+    )
+
+
+def test_unclip_rects_matches_pyclipper():
+    rng = np.random.default_rng(5)
+    post_process = DBPostProcess()
+    rects = [
+        (
+            (rng.uniform(50, 500), rng.uniform(50, 500)),
+            (rng.uniform(4, 300), rng.uniform(4, 40)),
+            rng.uniform(-90, 90),
+        )
+        for _ in range(1000)
+    ]
+    rects += [((50.5, 40.0), (80.0, 12.0), 90.0), ((60.0, 60.0), (45.3, 20.7), 17.0)]
+    for rect in rects:
+        points, _ = post_process.get_mini_boxes(cv2.boxPoints(rect))
+        rect = cv2.minAreaRect(np.array(points, dtype=np.float32))
+        expanded = post_process.unclip(np.array(points), 1.5)
+        ref_box, ref_sside = post_process.get_mini_boxes(
+            np.array(expanded).reshape(-1, 1, 2)
+        )
+        ref_box = np.array(ref_box)
+
+        boxes, sside = post_process.unclip_rects([rect], 1.5)
+
+        assert sside[0] == pytest.approx(ref_sside, abs=UNCLIP_TOLERANCE)
+        if ordering_margin(boxes[0]) >= UNCLIP_TOLERANCE:
+            np.testing.assert_allclose(boxes[0], ref_box, atol=UNCLIP_TOLERANCE)
+        else:
+            error = min(
+                np.abs(np.roll(boxes[0], k, axis=0) - ref_box).max() for k in range(4)
+            )
+            assert error <= UNCLIP_TOLERANCE
+
+
+def test_vectorized_empty_bitmap():
+    pred = np.zeros((64, 64), dtype=np.float32)
+    boxes, scores = DBPostProcess().boxes_from_bitmap(pred, pred > 0.3, 64, 64)
+    assert len(boxes) == 0
+    assert scores == []
@@ -0,0 +1,108 @@
+import os
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "..")))
+
+import tools.infer.predict_det as predict_det
+from tools.infer.utility import init_args
+
+
+class StubTensor(object):
+    def __init__(self):
+        self.value = None
+
+    def copy_from_cpu(self, value):
+        self.value = value
+
+    def copy_to_cpu(self):
+        return self.value
+
+
+class StubPredictor(object):
+    """Per-pixel model: dark pixels of the normalized input are text."""
+
+    def __init__(self, input_tensor, output_tensor):
+        self.input_tensor = input_tensor
+        self.output_tensor = output_tensor
+        self.batch_sizes = []
+
+    def run(self):
+        img = self.input_tensor.value
+        self.batch_sizes.append(len(img))
+        prob = (img.mean(axis=1, keepdims=True) < -1.0).astype(np.float32)
+        self.output_tensor.copy_from_cpu(prob)
+
+
+@pytest.fixture
+def make_detector(monkeypatch):
+    def create_predictor(args, mode, logger):
+        input_tensor, output_tensor = StubTensor(), StubTensor()
+        predictor = StubPredictor(input_tensor, output_tensor)
+        return predictor, input_tensor, [output_tensor], None
+
+    monkeypatch.setattr(predict_det.utility, "create_predictor", create_predictor)
+
+    def make(**kwargs):
+        args = init_args().parse_args([])
+        for key, value in kwargs.items():
+            setattr(args, key, value)
+        return predict_det.TextDetector(args)
+
+    return make
+
+
+def make_image(seed, height, width):
+    rng = np.random.default_rng(seed)
+    img = np.full((height, width, 3), 255, dtype=np.uint8)
+    for _ in range(6):
+        x = int(rng.integers(0, width - 60))
+        y = int(rng.integers(0, height - 20))
+        img[y : y + int(rng.integers(8, 16)), x : x + int(rng.integers(30, 60))] = 0
+    return img
+
+
+def assert_same_boxes(results, expected):
+    assert len(results) == len(expected)
+    for boxes, exp_boxes in zip(results, expected):
+        np.testing.assert_array_equal(np.asarray(boxes), np.asarray(exp_boxes))
+
+
+def pool_threads():
+    return [t for t in threading.enumerate() if "ThreadPoolExecutor" in t.name]
+
+
+def test_same_shape_groups_match_predict(make_detector):
+    detector = make_detector(det_batch_num=3)
+    shapes = [(160, 320), (160, 320), (96, 224), (160, 320), (96, 224), (160, 320)]
+    imgs = [make_image(seed, h, w) for seed, (h, w) in enumerate(shapes)]
+    expected = [detector.predict(img)[0] for img in imgs]
+    detector.predictor.batch_sizes = []
+
+    results, _ = detector.predict_batch(imgs)
+
+    assert_same_boxes(results, expected)
+    assert sum(len(boxes) for boxes in results) > 0
+    # four images of one shape in batches of 3 and 1, two of the other
+    assert sorted(detector.predictor.batch_sizes) == [1, 2, 3]
+    assert not pool_threads()
+
+
+def test_padded_batches_match_predict(make_detector):
+    detector = make_detector(det_batch_num=4, det_batch_pad=True)
+    shapes = [(160, 320), (96, 224), (128, 288), (64, 416), (192, 160)]
+    imgs = [make_image(seed, h, w) for seed, (h, w) in enumerate(shapes)]
+    expected = [detector.predict(img)[0] for img in imgs]
+    detector.predictor.batch_sizes = []
+
+    results, _ = detector.predict_batch(imgs)
+
+    # the stub sees each pixel alone, so zero padding changes nothing
+    assert_same_boxes(results, expected)
+    assert all(len(boxes) > 0 for boxes in results)
+    assert detector.predictor.batch_sizes == [4, 1]
+    assert not pool_threads()
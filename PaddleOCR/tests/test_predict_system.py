@@ -0,0 +1,224 @@
+import itertools
+import os
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "..")))
+
+import tools.infer.predict_system as predict_system
+from tools.infer.utility import init_args
+
+
+def make_pages(num):
+    return [np.full((8, 8, 3), i, dtype=np.uint8) for i in range(num)]
+
+
+@pytest.mark.parametrize("page_num, expected", [(0, [5, 2, 7]), (3, [3, 2, 3])])
+def test_iter_images_limits_pages_of_each_pdf(monkeypatch, page_num, expected):
+    pdfs = {"a.pdf": 5, "b.pdf": 2, "c.pdf": 7}
+    monkeypatch.setattr(
+        predict_system,
+        "check_and_read",
+        lambda path: (make_pages(pdfs[path]), False, True),
+    )
+
+    entries = list(predict_system.iter_images(list(pdfs), page_num=page_num))
+
+    pages = [sum(entry[1] == path for entry in entries) for path in pdfs]
+    assert pages == expected
+    assert [entry[0] for entry in entries] == sorted(entry[0] for entry in entries)
+
+
+class StubDetector(object):
+    """Image k gets k % 4 boxes, images with k % 5 == 3 no detection."""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+
+    def __call__(self, img):
+        k = int(img[0, 0, 0])
+        if k == self.fail_on:
+            raise ValueError("detector failed on {}".format(k))
+        if k % 5 == 3:
+            return None, 0.01
+        boxes = [
+            [[4, 4 + 12 * i], [60, 4 + 12 * i], [60, 14 + 12 * i], [4, 14 + 12 * i]]
+            for i in range(k % 4)
+        ]
+        return np.array(boxes, dtype=np.float32).reshape(-1, 4, 2), 0.01
+
+
+class StubRecognizer(object):
+    """Reads the fill value of each crop, low values fall under drop_score."""
+
+    rec_batch_num = 2
+
+    def __init__(self, delay=0.0, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.batches = []
+
+    def __call__(self, crops):
+        time.sleep(self.delay)
+        values = [int(crop[0, 0, 0]) for crop in crops]
+        self.batches.append(values)
+        if self.fail_on in values:
+            raise RuntimeError("recognizer failed on {}".format(self.fail_on))
+        return [(str(v), 0.4 if v % 7 == 0 else 0.9) for v in values], 0.01
+
+
+class StubClassifier(object):
+    def __call__(self, crops):
+        return crops, [["0", 1.0]] * len(crops), 0.01
+
+
+def make_system(detector=None, recognizer=None, use_angle_cls=False):
+    system = object.__new__(predict_system.TextSystem)
+    system.args = init_args().parse_args([])
+    system.text_detector = detector or StubDetector()
+    system.text_recognizer = recognizer or StubRecognizer()
+    system.use_angle_cls = use_angle_cls
+    system.text_classifier = StubClassifier()
+    system.drop_score = system.args.drop_score
+    system.crop_arena = None
+    system.crop_image_res_index = 0
+    return system
+
+
+def make_images(num):
+    return [np.full((64, 80, 3), k, dtype=np.uint8) for k in range(num)]
+
+
+def pipeline_threads():
+    return [t for t in threading.enumerate() if t.name.startswith("ocr-")]
+
+
+def assert_same(results, expected):
+    assert len(results) == len(expected)
+    for (boxes, rec_res, _), (exp_boxes, exp_rec_res, _) in zip(results, expected):
+        if exp_boxes is None:
+            assert boxes is None and rec_res is None
+            continue
+        assert rec_res == exp_rec_res
+        np.testing.assert_array_equal(np.array(boxes), np.array(exp_boxes))
+
+
+@pytest.mark.parametrize("use_angle_cls", [False, True])
+def test_pipeline_matches_call_in_input_order(use_angle_cls):
+    system = make_system(use_angle_cls=use_angle_cls)
+    images = make_images(23)
+    expected = [system(img) for img in images]
+
+    results = list(system.pipeline(images, queue_size=2))
+
+    assert_same(results, expected)
+    assert not pipeline_threads()
+
+
+def test_pipeline_groups_crops_of_waiting_images():
+    # a slow recognizer lets images and the end marker queue up behind it
+    recognizer = StubRecognizer(delay=0.02)
+    system = make_system(recognizer=recognizer)
+    images = make_images(30)
+
+    results = list(system.pipeline(images, queue_size=8, rec_crops=16))
+
+    assert_same(results, [make_system()(img) for img in images])
+    assert max(len(set(batch)) for batch in recognizer.batches) > 1
+    assert not pipeline_threads()
+
+
+@pytest.mark.parametrize(
+    "detector, recognizer, error",
+    [
+        (StubDetector(fail_on=9), None, ValueError),
+        (None, StubRecognizer(fail_on=10), RuntimeError),
+    ],
+)
+def test_pipeline_reraises_stage_errors(detector, recognizer, error):
+    system = make_system(detector=detector, recognizer=recognizer)
+    with pytest.raises(error):
+        for _ in system.pipeline(make_images(20)):
+            pass
+    assert not pipeline_threads()
+
+
+def test_pipeline_close_joins_threads():
+    system = make_system(recognizer=StubRecognizer(delay=0.01))
+    endless = (np.full((64, 80, 3), k % 200, np.uint8) for k in itertools.count())
+    results = system.pipeline(endless, queue_size=2)
+    next(results)
+    assert pipeline_threads()
+
+    results.close()
+
+    assert not pipeline_threads()
+
+
+class StubTextSystem(object):
+    """
+    Stand-in for TextSystem in mp_predict workers, module level so spawned
+    workers can unpickle it. Images filled with value v take (v % 4) * 50ms,
+    v == 13 raises and v == 66 kills the worker.
+    """
+
+    def __init__(self, args):
+        self.args = args
+
+    def __call__(self, img):
+        value = int(img[0, 0, 0])
+        if value == 13:
+            raise ValueError("cannot read image {}".format(value))
+        if value == 66:
+            os._exit(3)
+        time.sleep((value % 4) * 0.05)
+        return np.zeros((0, 4, 2), dtype=np.float32), [], {}
+
+
+def write_images(directory, values):
+    paths = []
+    for i, value in enumerate(values):
+        path = os.path.join(str(directory), "img_{:02d}.png".format(i))
+        cv2.imwrite(path, np.full((32, 32, 3), value, dtype=np.uint8))
+        paths.append(path)
+    return paths
+
+
+def mp_args(tmp_path, processes):
+    args = init_args().parse_args([])
+    args.total_process_num = processes
+    args.use_mp = True
+    args.warmup = False
+    args.draw_img_save_dir = str(tmp_path / "draw")
+    os.makedirs(args.draw_img_save_dir, exist_ok=True)
+    return args
+
+
+def test_mp_predict_keeps_input_order(tmp_path):
+    paths = write_images(tmp_path, [3, 0, 2, 1, 3, 0, 1, 2, 3])
+    args = mp_args(tmp_path, processes=3)
+
+    results = list(
+        predict_system.mp_predict(args, paths, system_factory=StubTextSystem)
+    )
+
+    names = [save_preds[0].split("\t")[0] for save_preds, _ in results]
+    assert names == [os.path.basename(path) for path in paths]
+
+
+@pytest.mark.parametrize("value, message", [(13, "cannot read image"), (66, "code 3")])
+def test_mp_predict_surfaces_worker_failures(tmp_path, value, message):
+    paths = write_images(tmp_path, [1, 2, value, 3, 1, 2])
+    args = mp_args(tmp_path, processes=2)
+
+    start = time.time()
+    with pytest.raises(RuntimeError, match=message):
+        for _ in predict_system.mp_predict(args, paths, system_factory=StubTextSystem):
+            pass
+    assert time.time() - start < 30
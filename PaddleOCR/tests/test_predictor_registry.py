@@ -0,0 +1,84 @@
+import os
+import sys
+import threading
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "..")))
+
+from tools.infer.utility import PredictorRegistry
+
+
+class FakePredictor(object):
+    def __init__(self, template=None):
+        self.template = template
+
+    def clone(self):
+        return FakePredictor(template=self)
+
+
+def test_loads_once_and_hands_out_clones():
+    registry = PredictorRegistry()
+    loads = []
+
+    def load():
+        loads.append(1)
+        return FakePredictor(), "config"
+
+    key = ("/models/det", "det", "cpu", "fp32", ())
+    first, config = registry.acquire(key, load)
+    second, _ = registry.acquire(key, load)
+
+    assert len(loads) == 1
+    assert config == "config"
+    assert first is not second
+    assert first.template is second.template
+
+    metrics = registry.metrics()
+    assert len(metrics) == 1
+    assert metrics[0]["model"] == "/models/det"
+    assert metrics[0]["users"] == 2
+    assert metrics[0]["load_time"] >= 0
+
+
+def test_sessions_without_clone_are_shared():
+    registry = PredictorRegistry()
+    session = object()
+    key = ("/models/det.onnx", "det", "onnx", "fp32", ())
+    assert registry.acquire(key, lambda: (session, None))[0] is session
+    assert registry.acquire(key, lambda: (object(), None))[0] is session
+
+
+def test_different_keys_load_separately():
+    registry = PredictorRegistry()
+    cpu = registry.acquire(("m", "det", "cpu", "fp32", ()), lambda: (object(), None))
+    gpu = registry.acquire(("m", "det", "gpu", "fp32", ()), lambda: (object(), None))
+    assert cpu[0] is not gpu[0]
+    assert len(registry.metrics()) == 2
+    registry.clear()
+    assert registry.metrics() == []
+
+
+def test_concurrent_acquire_loads_once():
+    registry = PredictorRegistry()
+    loads = []
+
+    def load():
+        loads.append(1)
+        time.sleep(0.05)
+        return FakePredictor(), None
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(registry.acquire(("m",) * 5, load)[0])
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert len({id(predictor) for predictor in results}) == 8
@@ -0,0 +1,116 @@
+import math
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "..")))
+
+from ppocr.data.imaug.operators import (
+    NormalizeCHWImage,
+    NormalizeImage,
+    ResizeNormalizeBatch,
+    ToCHWImage,
+    fuse_normalize_chw,
+)
+
+DET_NORMALIZE = {
+    "std": [0.229, 0.224, 0.225],
+    "mean": [0.485, 0.456, 0.406],
+    "scale": "1./255.",
+    "order": "hwc",
+}
+
+
+def reference_rec_norm(img, imgC, imgH, imgW):
+    # TextRecognizer.resize_norm_img for dynamic width recognizers
+    h, w = img.shape[:2]
+    ratio = w / float(h)
+    if math.ceil(imgH * ratio) > imgW:
+        resized_w = imgW
+    else:
+        resized_w = int(math.ceil(imgH * ratio))
+    resized_image = cv2.resize(img, (resized_w, imgH))
+    resized_image = resized_image.reshape(imgH, resized_w, imgC).astype("float32")
+    resized_image = resized_image.transpose((2, 0, 1)) / 255
+    resized_image -= 0.5
+    resized_image /= 0.5
+    padding_im = np.zeros((imgC, imgH, imgW), dtype=np.float32)
+    padding_im[:, :, 0:resized_w] = resized_image
+    return padding_im
+
+
+@pytest.mark.parametrize("shape", [(640, 480, 3), (33, 97, 3)])
+def test_normalize_chw_matches_normalize_and_transpose(shape):
+    img = np.random.default_rng(0).integers(0, 256, shape).astype(np.uint8)
+    expected = ToCHWImage()(NormalizeImage(**DET_NORMALIZE)({"image": img}))["image"]
+
+    result = NormalizeCHWImage(**DET_NORMALIZE)({"image": img})["image"]
+
+    assert result.dtype == np.float32
+    assert result.shape == expected.shape
+    assert result.flags["C_CONTIGUOUS"]
+    np.testing.assert_allclose(result, expected, rtol=1e-5, atol=1e-5)
+
+
+def test_resize_normalize_batch_matches_per_crop_padding():
+    rng = np.random.default_rng(1)
+    crops = [
+        rng.integers(0, 256, (h, w, 3)).astype(np.uint8)
+        for h, w in [(32, 100), (48, 48), (20, 400), (48, 230), (60, 10)]
+    ]
+    op = ResizeNormalizeBatch(scale=1.0 / 255, mean=[0.5] * 3, std=[0.5] * 3)
+
+    batch = op(crops, (3, 48, 320))
+
+    expected = np.stack([reference_rec_norm(crop, 3, 48, 320) for crop in crops])
+    assert batch.shape == expected.shape
+    np.testing.assert_allclose(batch, expected, rtol=1e-5, atol=1e-5)
+
+
+def test_resize_normalize_batch_of_gray_crops():
+    rng = np.random.default_rng(3)
+    crops = [rng.integers(0, 256, (32, w)).astype(np.uint8) for w in (50, 300)]
+    op = ResizeNormalizeBatch(scale=1.0 / 255, mean=[0.5], std=[0.5])
+
+    batch = op(crops, (1, 32, 160))
+
+    expected = np.stack([reference_rec_norm(crop, 1, 32, 160) for crop in crops])
+    np.testing.assert_allclose(batch, expected, rtol=1e-5, atol=1e-5)
+
+
+def test_resize_normalize_batch_reuses_its_buffer():
+    rng = np.random.default_rng(2)
+    crops = [rng.integers(0, 256, (48, 200, 3)).astype(np.uint8) for _ in range(8)]
+    op = ResizeNormalizeBatch(scale=1.0 / 255, mean=[0.5] * 3, std=[0.5] * 3)
+
+    op(crops, (3, 48, 320))
+    buffer = op.buffer
+    second = op(crops[:4], (3, 48, 240))
+
+    assert op.buffer is buffer
+    assert second.base is buffer
+    # stale values of the wider first batch are cleared by the padding
+    np.testing.assert_array_equal(second[:, :, :, 200:], 0)
+    fresh = ResizeNormalizeBatch(scale=1.0 / 255, mean=[0.5] * 3, std=[0.5] * 3)
+    np.testing.assert_array_equal(second, fresh(crops[:4], (3, 48, 240)))
+
+
+def test_fuse_normalize_chw():
+    ops = [
+        {"DetResizeForTest": {"limit_side_len": 960}},
+        {"NormalizeImage": DET_NORMALIZE},
+        {"ToCHWImage": None},
+        {"KeepKeys": {"keep_keys": ["image", "shape"]}},
+    ]
+    assert fuse_normalize_chw(ops) == [
+        ops[0],
+        {"NormalizeCHWImage": DET_NORMALIZE},
+        ops[3],
+    ]
+    # normalizing in chw order is left alone
+    chw = [{"NormalizeImage": dict(DET_NORMALIZE, order="chw")}, {"ToCHWImage": None}]
+    assert fuse_normalize_chw(chw) == chw
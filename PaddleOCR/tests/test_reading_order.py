@@ -0,0 +1,121 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "..")))
+
+from ppocr.utils.reading_order import reading_order, sort_boxes
+
+
+def legacy_sorted_boxes(dt_boxes):
+    # the previous tools.infer.predict_system.sorted_boxes
+    num_boxes = dt_boxes.shape[0]
+    _boxes = list(sorted(dt_boxes, key=lambda x: (x[0][1], x[0][0])))
+    for i in range(num_boxes - 1):
+        for j in range(i, -1, -1):
+            if abs(_boxes[j + 1][0][1] - _boxes[j][0][1]) < 10 and (
+                _boxes[j + 1][0][0] < _boxes[j][0][0]
+            ):
+                _boxes[j], _boxes[j + 1] = _boxes[j + 1], _boxes[j]
+            else:
+                break
+    return _boxes
+
+
+def make_box(x, y, w, h):
+    return np.array([[x, y], [x + w, y], [x + w, y + h], [x, y + h]], dtype=np.float32)
+
+
+def make_page(seed, columns=1, lines=30, jitter=3):
+    """Text lines of words with a few pixels of baseline jitter."""
+    rng = np.random.default_rng(seed)
+    col_width = 600 // columns
+    boxes = []
+    for col in range(columns):
+        for line in range(lines):
+            x = col * col_width + 10
+            while x < (col + 1) * col_width - 80:
+                w = float(rng.integers(20, 70))
+                y = 20 + line * 28 + float(rng.uniform(-jitter, jitter))
+                boxes.append(make_box(x, y, w, 16))
+                x += w + float(rng.integers(8, 20))
+    boxes = np.array(boxes)
+    return boxes[rng.permutation(len(boxes))]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_legacy_order_on_typical_pages(seed):
+    boxes = make_page(seed)
+    expected = legacy_sorted_boxes(boxes)
+    result = sort_boxes(boxes)
+    assert len(result) == len(expected)
+    for a, b in zip(result, expected):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_empty_boxes():
+    assert sort_boxes(np.zeros((0, 4, 2), dtype=np.float32)) == []
+    assert reading_order(np.zeros((0, 4, 2), dtype=np.float32)).shape == (0,)
+
+
+def test_same_line_despite_different_heights():
+    # a tall word and a short word on one line share their y center
+    boxes = np.array([make_box(200, 100, 50, 16), make_box(10, 90, 150, 36)])
+    assert reading_order(boxes).tolist() == [1, 0]
+
+
+def test_two_column_layout_with_title():
+    title = make_box(10, 0, 560, 20)
+    left = [make_box(10, 40 + 28 * i, 250, 16) for i in range(3)]
+    right = [make_box(310, 40 + 28 * i, 250, 16) for i in range(3)]
+    footer = make_box(10, 200, 560, 20)
+    boxes = np.array([footer, *right, title, *left])
+
+    order = reading_order(boxes, columns=True).tolist()
+    assert order == [4, 5, 6, 7, 1, 2, 3, 0]
+    # line by line reading interleaves the columns
+    assert reading_order(boxes).tolist() == [4, 5, 1, 6, 2, 7, 3, 0]
+
+
+def test_columns_fall_back_to_lines_for_single_column():
+    boxes = make_page(7)
+    np.testing.assert_array_equal(
+        reading_order(boxes, columns=True), reading_order(boxes)
+    )
+
+
+def test_column_order_on_dense_page():
+    boxes = make_page(11, columns=3, lines=200)
+    order = reading_order(boxes, columns=True)
+    column = (boxes[order][:, 0, 0] // 200).astype(int)
+    # each column is read completely before the next one
+    assert np.all(np.diff(column) >= 0)
+    assert sorted(order.tolist()) == list(range(len(boxes)))
+
+
+def test_dense_lines_do_not_chain():
+    # line pitch below y_tol merges at most y_tol worth of lines, the page
+    # is never read column by column
+    boxes = np.array(
+        [
+            make_box(10 + 100 * col, 9 * line, 80, 8)
+            for line in range(5)
+            for col in range(2)
+        ]
+    )
+    order = reading_order(boxes)
+    assert order.tolist() == [0, 2, 1, 3, 4, 6, 5, 7, 8, 9]
+    assert reading_order(boxes, y_tol=9).tolist() == list(range(10))
+
+    boxes = np.array(
+        [
+            make_box(10 + 100 * col, 9 * line, 80, 8)
+            for line in range(200)
+            for col in range(3)
+        ]
+    )
+    order = reading_order(boxes)
+    assert np.abs(order - np.arange(len(boxes))).max() <= 3
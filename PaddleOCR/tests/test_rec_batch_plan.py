@@ -0,0 +1,100 @@
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "..")))
+
+from tools.infer.predict_rec import plan_rec_batches
+
+IMG_H, MIN_W = 48, 320
+
+
+def make_ratios(seed, num=458):
+    """Sorted aspect ratios of mostly short words with a tail of long lines."""
+    rng = np.random.default_rng(seed)
+    words = rng.lognormal(mean=1.0, sigma=0.6, size=num * 4 // 5)
+    lines = rng.uniform(10, 40, size=num - len(words))
+    return sorted(np.concatenate([words, lines]).tolist())
+
+
+def needed_width(ratio):
+    return max(math.ceil(IMG_H * ratio), MIN_W)
+
+
+def fixed_batches(ratios, batch_num=6):
+    # the plain rec_batch_num slicing of TextRecognizer
+    batches = []
+    for beg in range(0, len(ratios), batch_num):
+        end = min(len(ratios), beg + batch_num)
+        width = max(MIN_W, int(IMG_H * max(ratios[beg:end])))
+        content = sum(min(needed_width(r), width) for r in ratios[beg:end])
+        batches.append((beg, end, width, content / ((end - beg) * width)))
+    return batches
+
+
+def pixels(batch):
+    beg, end, width, _ = batch
+    return (end - beg) * IMG_H * width
+
+
+def check_plan(ratios, batches, budget, min_efficiency):
+    # batches are contiguous and cover every crop exactly once
+    assert batches[0][0] == 0 and batches[-1][1] == len(ratios)
+    for (_, end, _, _), (beg, _, _, _) in zip(batches, batches[1:]):
+        assert end == beg
+    for beg, end, width, efficiency in batches:
+        assert end > beg
+        assert width >= max(int(IMG_H * r) for r in ratios[beg:end])
+        content = sum(min(needed_width(r), width) for r in ratios[beg:end])
+        assert efficiency == pytest.approx(content / ((end - beg) * width))
+        if end - beg > 1:
+            assert (end - beg) * IMG_H * width <= budget
+            assert efficiency >= min_efficiency
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("budget", [48 * 320 * 6, 48 * 320 * 24])
+def test_plan_respects_budget_and_efficiency(seed, budget):
+    ratios = make_ratios(seed)
+    batches = plan_rec_batches(ratios, IMG_H, MIN_W, budget, min_efficiency=0.6)
+    check_plan(ratios, batches, budget, 0.6)
+
+
+def test_oversize_crop_gets_its_own_batch():
+    ratios = [2.0, 3.0, 4.0, 500.0, 600.0]
+    budget = IMG_H * 320 * 4
+    batches = plan_rec_batches(ratios, IMG_H, MIN_W, budget)
+    assert batches[-2][:2] == (3, 4) and batches[-1][:2] == (4, 5)
+    assert batches[-1][2] == int(IMG_H * 600.0)
+    check_plan(ratios, batches, budget, 0.6)
+
+
+def test_plan_caps_peak_tensor_below_fixed_batches():
+    ratios = make_ratios(0)
+    budget = IMG_H * 320 * 6
+    planned = plan_rec_batches(ratios, IMG_H, MIN_W, budget)
+    fixed = fixed_batches(ratios)
+
+    def overall_efficiency(batches):
+        padded = sum(pixels(batch) for batch in batches)
+        return sum(pixels(batch) * batch[3] for batch in batches) / padded
+
+    long_crop = IMG_H * needed_width(ratios[-1])
+    assert max(pixels(batch) for batch in planned) <= max(budget, long_crop)
+    assert max(pixels(batch) for batch in planned) < max(pixels(b) for b in fixed)
+    assert overall_efficiency(planned) >= overall_efficiency(fixed)
+
+
+@pytest.mark.parametrize("bucket_w", [32, 64])
+def test_width_buckets(bucket_w):
+    ratios = make_ratios(1)
+    budget = IMG_H * 320 * 12
+    batches = plan_rec_batches(ratios, IMG_H, MIN_W, budget, bucket_w=bucket_w)
+    check_plan(ratios, batches, budget, 0.6)
+    assert all(width % bucket_w == 0 for _, _, width, _ in batches)
+    unbucketed = plan_rec_batches(ratios, IMG_H, MIN_W, budget)
+    assert len({b[2] for b in batches}) <= len({b[2] for b in unbucketed})
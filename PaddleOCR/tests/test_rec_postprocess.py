@@ -0,0 +1,82 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "..")))
+
+from ppocr.postprocess.rec_postprocess import CTCLabelDecode
+
+CHARACTERS = list("0123456789abcdefghijklmnopqrstuvwxyz.-") + ["你", "好", "啊"]
+
+
+def make_decoder(tmp_path, characters):
+    dict_path = tmp_path / "dict.txt"
+    dict_path.write_text("\n".join(characters) + "\n", encoding="utf-8")
+    return CTCLabelDecode(character_dict_path=str(dict_path), use_space_char=True)
+
+
+@pytest.fixture
+def decoder(tmp_path):
+    return make_decoder(tmp_path, CHARACTERS)
+
+
+def make_preds(seed, batch_size=16, length=40, num_classes=len(CHARACTERS) + 2):
+    """Softmax outputs with runs of repeated and blank columns."""
+    rng = np.random.default_rng(seed)
+    logits = rng.normal(size=(batch_size, length // 4, num_classes))
+    logits[:, :, 0] += rng.uniform(0, 3, (batch_size, 1))
+    logits = np.repeat(logits, 4, axis=1)[:, :length].astype(np.float32)
+    preds = np.exp(logits)
+    return preds / preds.sum(axis=2, keepdims=True)
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("return_word_box", [False, True])
+def test_batch_decode_matches_per_sample_decode(decoder, seed, return_word_box):
+    preds = make_preds(seed)
+    preds_idx, preds_prob = preds.argmax(axis=2), preds.max(axis=2)
+
+    result = decoder.decode(
+        preds_idx, preds_prob, True, return_word_box=return_word_box
+    )
+    # a list of rows takes the per sample loop
+    expected = decoder.decode(
+        list(preds_idx), list(preds_prob), True, return_word_box=return_word_box
+    )
+
+    assert len(result) == len(expected)
+    for res, exp in zip(result, expected):
+        assert res[0] == exp[0]
+        assert res[1] == pytest.approx(exp[1], rel=1e-5)
+        if return_word_box:
+            assert res[2][0] == exp[2][0]
+            assert res[2][1:] == exp[2][1:]
+
+
+def test_batch_decode_with_multi_character_entries(tmp_path):
+    decoder = make_decoder(tmp_path, CHARACTERS + ["<unk>", "ab"])
+    preds = make_preds(3, num_classes=len(CHARACTERS) + 4)
+    preds_idx, preds_prob = preds.argmax(axis=2), preds.max(axis=2)
+    result = decoder.decode(preds_idx, preds_prob, True)
+    expected = decoder.decode(list(preds_idx), list(preds_prob), True)
+    assert [text for text, _ in result] == [text for text, _ in expected]
+
+
+def test_batch_decode_of_empty_predictions(decoder):
+    preds_idx = np.zeros((2, 10), dtype=np.int64)
+    preds_prob = np.full((2, 10), 0.9, dtype=np.float32)
+    assert decoder.decode(preds_idx, preds_prob, True) == [("", 0.0), ("", 0.0)]
+    assert decoder.decode(preds_idx) == [("", 1.0), ("", 1.0)]
+
+
+def test_word_info_groups_numbers_and_hyphens(decoder):
+    text = "ab-1 3.5你好x"
+    word_list, word_col_list, state_list = decoder.get_word_info(
+        text, np.ones(len(text), dtype=bool)
+    )
+    assert ["".join(word) for word in word_list] == ["ab-1", "3.5", "你好", "x"]
+    assert state_list == ["en&num", "en&num", "cn", "en&num"]
+    assert word_col_list[1] == [5, 6, 7]
@@ -28,6 +28,7 @@ import time
 import traceback
 
 import tools.infer.utility as utility
+from ppocr.data.imaug.operators import ResizeNormalizeBatch
 from ppocr.postprocess import build_post_process
 from ppocr.utils.logging import get_logger
 from ppocr.utils.utility import get_image_file_list, check_and_read
@@ -51,6 +52,11 @@ class TextClassifier(object):
         self.cls_image_shape = [int(v) for v in args.cls_image_shape.split(",")]
         self.cls_batch_num = args.cls_batch_num
         self.cls_thresh = args.cls_thresh
+        self.fused_preprocess = None
+        if args.use_fused_preprocess:
+            self.fused_preprocess = ResizeNormalizeBatch(
+                scale=1.0 / 255, mean=[0.5, 0.5, 0.5], std=[0.5, 0.5, 0.5]
+            )
         postprocess_params = {
             "name": "ClsPostProcess",
             "label_list": args.label_list,
@@ -108,12 +114,18 @@ class TextClassifier(object):
                 h, w = img_list[indices[ino]].shape[0:2]
                 wh_ratio = w * 1.0 / h
                 max_wh_ratio = max(max_wh_ratio, wh_ratio)
-            for ino in range(beg_img_no, end_img_no):
-                norm_img = self.resize_norm_img(img_list[indices[ino]])
-                norm_img = norm_img[np.newaxis, :]
-                norm_img_batch.append(norm_img)
-            norm_img_batch = np.concatenate(norm_img_batch)
-            norm_img_batch = norm_img_batch.copy()
+            if self.fused_preprocess is not None:
+                norm_img_batch = self.fused_preprocess(
+                    [img_list[indices[ino]] for ino in range(beg_img_no, end_img_no)],
+                    self.cls_image_shape,
+                )
+            else:
+                for ino in range(beg_img_no, end_img_no):
+                    norm_img = self.resize_norm_img(img_list[indices[ino]])
+                    norm_img = norm_img[np.newaxis, :]
+                    norm_img_batch.append(norm_img)
+                norm_img_batch = np.concatenate(norm_img_batch)
+                norm_img_batch = norm_img_batch.copy()
 
             if self.use_onnx:
                 input_dict = {}
@@ -24,11 +24,13 @@ import cv2
 import numpy as np
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 import tools.infer.utility as utility
 from ppocr.utils.logging import get_logger
 from ppocr.utils.utility import get_image_file_list, check_and_read
 from ppocr.data import create_operators, transform
+from ppocr.data.imaug.operators import fuse_normalize_chw
 from ppocr.postprocess import build_post_process
 import json
 
@@ -51,6 +53,8 @@ class TextDetector(object):
         self.args = args
         self.det_algorithm = args.det_algorithm
         self.use_onnx = args.use_onnx
+        self.det_batch_num = args.det_batch_num
+        self.det_batch_pad = args.det_batch_pad
         pre_process_list = [
             {
                 "DetResizeForTest": {
@@ -140,6 +144,8 @@ class TextDetector(object):
             logger.info("unknown det_algorithm:{}".format(self.det_algorithm))
             sys.exit(0)
 
+        if args.use_fused_preprocess:
+            pre_process_list = fuse_normalize_chw(pre_process_list)
         self.preprocess_op = create_operators(pre_process_list)
         self.postprocess_op = build_post_process(postprocess_params)
         (
@@ -238,25 +244,7 @@ class TextDetector(object):
         dt_boxes = np.array(dt_boxes_new)
         return dt_boxes
 
-    def predict(self, img):
-        ori_im = img.copy()
-        data = {"image": img}
-
-        st = time.time()
-
-        if self.args.benchmark:
-            self.autolog.times.start()
-
-        data = transform(data, self.preprocess_op)
-        img, shape_list = data
-        if img is None:
-            return None, 0
-        img = np.expand_dims(img, axis=0)
-        shape_list = np.expand_dims(shape_list, axis=0)
-        img = img.copy()
-
-        if self.args.benchmark:
-            self.autolog.times.stamp()
+    def _run(self, img):
         if self.use_onnx:
             input_dict = {}
             input_dict[self.input_tensor.name] = img
@@ -268,9 +256,9 @@ class TextDetector(object):
             for output_tensor in self.output_tensors:
                 output = output_tensor.copy_to_cpu()
                 outputs.append(output)
-            if self.args.benchmark:
-                self.autolog.times.stamp()
+        return outputs
 
+    def _pack_preds(self, outputs):
         preds = {}
         if self.det_algorithm == "EAST":
             preds["f_geo"] = outputs[0]
@@ -290,20 +278,154 @@ class TextDetector(object):
             preds["score"] = outputs[1]
         else:
             raise NotImplementedError
+        return preds
 
+    def _postprocess(self, preds, shape_list, ori_shape):
         post_result = self.postprocess_op(preds, shape_list)
         dt_boxes = post_result[0]["points"]
 
         if self.args.det_box_type == "poly":
-            dt_boxes = self.filter_tag_det_res_only_clip(dt_boxes, ori_im.shape)
+            dt_boxes = self.filter_tag_det_res_only_clip(dt_boxes, ori_shape)
         else:
-            dt_boxes = self.filter_tag_det_res(dt_boxes, ori_im.shape)
+            dt_boxes = self.filter_tag_det_res(dt_boxes, ori_shape)
+        return dt_boxes
+
+    def predict(self, img):
+        ori_im = img.copy()
+        data = {"image": img}
+
+        st = time.time()
+
+        if self.args.benchmark:
+            self.autolog.times.start()
+
+        data = transform(data, self.preprocess_op)
+        img, shape_list = data
+        if img is None:
+            return None, 0
+        img = np.expand_dims(img, axis=0)
+        shape_list = np.expand_dims(shape_list, axis=0)
+        img = np.ascontiguousarray(img)
+
+        if self.args.benchmark:
+            self.autolog.times.stamp()
+        outputs = self._run(img)
+        if self.args.benchmark and not self.use_onnx:
+            self.autolog.times.stamp()
+
+        preds = self._pack_preds(outputs)
+        dt_boxes = self._postprocess(preds, shape_list, ori_im.shape)
 
         if self.args.benchmark:
             self.autolog.times.end(stamp=True)
         et = time.time()
         return dt_boxes, et - st
 
+    def _max_batch_size(self):
+        batch_size = max(1, self.det_batch_num)
+        if self.use_onnx:
+            # exported models may have a fixed batch dimension
+            fixed = self.input_tensor.shape[0]
+            if isinstance(fixed, int) and fixed > 0:
+                batch_size = min(batch_size, fixed)
+        return batch_size
+
+    def _plan_batches(self, shapes, batch_size, pad):
+        """
+        Group image indices into batches. Without padding only images whose
+        resized shapes are equal share a batch; with padding images are sorted
+        by shape and neighbours are padded to the largest one in their batch.
+        """
+        if pad:
+            order = sorted(range(len(shapes)), key=lambda i: shapes[i])
+            return [
+                order[i : i + batch_size] for i in range(0, len(order), batch_size)
+            ]
+        groups = {}
+        for i, shape in enumerate(shapes):
+            groups.setdefault(shape, []).append(i)
+        return [
+            group[i : i + batch_size]
+            for group in groups.values()
+            for i in range(0, len(group), batch_size)
+        ]
+
+    def predict_batch(self, imgs, batch_size=None):
+        """
+        Detect text in a list of images with one forward pass per batch of
+        images sharing the same resized shape. Postprocessing of the images
+        in a batch runs in a thread pool. Image slicing (use_slice) is not
+        applied here.
+
+        With det_batch_pad, DB images of different shapes share a batch and
+        are padded at the bottom and right with zeros of the normalized input,
+        which is the mean color. The model sees that padding as image content
+        instead of the border of its own input, so boxes touching the bottom
+        or right edge can differ slightly from predict.
+
+        Returns the per-image dt_boxes (None for images that failed to
+        preprocess, as in predict) and the total elapsed time.
+        """
+        st = time.time()
+        batch_size = batch_size or self._max_batch_size()
+        # padding is only safe for models whose output map matches the input
+        pad = self.det_batch_pad and self.det_algorithm in ["DB", "DB++"]
+        results = [None] * len(imgs)
+
+        inputs = {}
+        for i, img in enumerate(imgs):
+            data = transform({"image": img}, self.preprocess_op)
+            if data is not None and data[0] is not None:
+                inputs[i] = data
+        valid = list(inputs)
+        shapes = [inputs[i][0].shape[1:] for i in valid]
+
+        workers = max(1, min(batch_size, len(valid), os.cpu_count() or 1))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for batch in self._plan_batches(shapes, batch_size, pad):
+                indices = [valid[j] for j in batch]
+                if self.args.benchmark:
+                    self.autolog.times.start()
+                norm_imgs = [inputs[i][0] for i in indices]
+                max_h = max(img.shape[1] for img in norm_imgs)
+                max_w = max(img.shape[2] for img in norm_imgs)
+                batch_img = np.zeros(
+                    (len(indices), norm_imgs[0].shape[0], max_h, max_w),
+                    dtype=np.float32,
+                )
+                for k, img in enumerate(norm_imgs):
+                    batch_img[k, :, : img.shape[1], : img.shape[2]] = img
+
+                if self.args.benchmark:
+                    self.autolog.times.stamp()
+                preds = self._pack_preds(self._run(batch_img))
+                if self.args.benchmark:
+                    self.autolog.times.stamp()
+
+                def postprocess(k):
+                    i = indices[k]
+                    sample = {}
+                    for key, value in preds.items():
+                        value = value[k : k + 1]
+                        if pad:
+                            h, w = norm_imgs[k].shape[1:]
+                            value = value[:, :, :h, :w]
+                        sample[key] = value
+                    return self._postprocess(
+                        sample, np.expand_dims(inputs[i][1], axis=0), imgs[i].shape
+                    )
+
+                if len(indices) > 1:
+                    for k, dt_boxes in enumerate(
+                        pool.map(postprocess, range(len(indices)))
+                    ):
+                        results[indices[k]] = dt_boxes
+                else:
+                    results[indices[0]] = postprocess(0)
+                if self.args.benchmark:
+                    self.autolog.times.end(stamp=True)
+        return results, time.time() - st
+
     def __call__(self, img, use_slice=False):
         # For image like poster with one side much greater than the other side,
         # splitting recursively and processing with overlap to enhance performance.
@@ -431,68 +553,91 @@ if __name__ == "__main__":
         for i in range(2):
             res = text_detector(img)
 
-    save_results = []
-    for idx, image_file in enumerate(image_file_list):
-        img, flag_gif, flag_pdf = check_and_read(image_file)
-        if not flag_gif and not flag_pdf:
-            img = cv2.imread(image_file)
-        if not flag_pdf:
-            if img is None:
-                logger.debug("error in loading image:{}".format(image_file))
+    def iter_images():
+        for idx, image_file in enumerate(image_file_list):
+            img, flag_gif, flag_pdf = check_and_read(image_file)
+            if not flag_gif and not flag_pdf:
+                img = cv2.imread(image_file)
+            if not flag_pdf:
+                if img is None:
+                    logger.debug("error in loading image:{}".format(image_file))
+                    continue
+                imgs = [img]
+            else:
+                page_num = args.page_num
+                if page_num > len(img) or page_num == 0:
+                    page_num = len(img)
+                imgs = img[:page_num]
+            for index, img in enumerate(imgs):
+                yield idx, image_file, index, len(imgs), img, flag_gif, flag_pdf
+
+    def iter_results():
+        if args.det_batch_num <= 1:
+            for entry in iter_images():
+                st = time.time()
+                dt_boxes, _ = text_detector(entry[4])
+                yield entry, dt_boxes, time.time() - st
+            return
+        entries = []
+        for entry in iter_images():
+            entries.append(entry)
+            if len(entries) < args.det_batch_num:
                 continue
-            imgs = [img]
+            yield from detect_batch(entries)
+            entries = []
+        yield from detect_batch(entries)
+
+    def detect_batch(entries):
+        if not entries:
+            return
+        results, elapse = text_detector.predict_batch([e[4] for e in entries])
+        for entry, dt_boxes in zip(entries, results):
+            yield entry, dt_boxes, elapse / len(entries)
+
+    save_results = []
+    for entry, dt_boxes, elapse in iter_results():
+        idx, image_file, index, num_imgs, img, flag_gif, flag_pdf = entry
+        total_time += elapse
+        if num_imgs > 1:
+            save_pred = (
+                os.path.basename(image_file)
+                + "_"
+                + str(index)
+                + "\t"
+                + str(json.dumps([x.tolist() for x in dt_boxes]))
+                + "\n"
+            )
         else:
-            page_num = args.page_num
-            if page_num > len(img) or page_num == 0:
-                page_num = len(img)
-            imgs = img[:page_num]
-        for index, img in enumerate(imgs):
-            st = time.time()
-            dt_boxes, _ = text_detector(img)
-            elapse = time.time() - st
-            total_time += elapse
-            if len(imgs) > 1:
-                save_pred = (
-                    os.path.basename(image_file)
-                    + "_"
-                    + str(index)
-                    + "\t"
-                    + str(json.dumps([x.tolist() for x in dt_boxes]))
-                    + "\n"
-                )
-            else:
-                save_pred = (
-                    os.path.basename(image_file)
-                    + "\t"
-                    + str(json.dumps([x.tolist() for x in dt_boxes]))
-                    + "\n"
-                )
-            save_results.append(save_pred)
-            logger.info(save_pred)
-            if len(imgs) > 1:
-                logger.info(
-                    "{}_{} The predict time of {}: {}".format(
-                        idx, index, image_file, elapse
-                    )
-                )
-            else:
-                logger.info(
-                    "{} The predict time of {}: {}".format(idx, image_file, elapse)
+            save_pred = (
+                os.path.basename(image_file)
+                + "\t"
+                + str(json.dumps([x.tolist() for x in dt_boxes]))
+                + "\n"
+            )
+        save_results.append(save_pred)
+        logger.info(save_pred)
+        if num_imgs > 1:
+            logger.info(
+                "{}_{} The predict time of {}: {}".format(
+                    idx, index, image_file, elapse
                 )
+            )
+        else:
+            logger.info("{} The predict time of {}: {}".format(idx, image_file, elapse))
 
-            src_im = utility.draw_text_det_res(dt_boxes, img)
+        src_im = utility.draw_text_det_res(dt_boxes, img)
 
-            if flag_gif:
-                save_file = image_file[:-3] + "png"
-            elif flag_pdf:
-                save_file = image_file.replace(".pdf", "_" + str(index) + ".png")
-            else:
-                save_file = image_file
-            img_path = os.path.join(
-                draw_img_save_dir, "det_res_{}".format(os.path.basename(save_file))
-            )
-            cv2.imwrite(img_path, src_im)
-            logger.info("The visualized image saved in {}".format(img_path))
+        if flag_gif:
+            save_file = image_file[:-3] + "png"
+        elif flag_pdf:
+            save_file = image_file.replace(".pdf", "_" + str(index) + ".png")
+        else:
+            save_file = image_file
+        img_path = os.path.join(
+            draw_img_save_dir, "det_res_{}".format(os.path.basename(save_file))
+        )
+        cv2.imwrite(img_path, src_im)
+        logger.info("The visualized image saved in {}".format(img_path))
 
     with open(os.path.join(draw_img_save_dir, "det_results.txt"), "w") as f:
         f.writelines(save_results)
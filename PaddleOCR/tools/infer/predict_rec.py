@@ -29,12 +29,101 @@ import traceback
 import paddle
 
 import tools.infer.utility as utility
+from ppocr.data.imaug.operators import ResizeNormalizeBatch
 from ppocr.postprocess import build_post_process
 from ppocr.utils.logging import get_logger
 from ppocr.utils.utility import get_image_file_list, check_and_read
 
 logger = get_logger()
 
+# algorithms whose crops are not resized by resize_norm_img to a batch wide
+# dynamic width, they always use fixed rec_batch_num batches
+FIXED_WIDTH_ALGORITHMS = [
+    "NRTR",
+    "ViTSTR",
+    "RFL",
+    "SAR",
+    "SRN",
+    "SVTR",
+    "SATRN",
+    "ParseQ",
+    "CPPD",
+    "CPPDPadding",
+    "VisionLAN",
+    "PREN",
+    "SPIN",
+    "ABINet",
+    "RobustScanner",
+    "CAN",
+    "LaTeXOCR",
+]
+
+
+def _crop_width(wh_ratio, img_h, min_w, batch_w):
+    # width a crop needs without batching, the rest of batch_w is padding
+    return min(max(math.ceil(img_h * wh_ratio), min_w), batch_w)
+
+
+def _bucket_width(width, bucket_w):
+    # round a padded batch width up to a multiple of bucket_w
+    if bucket_w <= 0:
+        return width
+    return int(math.ceil(width / float(bucket_w))) * bucket_w
+
+
+def plan_rec_batches(wh_ratios, img_h, min_w, budget, min_efficiency=0.6, bucket_w=0):
+    """
+    Split crops sorted by aspect ratio into batches by a pixel budget.
+
+    A batch is padded to the width of its widest crop (at least min_w),
+    rounded up to a multiple of bucket_w when bucket_w > 0 so that batches
+    fall into a few width buckets and the predictor sees few input shapes.
+    It costs len(batch) * img_h * width pixels. Crops are added to the current
+    batch while that cost stays within budget and the padding efficiency
+    stays at least min_efficiency. The padding efficiency is the share of
+    the padded batch the crops would need on their own (each at least min_w
+    wide). A single crop larger than the budget gets its own batch.
+    args:
+        wh_ratios(list): width / height of the crops in ascending order
+        img_h(int): recognition input height
+        min_w(int): minimum input width
+        budget(int): maximum pixels (img_h * width * batch size) per batch
+        min_efficiency(float): minimum padding efficiency of a batch
+        bucket_w(int): width bucket size, 0 pads to the widest crop
+    return:
+        batches(list): (begin, end, padded width, padding efficiency) tuples
+    """
+    # widths the crops need on their own, ascending like wh_ratios
+    needs = [_crop_width(ratio, img_h, min_w, float("inf")) for ratio in wh_ratios]
+    batches = []
+    beg = 0
+    num = len(wh_ratios)
+    while beg < num:
+        needed = 0
+        end = beg
+        width = _bucket_width(min_w, bucket_w)
+        content = 0
+        while end < num:
+            new_width = max(width, _bucket_width(int(img_h * wh_ratios[end]), bucket_w))
+            new_needed = needed + needs[end]
+            # crops are resized to at most the batch width, only the widest
+            # crops of the batch can exceed it
+            new_content = new_needed
+            i = end
+            while i >= beg and needs[i] > new_width:
+                new_content -= needs[i] - new_width
+                i -= 1
+            size = end - beg + 1
+            if end > beg and (
+                size * img_h * new_width > budget
+                or new_content < min_efficiency * size * new_width
+            ):
+                break
+            width, needed, content, end = new_width, new_needed, new_content, end + 1
+        batches.append((beg, end, width, content / ((end - beg) * width)))
+        beg = end
+    return batches
+
 
 class TextRecognizer(object):
     def __init__(self, args, logger=None):
@@ -69,7 +158,10 @@ class TextRecognizer(object):
             logger = get_logger()
         self.rec_image_shape = [int(v) for v in args.rec_image_shape.split(",")]
         self.rec_batch_num = args.rec_batch_num
+        self.rec_batch_budget = args.rec_batch_budget
+        self.rec_batch_bucket = args.rec_batch_bucket
         self.rec_algorithm = args.rec_algorithm
+        self.batch_stats = []
         postprocess_params = {
             "name": "CTCLabelDecode",
             "character_dict_path": args.rec_char_dict_path,
@@ -201,6 +293,27 @@ class TextRecognizer(object):
                 logger=logger,
             )
         self.return_word_box = args.return_word_box
+        # crops of dynamic width recognizers are resized and normalized
+        # straight into a reused batch buffer
+        self.fused_preprocess = None
+        if args.use_fused_preprocess and self.rec_algorithm not in (
+            FIXED_WIDTH_ALGORITHMS + ["RARE"]
+        ):
+            self.fused_preprocess = ResizeNormalizeBatch(
+                scale=1.0 / 255, mean=[0.5, 0.5, 0.5], std=[0.5, 0.5, 0.5]
+            )
+
+    def resize_norm_img_batch(self, img_list, max_wh_ratio):
+        """resize_norm_img for a whole batch with ResizeNormalizeBatch"""
+        imgC, imgH, imgW = self.rec_image_shape
+        imgW = int((imgH * max_wh_ratio))
+        if self.use_onnx:
+            w = self.input_tensor.shape[3:][0]
+            if isinstance(w, str):
+                pass
+            elif w is not None and w > 0:
+                imgW = w
+        return self.fused_preprocess(img_list, (imgC, imgH, imgW))
 
     def resize_norm_img(self, img, max_wh_ratio):
         imgC, imgH, imgW = self.rec_image_shape
@@ -248,13 +361,17 @@ class TextRecognizer(object):
             if resized_w > self.rec_image_shape[2]:
                 resized_w = self.rec_image_shape[2]
             imgW = self.rec_image_shape[2]
-        resized_image = cv2.resize(img, (resized_w, imgH))
-        resized_image = resized_image.astype("float32")
-        resized_image = resized_image.transpose((2, 0, 1)) / 255
-        resized_image -= 0.5
-        resized_image /= 0.5
+        if (h, w) == (imgH, resized_w):
+            # already at input size, e.g. a crop of CropArena
+            resized_image = img
+        else:
+            resized_image = cv2.resize(img, (resized_w, imgH))
         padding_im = np.zeros((imgC, imgH, imgW), dtype=np.float32)
-        padding_im[:, :, 0:resized_w] = resized_image
+        norm_image = padding_im[:, :, 0:resized_w]
+        norm_image[:] = resized_image.transpose((2, 0, 1))
+        norm_image /= 255
+        norm_image -= 0.5
+        norm_image /= 0.5
         return padding_im
 
     def resize_norm_img_vl(self, img, image_shape):
@@ -586,12 +703,14 @@ class TextRecognizer(object):
         # Sorting can speed up the recognition process
         indices = np.argsort(np.array(width_list))
         rec_res = [["", 0.0]] * img_num
-        batch_num = self.rec_batch_num
         st = time.time()
         if self.benchmark:
             self.autolog.times.start()
-        for beg_img_no in range(0, img_num, batch_num):
-            end_img_no = min(img_num, beg_img_no + batch_num)
+        self.batch_stats = []
+        for beg_img_no, end_img_no, pad_width, pad_efficiency in self.plan_batches(
+            [width_list[i] for i in indices]
+        ):
+            batch_st = time.time()
             norm_img_batch = []
             if self.rec_algorithm == "SRN":
                 encoder_word_pos_list = []
@@ -608,89 +727,100 @@ class TextRecognizer(object):
                 wh_ratio = w * 1.0 / h
                 max_wh_ratio = max(max_wh_ratio, wh_ratio)
                 wh_ratio_list.append(wh_ratio)
-            for ino in range(beg_img_no, end_img_no):
-                if self.rec_algorithm == "SAR":
-                    norm_img, _, _, valid_ratio = self.resize_norm_img_sar(
-                        img_list[indices[ino]], self.rec_image_shape
-                    )
-                    norm_img = norm_img[np.newaxis, :]
-                    valid_ratio = np.expand_dims(valid_ratio, axis=0)
-                    valid_ratios.append(valid_ratio)
-                    norm_img_batch.append(norm_img)
-                elif self.rec_algorithm == "SRN":
-                    norm_img = self.process_image_srn(
-                        img_list[indices[ino]], self.rec_image_shape, 8, 25
-                    )
-                    encoder_word_pos_list.append(norm_img[1])
-                    gsrm_word_pos_list.append(norm_img[2])
-                    gsrm_slf_attn_bias1_list.append(norm_img[3])
-                    gsrm_slf_attn_bias2_list.append(norm_img[4])
-                    norm_img_batch.append(norm_img[0])
-                elif self.rec_algorithm in ["SVTR", "SATRN", "ParseQ", "CPPD"]:
-                    norm_img = self.resize_norm_img_svtr(
-                        img_list[indices[ino]], self.rec_image_shape
-                    )
-                    norm_img = norm_img[np.newaxis, :]
-                    norm_img_batch.append(norm_img)
-                elif self.rec_algorithm in ["CPPDPadding"]:
-                    norm_img = self.resize_norm_img_cppd_padding(
-                        img_list[indices[ino]], self.rec_image_shape
-                    )
-                    norm_img = norm_img[np.newaxis, :]
-                    norm_img_batch.append(norm_img)
-                elif self.rec_algorithm in ["VisionLAN", "PREN"]:
-                    norm_img = self.resize_norm_img_vl(
-                        img_list[indices[ino]], self.rec_image_shape
-                    )
-                    norm_img = norm_img[np.newaxis, :]
-                    norm_img_batch.append(norm_img)
-                elif self.rec_algorithm == "SPIN":
-                    norm_img = self.resize_norm_img_spin(img_list[indices[ino]])
-                    norm_img = norm_img[np.newaxis, :]
-                    norm_img_batch.append(norm_img)
-                elif self.rec_algorithm == "ABINet":
-                    norm_img = self.resize_norm_img_abinet(
-                        img_list[indices[ino]], self.rec_image_shape
-                    )
-                    norm_img = norm_img[np.newaxis, :]
-                    norm_img_batch.append(norm_img)
-                elif self.rec_algorithm == "RobustScanner":
-                    norm_img, _, _, valid_ratio = self.resize_norm_img_sar(
-                        img_list[indices[ino]],
-                        self.rec_image_shape,
-                        width_downsample_ratio=0.25,
-                    )
-                    norm_img = norm_img[np.newaxis, :]
-                    valid_ratio = np.expand_dims(valid_ratio, axis=0)
-                    valid_ratios = []
-                    valid_ratios.append(valid_ratio)
-                    norm_img_batch.append(norm_img)
-                    word_positions_list = []
-                    word_positions = np.array(range(0, 40)).astype("int64")
-                    word_positions = np.expand_dims(word_positions, axis=0)
-                    word_positions_list.append(word_positions)
-                elif self.rec_algorithm == "CAN":
-                    norm_img = self.norm_img_can(img_list[indices[ino]], max_wh_ratio)
-                    norm_img = norm_img[np.newaxis, :]
-                    norm_img_batch.append(norm_img)
-                    norm_image_mask = np.ones(norm_img.shape, dtype="float32")
-                    word_label = np.ones([1, 36], dtype="int64")
-                    norm_img_mask_batch = []
-                    word_label_list = []
-                    norm_img_mask_batch.append(norm_image_mask)
-                    word_label_list.append(word_label)
-                elif self.rec_algorithm == "LaTeXOCR":
-                    norm_img = self.norm_img_latexocr(img_list[indices[ino]])
-                    norm_img = norm_img[np.newaxis, :]
-                    norm_img_batch.append(norm_img)
-                else:
-                    norm_img = self.resize_norm_img(
-                        img_list[indices[ino]], max_wh_ratio
-                    )
-                    norm_img = norm_img[np.newaxis, :]
-                    norm_img_batch.append(norm_img)
-            norm_img_batch = np.concatenate(norm_img_batch)
-            norm_img_batch = norm_img_batch.copy()
+            if self.rec_batch_bucket > 0:
+                # pad to the width bucket chosen by the planner
+                max_wh_ratio = max(max_wh_ratio, pad_width / float(imgH))
+            if self.fused_preprocess is not None:
+                norm_img_batch = self.resize_norm_img_batch(
+                    [img_list[indices[ino]] for ino in range(beg_img_no, end_img_no)],
+                    max_wh_ratio,
+                )
+            else:
+                for ino in range(beg_img_no, end_img_no):
+                    if self.rec_algorithm == "SAR":
+                        norm_img, _, _, valid_ratio = self.resize_norm_img_sar(
+                            img_list[indices[ino]], self.rec_image_shape
+                        )
+                        norm_img = norm_img[np.newaxis, :]
+                        valid_ratio = np.expand_dims(valid_ratio, axis=0)
+                        valid_ratios.append(valid_ratio)
+                        norm_img_batch.append(norm_img)
+                    elif self.rec_algorithm == "SRN":
+                        norm_img = self.process_image_srn(
+                            img_list[indices[ino]], self.rec_image_shape, 8, 25
+                        )
+                        encoder_word_pos_list.append(norm_img[1])
+                        gsrm_word_pos_list.append(norm_img[2])
+                        gsrm_slf_attn_bias1_list.append(norm_img[3])
+                        gsrm_slf_attn_bias2_list.append(norm_img[4])
+                        norm_img_batch.append(norm_img[0])
+                    elif self.rec_algorithm in ["SVTR", "SATRN", "ParseQ", "CPPD"]:
+                        norm_img = self.resize_norm_img_svtr(
+                            img_list[indices[ino]], self.rec_image_shape
+                        )
+                        norm_img = norm_img[np.newaxis, :]
+                        norm_img_batch.append(norm_img)
+                    elif self.rec_algorithm in ["CPPDPadding"]:
+                        norm_img = self.resize_norm_img_cppd_padding(
+                            img_list[indices[ino]], self.rec_image_shape
+                        )
+                        norm_img = norm_img[np.newaxis, :]
+                        norm_img_batch.append(norm_img)
+                    elif self.rec_algorithm in ["VisionLAN", "PREN"]:
+                        norm_img = self.resize_norm_img_vl(
+                            img_list[indices[ino]], self.rec_image_shape
+                        )
+                        norm_img = norm_img[np.newaxis, :]
+                        norm_img_batch.append(norm_img)
+                    elif self.rec_algorithm == "SPIN":
+                        norm_img = self.resize_norm_img_spin(img_list[indices[ino]])
+                        norm_img = norm_img[np.newaxis, :]
+                        norm_img_batch.append(norm_img)
+                    elif self.rec_algorithm == "ABINet":
+                        norm_img = self.resize_norm_img_abinet(
+                            img_list[indices[ino]], self.rec_image_shape
+                        )
+                        norm_img = norm_img[np.newaxis, :]
+                        norm_img_batch.append(norm_img)
+                    elif self.rec_algorithm == "RobustScanner":
+                        norm_img, _, _, valid_ratio = self.resize_norm_img_sar(
+                            img_list[indices[ino]],
+                            self.rec_image_shape,
+                            width_downsample_ratio=0.25,
+                        )
+                        norm_img = norm_img[np.newaxis, :]
+                        valid_ratio = np.expand_dims(valid_ratio, axis=0)
+                        valid_ratios = []
+                        valid_ratios.append(valid_ratio)
+                        norm_img_batch.append(norm_img)
+                        word_positions_list = []
+                        word_positions = np.array(range(0, 40)).astype("int64")
+                        word_positions = np.expand_dims(word_positions, axis=0)
+                        word_positions_list.append(word_positions)
+                    elif self.rec_algorithm == "CAN":
+                        norm_img = self.norm_img_can(
+                            img_list[indices[ino]], max_wh_ratio
+                        )
+                        norm_img = norm_img[np.newaxis, :]
+                        norm_img_batch.append(norm_img)
+                        norm_image_mask = np.ones(norm_img.shape, dtype="float32")
+                        word_label = np.ones([1, 36], dtype="int64")
+                        norm_img_mask_batch = []
+                        word_label_list = []
+                        norm_img_mask_batch.append(norm_image_mask)
+                        word_label_list.append(word_label)
+                    elif self.rec_algorithm == "LaTeXOCR":
+                        norm_img = self.norm_img_latexocr(img_list[indices[ino]])
+                        norm_img = norm_img[np.newaxis, :]
+                        norm_img_batch.append(norm_img)
+                    else:
+                        norm_img = self.resize_norm_img(
+                            img_list[indices[ino]], max_wh_ratio
+                        )
+                        norm_img = norm_img[np.newaxis, :]
+                        norm_img_batch.append(norm_img)
+                norm_img_batch = np.concatenate(norm_img_batch)
+                norm_img_batch = norm_img_batch.copy()
             if self.benchmark:
                 self.autolog.times.stamp()
 
@@ -855,8 +985,58 @@ class TextRecognizer(object):
                 rec_res[indices[beg_img_no + rno]] = rec_result[rno]
             if self.benchmark:
                 self.autolog.times.end(stamp=True)
+            self.batch_stats.append(
+                {
+                    "batch_size": end_img_no - beg_img_no,
+                    "width": pad_width,
+                    "pad_efficiency": pad_efficiency,
+                    "latency": time.time() - batch_st,
+                }
+            )
+        if self.batch_stats:
+            logger.debug(
+                "rec batches: {}, padding efficiency: {:.3f}".format(
+                    len(self.batch_stats), self.pad_efficiency()
+                )
+            )
         return rec_res, time.time() - st
 
+    def plan_batches(self, wh_ratios):
+        """
+        Batches over the crops sorted by aspect ratio, as (begin, end, padded
+        width, padding efficiency). With rec_batch_budget > 0 the batches are
+        formed by plan_rec_batches and padded to rec_batch_bucket width
+        buckets, otherwise every rec_batch_num crops.
+        """
+        imgC, imgH, imgW = self.rec_image_shape[:3]
+        if self.rec_batch_budget > 0 and self.rec_algorithm not in (
+            FIXED_WIDTH_ALGORITHMS
+        ):
+            return plan_rec_batches(
+                wh_ratios,
+                imgH,
+                imgW,
+                self.rec_batch_budget,
+                bucket_w=self.rec_batch_bucket,
+            )
+        batches = []
+        for beg in range(0, len(wh_ratios), self.rec_batch_num):
+            end = min(len(wh_ratios), beg + self.rec_batch_num)
+            ratios = wh_ratios[beg:end]
+            width = max(imgW, int(imgH * max(ratios)))
+            content = sum(_crop_width(r, imgH, imgW, width) for r in ratios)
+            batches.append((beg, end, width, content / (len(ratios) * width)))
+        return batches
+
+    def pad_efficiency(self):
+        """Padding efficiency over all batches of the last call"""
+        padded = sum(stats["batch_size"] * stats["width"] for stats in self.batch_stats)
+        content = sum(
+            stats["batch_size"] * stats["width"] * stats["pad_efficiency"]
+            for stats in self.batch_stats
+        )
+        return content / max(padded, 1)
+
 
 def main(args):
     image_file_list = get_image_file_list(args.image_dir)
@@ -907,6 +1087,13 @@ def main(args):
         )
     if args.benchmark:
         text_recognizer.autolog.report()
+        logger.info(
+            "rec batches: {}, padding efficiency: {:.3f}, batch latency: {}".format(
+                len(text_recognizer.batch_stats),
+                text_recognizer.pad_efficiency(),
+                [round(stats["latency"], 4) for stats in text_recognizer.batch_stats],
+            )
+        )
 
 
 if __name__ == "__main__":
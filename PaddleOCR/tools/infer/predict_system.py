@@ -13,7 +13,8 @@
 # limitations under the License.
 import os
 import sys
-import subprocess
+import multiprocessing
+import traceback
 
 __dir__ = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(__dir__)
@@ -23,6 +24,9 @@ os.environ["FLAGS_allocator_strategy"] = "auto_growth"
 
 import cv2
 import copy
+import collections
+import queue
+import threading
 import numpy as np
 import json
 import time
@@ -34,6 +38,8 @@ import tools.infer.predict_det as predict_det
 import tools.infer.predict_cls as predict_cls
 from ppocr.utils.utility import get_image_file_list, check_and_read
 from ppocr.utils.logging import get_logger
+from ppocr.utils.reading_order import sort_boxes
+from ppocr.utils.crop_arena import CropArena
 from tools.infer.utility import (
     draw_ocr_box_txt,
     get_rotate_crop_image,
@@ -59,6 +65,15 @@ class TextSystem(object):
 
         self.args = args
         self.crop_image_res_index = 0
+        # crops are written at recognition input height, which only suits
+        # recognizers that resize to a dynamic width
+        self.crop_arena = None
+        if (
+            args.use_crop_arena
+            and self.text_recognizer.rec_algorithm
+            not in predict_rec.FIXED_WIDTH_ALGORITHMS
+        ):
+            self.crop_arena = CropArena(self.text_recognizer.rec_image_shape[1])
 
     def draw_crop_rec_res(self, output_dir, img_crop_list, rec_res):
         os.makedirs(output_dir, exist_ok=True)
@@ -73,15 +88,7 @@ class TextSystem(object):
             logger.debug(f"{bno}, {rec_res[bno]}")
         self.crop_image_res_index += bbox_num
 
-    def __call__(self, img, cls=True, slice={}):
-        time_dict = {"det": 0, "rec": 0, "cls": 0, "all": 0}
-
-        if img is None:
-            logger.debug("no valid image provided")
-            return None, None, time_dict
-
-        start = time.time()
-        ori_im = img.copy()
+    def _detect(self, img, slice={}):
         if slice:
             slice_gen = slice_generator(
                 img,
@@ -107,6 +114,47 @@ class TextSystem(object):
             elapse = sum(elapsed)
         else:
             dt_boxes, elapse = self.text_detector(img)
+        return dt_boxes, elapse
+
+    def _sort(self, dt_boxes):
+        return sorted_boxes(
+            dt_boxes,
+            y_tol=self.args.reading_order_tol,
+            columns=self.args.reading_order_columns,
+        )
+
+    def _crop(self, ori_im, dt_boxes, crop_arena=None):
+        if crop_arena is not None:
+            return crop_arena.crop(ori_im, dt_boxes, self.args.det_box_type)
+        img_crop_list = []
+        for bno in range(len(dt_boxes)):
+            tmp_box = copy.deepcopy(dt_boxes[bno])
+            if self.args.det_box_type == "quad":
+                img_crop = get_rotate_crop_image(ori_im, tmp_box)
+            else:
+                img_crop = get_minarea_rect_crop(ori_im, tmp_box)
+            img_crop_list.append(img_crop)
+        return img_crop_list
+
+    def _filter(self, dt_boxes, rec_res):
+        filter_boxes, filter_rec_res = [], []
+        for box, rec_result in zip(dt_boxes, rec_res):
+            text, score = rec_result[0], rec_result[1]
+            if score >= self.drop_score:
+                filter_boxes.append(box)
+                filter_rec_res.append(rec_result)
+        return filter_boxes, filter_rec_res
+
+    def __call__(self, img, cls=True, slice={}):
+        time_dict = {"det": 0, "rec": 0, "cls": 0, "all": 0}
+
+        if img is None:
+            logger.debug("no valid image provided")
+            return None, None, time_dict
+
+        start = time.time()
+        ori_im = img.copy()
+        dt_boxes, elapse = self._detect(img, slice)
 
         time_dict["det"] = elapse
 
@@ -119,17 +167,10 @@ class TextSystem(object):
             logger.debug(
                 "dt_boxes num : {}, elapsed : {}".format(len(dt_boxes), elapse)
             )
-        img_crop_list = []
 
-        dt_boxes = sorted_boxes(dt_boxes)
+        dt_boxes = self._sort(dt_boxes)
+        img_crop_list = self._crop(ori_im, dt_boxes, self.crop_arena)
 
-        for bno in range(len(dt_boxes)):
-            tmp_box = copy.deepcopy(dt_boxes[bno])
-            if self.args.det_box_type == "quad":
-                img_crop = get_rotate_crop_image(ori_im, tmp_box)
-            else:
-                img_crop = get_minarea_rect_crop(ori_im, tmp_box)
-            img_crop_list.append(img_crop)
         if self.use_angle_cls and cls:
             img_crop_list, angle_list, elapse = self.text_classifier(img_crop_list)
             time_dict["cls"] = elapse
@@ -146,69 +187,201 @@ class TextSystem(object):
         logger.debug("rec_res num  : {}, elapsed : {}".format(len(rec_res), elapse))
         if self.args.save_crop_res:
             self.draw_crop_rec_res(self.args.crop_res_save_dir, img_crop_list, rec_res)
-        filter_boxes, filter_rec_res = [], []
-        for box, rec_result in zip(dt_boxes, rec_res):
-            text, score = rec_result[0], rec_result[1]
-            if score >= self.drop_score:
-                filter_boxes.append(box)
-                filter_rec_res.append(rec_result)
+        filter_boxes, filter_rec_res = self._filter(dt_boxes, rec_res)
         end = time.time()
         time_dict["all"] = end - start
         return filter_boxes, filter_rec_res, time_dict
 
+    def pipeline(self, images, cls=True, queue_size=4, rec_crops=None):
+        """
+        Streaming version of __call__ for an iterable of images (arrays or
+        image paths). Decoding, detection, cropping, angle classification and
+        recognition run as concurrent stages connected by bounded queues, and
+        the recognizer is fed with crops from several images at once, so the
+        throughput approaches that of the slowest stage.
+
+        Yields (dt_boxes, rec_res, time_dict) per input in input order, as
+        returned by __call__. time_dict["all"] is the latency of the image
+        from the start of its detection to the end of its recognition.
+        """
+        rec_crops = rec_crops or self.text_recognizer.rec_batch_num * 8
+        use_cls = self.use_angle_cls and cls
+        stop = threading.Event()
+
+        def put(q, item):
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(q):
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return _PIPELINE_END
+
+        def stage(name, q_in, q_out, fn):
+            def run():
+                try:
+                    while True:
+                        item = get(q_in) if q_in is not None else None
+                        if item is _PIPELINE_END or isinstance(item, _StageError):
+                            put(q_out, item)
+                            return
+                        for result in fn(item):
+                            if not put(q_out, result):
+                                return
+                        if q_in is None:
+                            return
+                except Exception as e:
+                    logger.exception("pipeline stage {} failed".format(name))
+                    put(q_out, _StageError(e))
+
+            return threading.Thread(target=run, name="ocr-" + name, daemon=True)
+
+        def decode(_):
+            for img in images:
+                if isinstance(img, str):
+                    img = cv2.imread(img)
+                if stop.is_set():
+                    return
+                yield img
+            yield _PIPELINE_END
+
+        def detect(img):
+            result = {
+                "time_dict": {"det": 0, "rec": 0, "cls": 0, "all": 0},
+                "start": time.time(),
+                "dt_boxes": None,
+                "crops": [],
+            }
+            if img is None:
+                logger.debug("no valid image provided")
+            else:
+                dt_boxes, elapse = self.text_detector(img)
+                result["time_dict"]["det"] = elapse
+                if dt_boxes is not None:
+                    result["dt_boxes"] = self._sort(dt_boxes)
+            result["img"] = img
+            yield result
+
+        def crop(result):
+            img = result.pop("img")
+            if result["dt_boxes"] is not None:
+                # crops stay in flight until recognition, one arena per image
+                crop_arena = None
+                if self.crop_arena is not None:
+                    crop_arena = CropArena(self.crop_arena.height)
+                result["crops"] = self._crop(img, result["dt_boxes"], crop_arena)
+            yield result
+
+        def classify(result):
+            if result["crops"]:
+                result["crops"], _, elapse = self.text_classifier(result["crops"])
+                result["time_dict"]["cls"] = elapse
+            yield result
+
+        pending = collections.deque()
+
+        def recognize(result):
+            # fill the recognition batch with crops of images already waiting
+            group, num_crops = [result], len(result["crops"])
+            while num_crops < rec_crops:
+                try:
+                    item = rec_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _PIPELINE_END or isinstance(item, _StageError):
+                    pending.append(item)
+                    break
+                group.append(item)
+                num_crops += len(item["crops"])
+
+            crops = [img for item in group for img in item["crops"]]
+            rec_res, elapse = self.text_recognizer(crops) if crops else ([], 0)
+            if self.args.save_crop_res and crops:
+                self.draw_crop_rec_res(self.args.crop_res_save_dir, crops, rec_res)
+            offset = 0
+            for item in group:
+                n = len(item["crops"])
+                time_dict = item["time_dict"]
+                time_dict["rec"] = elapse * n / max(num_crops, 1)
+                time_dict["all"] = time.time() - item["start"]
+                if item["dt_boxes"] is None:
+                    yield None, None, time_dict
+                else:
+                    yield (
+                        *self._filter(item["dt_boxes"], rec_res[offset : offset + n]),
+                        time_dict,
+                    )
+                offset += n
+            while pending:
+                yield pending.popleft()
+
+        decode_queue = queue.Queue(queue_size)
+        det_queue = queue.Queue(queue_size)
+        crop_queue = queue.Queue(queue_size)
+        rec_queue = queue.Queue(queue_size)
+        out_queue = queue.Queue(queue_size)
+        threads = [
+            stage("decode", None, decode_queue, decode),
+            stage("det", decode_queue, det_queue, detect),
+            stage("crop", det_queue, crop_queue, crop),
+        ]
+        if use_cls:
+            threads.append(stage("cls", crop_queue, rec_queue, classify))
+        else:
+            rec_queue = crop_queue
+        threads.append(stage("rec", rec_queue, out_queue, recognize))
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                item = get(out_queue)
+                if item is _PIPELINE_END:
+                    break
+                if isinstance(item, _StageError):
+                    raise item.error
+                yield item
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
 
-def sorted_boxes(dt_boxes):
+
+class _StageError(object):
+    def __init__(self, error):
+        self.error = error
+
+
+_PIPELINE_END = object()
+
+
+def sorted_boxes(dt_boxes, y_tol=10, columns=False):
     """
     Sort text boxes in order from top to bottom, left to right
     args:
-        dt_boxes(array):detected text boxes with shape [4, 2]
+        dt_boxes(array):detected text boxes with shape [N, 4, 2]
+        y_tol(float):boxes whose y centers are closer than this are on one line
+        columns(bool):read multi-column layouts column by column
     return:
-        sorted boxes(array) with shape [4, 2]
+        sorted boxes(list) of arrays with shape [4, 2]
     """
-    num_boxes = dt_boxes.shape[0]
-    sorted_boxes = sorted(dt_boxes, key=lambda x: (x[0][1], x[0][0]))
-    _boxes = list(sorted_boxes)
-
-    for i in range(num_boxes - 1):
-        for j in range(i, -1, -1):
-            if abs(_boxes[j + 1][0][1] - _boxes[j][0][1]) < 10 and (
-                _boxes[j + 1][0][0] < _boxes[j][0][0]
-            ):
-                tmp = _boxes[j]
-                _boxes[j] = _boxes[j + 1]
-                _boxes[j + 1] = tmp
-            else:
-                break
-    return _boxes
+    return sort_boxes(dt_boxes, y_tol=y_tol, columns=columns)
 
 
-def main(args):
-    image_file_list = get_image_file_list(args.image_dir)
-    image_file_list = image_file_list[args.process_id :: args.total_process_num]
-    text_sys = TextSystem(args)
-    is_visualize = True
-    font_path = args.vis_font_path
-    drop_score = args.drop_score
-    draw_img_save_dir = args.draw_img_save_dir
-    os.makedirs(draw_img_save_dir, exist_ok=True)
-    save_results = []
-
-    logger.info(
-        "In PP-OCRv3, rec_image_shape parameter defaults to '3, 48, 320', "
-        "if you are using recognition model with PP-OCRv2 or an older version, please set --rec_image_shape='3,32,320"
-    )
-
-    # warm up 10 times
-    if args.warmup:
-        img = np.random.uniform(0, 255, [640, 640, 3]).astype(np.uint8)
-        for i in range(10):
-            res = text_sys(img)
-
-    total_time = 0
-    cpu_mem, gpu_mem, gpu_util = 0, 0, 0
-    _st = time.time()
-    count = 0
-    for idx, image_file in enumerate(image_file_list):
+def iter_images(image_file_list, page_num=0, start=0):
+    """
+    Read the images of image_file_list, the pages of gif and pdf files one by one
+    return:
+        entries(generator) of (idx, image_file, index, imgs, img, flag_gif, flag_pdf)
+    """
+    for idx, image_file in enumerate(image_file_list, start):
         img, flag_gif, flag_pdf = check_and_read(image_file)
         if not flag_gif and not flag_pdf:
             img = cv2.imread(image_file)
@@ -218,88 +391,232 @@ def main(args):
                 continue
             imgs = [img]
         else:
-            page_num = args.page_num
-            if page_num > len(img) or page_num == 0:
-                page_num = len(img)
-            imgs = img[:page_num]
+            n = page_num if 0 < page_num <= len(img) else len(img)
+            imgs = img[:n]
         for index, img in enumerate(imgs):
-            starttime = time.time()
-            dt_boxes, rec_res, time_dict = text_sys(img)
-            elapse = time.time() - starttime
-            total_time += elapse
-            if len(imgs) > 1:
-                logger.debug(
-                    str(idx)
-                    + "_"
-                    + str(index)
-                    + "  Predict time of %s: %.3fs" % (image_file, elapse)
-                )
-            else:
-                logger.debug(
-                    str(idx) + "  Predict time of %s: %.3fs" % (image_file, elapse)
-                )
-            for text, score in rec_res:
-                logger.debug("{}, {:.3f}".format(text, score))
-
-            res = [
-                {
-                    "transcription": rec_res[i][0],
-                    "points": np.array(dt_boxes[i]).astype(np.int32).tolist(),
-                }
-                for i in range(len(dt_boxes))
-            ]
-            if len(imgs) > 1:
-                save_pred = (
-                    os.path.basename(image_file)
-                    + "_"
-                    + str(index)
-                    + "\t"
-                    + json.dumps(res, ensure_ascii=False)
-                    + "\n"
-                )
-            else:
-                save_pred = (
-                    os.path.basename(image_file)
-                    + "\t"
-                    + json.dumps(res, ensure_ascii=False)
-                    + "\n"
-                )
-            save_results.append(save_pred)
-
-            if is_visualize:
-                image = Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
-                boxes = dt_boxes
-                txts = [rec_res[i][0] for i in range(len(rec_res))]
-                scores = [rec_res[i][1] for i in range(len(rec_res))]
-
-                draw_img = draw_ocr_box_txt(
-                    image,
-                    boxes,
-                    txts,
-                    scores,
-                    drop_score=drop_score,
-                    font_path=font_path,
-                )
-                if flag_gif:
-                    save_file = image_file[:-3] + "png"
-                elif flag_pdf:
-                    save_file = image_file.replace(".pdf", "_" + str(index) + ".png")
-                else:
-                    save_file = image_file
-                cv2.imwrite(
-                    os.path.join(draw_img_save_dir, os.path.basename(save_file)),
-                    draw_img[:, :, ::-1],
-                )
-                logger.debug(
-                    "The visualized image saved in {}".format(
-                        os.path.join(draw_img_save_dir, os.path.basename(save_file))
+            yield idx, image_file, index, imgs, img, flag_gif, flag_pdf
+
+
+def save_result(args, entry, dt_boxes, rec_res, elapse):
+    """
+    Log the result of one image and save its visualization
+    return:
+        save_pred(str): the line of the image in system_results.txt
+    """
+    idx, image_file, index, imgs, img, flag_gif, flag_pdf = entry
+    if len(imgs) > 1:
+        logger.debug(
+            str(idx)
+            + "_"
+            + str(index)
+            + "  Predict time of %s: %.3fs" % (image_file, elapse)
+        )
+    else:
+        logger.debug(str(idx) + "  Predict time of %s: %.3fs" % (image_file, elapse))
+    for text, score in rec_res:
+        logger.debug("{}, {:.3f}".format(text, score))
+
+    res = [
+        {
+            "transcription": rec_res[i][0],
+            "points": np.array(dt_boxes[i]).astype(np.int32).tolist(),
+        }
+        for i in range(len(dt_boxes))
+    ]
+    if len(imgs) > 1:
+        save_pred = (
+            os.path.basename(image_file)
+            + "_"
+            + str(index)
+            + "\t"
+            + json.dumps(res, ensure_ascii=False)
+            + "\n"
+        )
+    else:
+        save_pred = (
+            os.path.basename(image_file)
+            + "\t"
+            + json.dumps(res, ensure_ascii=False)
+            + "\n"
+        )
+
+    image = Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+    boxes = dt_boxes
+    txts = [rec_res[i][0] for i in range(len(rec_res))]
+    scores = [rec_res[i][1] for i in range(len(rec_res))]
+
+    draw_img = draw_ocr_box_txt(
+        image,
+        boxes,
+        txts,
+        scores,
+        drop_score=args.drop_score,
+        font_path=args.vis_font_path,
+    )
+    if flag_gif:
+        save_file = image_file[:-3] + "png"
+    elif flag_pdf:
+        save_file = image_file.replace(".pdf", "_" + str(index) + ".png")
+    else:
+        save_file = image_file
+    cv2.imwrite(
+        os.path.join(args.draw_img_save_dir, os.path.basename(save_file)),
+        draw_img[:, :, ::-1],
+    )
+    logger.debug(
+        "The visualized image saved in {}".format(
+            os.path.join(args.draw_img_save_dir, os.path.basename(save_file))
+        )
+    )
+    return save_pred
+
+
+def _warmup(text_sys):
+    img = np.random.uniform(0, 255, [640, 640, 3]).astype(np.uint8)
+    for i in range(10):
+        res = text_sys(img)
+
+
+def _mp_worker(args, task_queue, result_queue, system_factory=None):
+    """
+    Worker process of mp_predict: loads the models once and predicts the image
+    files of task_queue until it gets None
+    """
+    text_sys = (system_factory or TextSystem)(args)
+    if args.warmup:
+        _warmup(text_sys)
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        seq, image_file = task
+        try:
+            save_preds, total_elapse = [], 0
+            for entry in iter_images([image_file], args.page_num, start=seq):
+                starttime = time.time()
+                dt_boxes, rec_res, time_dict = text_sys(entry[4])
+                elapse = time.time() - starttime
+                total_elapse += elapse
+                save_preds.append(save_result(args, entry, dt_boxes, rec_res, elapse))
+            result_queue.put((seq, save_preds, total_elapse, None))
+        except Exception:
+            result_queue.put((seq, [], 0, traceback.format_exc()))
+
+
+def mp_predict(args, image_file_list, system_factory=None):
+    """
+    Predict image_file_list with a pool of args.total_process_num worker
+    processes. Each worker loads the models once and takes the next image file
+    from a shared queue as soon as it is done with the previous one, so slow
+    images do not hold up the others.
+    args:
+        system_factory(callable): builds the OCR system of a worker from args,
+            TextSystem by default. Workers are spawned, so it must be picklable,
+            e.g. a module level class.
+    return:
+        results(generator) of (save_preds, elapse) per image file, in the order
+            of image_file_list
+    """
+    ctx = multiprocessing.get_context("spawn")
+    task_queue, result_queue = ctx.Queue(), ctx.Queue()
+    worker_args = copy.copy(args)
+    worker_args.use_mp = False
+    workers = [
+        ctx.Process(
+            target=_mp_worker,
+            args=(worker_args, task_queue, result_queue, system_factory),
+            daemon=True,
+        )
+        for _ in range(max(1, args.total_process_num))
+    ]
+    for worker in workers:
+        worker.start()
+    for task in enumerate(image_file_list):
+        task_queue.put(task)
+    for _ in workers:
+        task_queue.put(None)
+
+    # results arrive in completion order and wait here for their turn
+    pending = {}
+    try:
+        for seq in range(len(image_file_list)):
+            while seq not in pending:
+                try:
+                    done, save_preds, elapse, error = result_queue.get(timeout=1)
+                except queue.Empty:
+                    exitcodes = [worker.exitcode for worker in workers]
+                    if any(code not in (None, 0) for code in exitcodes):
+                        raise RuntimeError(
+                            "ocr worker process exited with code {}".format(
+                                [code for code in exitcodes if code][0]
+                            )
+                        )
+                    continue
+                if error is not None:
+                    raise RuntimeError(
+                        "ocr worker failed on {}:\n{}".format(
+                            image_file_list[done], error
+                        )
                     )
-                )
+                pending[done] = (save_preds, elapse)
+            yield pending.pop(seq)
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
 
-    logger.info("The predict total time is {}".format(time.time() - _st))
-    if args.benchmark:
-        text_sys.text_detector.autolog.report()
-        text_sys.text_recognizer.autolog.report()
+
+def main(args):
+    image_file_list = get_image_file_list(args.image_dir)
+    draw_img_save_dir = args.draw_img_save_dir
+    os.makedirs(draw_img_save_dir, exist_ok=True)
+    save_results = []
+
+    logger.info(
+        "In PP-OCRv3, rec_image_shape parameter defaults to '3, 48, 320', "
+        "if you are using recognition model with PP-OCRv2 or an older version, please set --rec_image_shape='3,32,320"
+    )
+
+    _st = time.time()
+    if args.use_mp:
+        for save_preds, elapse in mp_predict(args, image_file_list):
+            save_results.extend(save_preds)
+        logger.info("The predict total time is {}".format(time.time() - _st))
+    else:
+        image_file_list = image_file_list[args.process_id :: args.total_process_num]
+        text_sys = TextSystem(args)
+        # warm up 10 times
+        if args.warmup:
+            _warmup(text_sys)
+
+        def iter_results():
+            if not args.use_pipeline:
+                for entry in iter_images(image_file_list, args.page_num):
+                    starttime = time.time()
+                    dt_boxes, rec_res, time_dict = text_sys(entry[4])
+                    yield entry, dt_boxes, rec_res, time.time() - starttime
+                return
+            # the pipeline reads ahead, entries wait here until their result is out
+            entries = collections.deque()
+
+            def feed():
+                for entry in iter_images(image_file_list, args.page_num):
+                    entries.append(entry)
+                    yield entry[4]
+
+            for dt_boxes, rec_res, time_dict in text_sys.pipeline(feed()):
+                yield entries.popleft(), dt_boxes, rec_res, time_dict["all"]
+
+        for entry, dt_boxes, rec_res, elapse in iter_results():
+            save_results.append(save_result(args, entry, dt_boxes, rec_res, elapse))
+
+        logger.info("The predict total time is {}".format(time.time() - _st))
+        if args.benchmark:
+            text_sys.text_detector.autolog.report()
+            text_sys.text_recognizer.autolog.report()
+            for metrics in utility.predictor_registry.metrics():
+                logger.info("predictor: {}".format(metrics))
 
     with open(
         os.path.join(draw_img_save_dir, "system_results.txt"), "w", encoding="utf-8"
@@ -309,18 +626,4 @@ def main(args):
 
 if __name__ == "__main__":
     args = utility.parse_args()
-    if args.use_mp:
-        p_list = []
-        total_process_num = args.total_process_num
-        for process_id in range(total_process_num):
-            cmd = (
-                [sys.executable, "-u"]
-                + sys.argv
-                + ["--process_id={}".format(process_id), "--use_mp={}".format(False)]
-            )
-            p = subprocess.Popen(cmd, stdout=sys.stdout, stderr=sys.stdout)
-            p_list.append(p)
-        for p in p_list:
-            p.wait()
-    else:
-        main(args)
+    main(args)
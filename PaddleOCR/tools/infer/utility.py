@@ -23,8 +23,11 @@ from PIL import Image, ImageDraw, ImageFont
 import math
 from paddle import inference
 import random
+import threading
+import time
 import yaml
 from ppocr.utils.logging import get_logger
+from ppocr.utils.crop_arena import minarea_rect_points
 
 
 def str2bool(v):
@@ -63,6 +66,8 @@ def init_args():
     parser.add_argument("--det_limit_side_len", type=float, default=960)
     parser.add_argument("--det_limit_type", type=str, default="max")
     parser.add_argument("--det_box_type", type=str, default="quad")
+    parser.add_argument("--det_batch_num", type=int, default=1)
+    parser.add_argument("--det_batch_pad", type=str2bool, default=False)
 
     # DB params
     parser.add_argument("--det_db_thresh", type=float, default=0.3)
@@ -99,6 +104,8 @@ def init_args():
     parser.add_argument("--rec_image_inverse", type=str2bool, default=True)
     parser.add_argument("--rec_image_shape", type=str, default="3, 48, 320")
     parser.add_argument("--rec_batch_num", type=int, default=6)
+    parser.add_argument("--rec_batch_budget", type=int, default=0)
+    parser.add_argument("--rec_batch_bucket", type=int, default=0)
     parser.add_argument("--max_text_length", type=int, default=25)
     parser.add_argument(
         "--rec_char_dict_path", type=str, default="./ppocr/utils/ppocr_keys_v1.txt"
@@ -106,6 +113,11 @@ def init_args():
     parser.add_argument("--use_space_char", type=str2bool, default=True)
     parser.add_argument("--vis_font_path", type=str, default="./doc/fonts/simfang.ttf")
     parser.add_argument("--drop_score", type=float, default=0.5)
+    parser.add_argument("--reading_order_tol", type=float, default=10)
+    parser.add_argument("--reading_order_columns", type=str2bool, default=False)
+    # bilinear single-warp crops, opt-in until checked against the
+    # get_rotate_crop_image + INTER_CUBIC path on recognition accuracy
+    parser.add_argument("--use_crop_arena", type=str2bool, default=False)
 
     # params for e2e
     parser.add_argument("--e2e_algorithm", type=str, default="PGNet")
@@ -146,6 +158,7 @@ def init_args():
 
     # multi-process
     parser.add_argument("--use_mp", type=str2bool, default=False)
+    parser.add_argument("--use_pipeline", type=str2bool, default=False)
     parser.add_argument("--total_process_num", type=int, default=1)
     parser.add_argument("--process_id", type=int, default=0)
 
@@ -154,6 +167,8 @@ def init_args():
 
     parser.add_argument("--show_log", type=str2bool, default=True)
     parser.add_argument("--use_onnx", type=str2bool, default=False)
+    parser.add_argument("--use_shared_predictor", type=str2bool, default=True)
+    parser.add_argument("--use_fused_preprocess", type=str2bool, default=False)
     parser.add_argument("--onnx_providers", nargs="+", type=str, default=False)
     parser.add_argument("--onnx_sess_options", type=list, default=False)
 
@@ -173,6 +188,128 @@ def parse_args():
     return parser.parse_args()
 
 
+def _rss_bytes():
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process(os.getpid()).memory_info().rss
+
+
+class _PredictorEntry(object):
+    def __init__(self, key):
+        self.key = key
+        self.lock = threading.Lock()
+        self.predictor = None
+        self.config = None
+        self.load_time = None
+        self.memory = None
+        self.users = 0
+
+
+class PredictorRegistry(object):
+    """
+    Process-level cache of inference predictors, so that text, table, layout
+    and KIE systems built in one process load every model once.
+    A paddle predictor is loaded once per key and kept as a template, every
+    caller gets its own predictor.clone() that shares the weights but has its
+    own input and output tensors, so clones can run in different threads.
+    onnxruntime sessions are thread safe and are handed out as they are.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def acquire(self, key, load):
+        """
+        args:
+            key(tuple): (model path, mode, backend, precision, options)
+            load(callable): loads the model, returns (predictor, config)
+        return:
+            (predictor, config) for the caller, a clone for paddle predictors
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _PredictorEntry(key)
+        with entry.lock:
+            if entry.predictor is None:
+                rss = _rss_bytes()
+                start = time.time()
+                entry.predictor, entry.config = load()
+                entry.load_time = time.time() - start
+                if rss is not None:
+                    entry.memory = _rss_bytes() - rss
+            entry.users += 1
+            if hasattr(entry.predictor, "clone"):
+                return entry.predictor.clone(), entry.config
+            return entry.predictor, entry.config
+
+    def metrics(self):
+        """
+        return:
+            metrics(list) of dicts with the model, mode, backend and precision
+            of every loaded predictor, its load time in seconds, the growth of
+            the resident memory while loading in bytes (None without psutil)
+            and the number of callers sharing it
+        """
+        with self._lock:
+            entries = list(self._entries.values())
+        return [
+            {
+                "model": entry.key[0],
+                "mode": entry.key[1],
+                "backend": entry.key[2],
+                "precision": entry.key[3],
+                "load_time": entry.load_time,
+                "memory": entry.memory,
+                "users": entry.users,
+            }
+            for entry in entries
+            if entry.predictor is not None
+        ]
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+
+
+predictor_registry = PredictorRegistry()
+
+
+def _predictor_key(args, mode, model_dir):
+    precision = getattr(args, "precision", "fp32")
+    if args.use_onnx:
+        backend = "onnx"
+        options = (str(args.onnx_providers), args.use_gpu, args.gpu_id)
+    elif args.use_gpu:
+        backend = "tensorrt" if args.use_tensorrt else "gpu"
+        options = (
+            args.gpu_id,
+            args.gpu_mem,
+            args.max_batch_size,
+            args.min_subgraph_size,
+        )
+    else:
+        backend = "cpu"
+        for device in ["npu", "mlu", "xpu", "gcu"]:
+            if getattr(args, "use_" + device, False):
+                backend = device
+        options = (args.enable_mkldnn, getattr(args, "cpu_threads", 10))
+    # some graph passes depend on the mode and the rec algorithm
+    if mode == "rec":
+        options += (args.rec_algorithm,)
+    return (os.path.abspath(model_dir), mode, backend, precision, options)
+
+
+def _acquire_predictor(args, mode, model_dir, load):
+    if not getattr(args, "use_shared_predictor", False):
+        return load()
+    key = _predictor_key(args, mode, model_dir)
+    return predictor_registry.acquire(key, load)
+
+
 def create_predictor(args, mode, logger):
     if mode == "det":
         model_dir = args.det_model_dir
@@ -197,37 +334,9 @@ def create_predictor(args, mode, logger):
         logger.info("not find {} model file path {}".format(mode, model_dir))
         sys.exit(0)
     if args.use_onnx:
-        import onnxruntime as ort
-
-        model_file_path = model_dir
-        if not os.path.exists(model_file_path):
-            raise ValueError("not find model file path {}".format(model_file_path))
-
-        sess_options = args.onnx_sess_options or None
-
-        if args.onnx_providers and len(args.onnx_providers) > 0:
-            sess = ort.InferenceSession(
-                model_file_path,
-                providers=args.onnx_providers,
-                sess_options=sess_options,
-            )
-        elif args.use_gpu:
-            sess = ort.InferenceSession(
-                model_file_path,
-                providers=[
-                    (
-                        "CUDAExecutionProvider",
-                        {"device_id": args.gpu_id, "cudnn_conv_algo_search": "DEFAULT"},
-                    )
-                ],
-                sess_options=sess_options,
-            )
-        else:
-            sess = ort.InferenceSession(
-                model_file_path,
-                providers=["CPUExecutionProvider"],
-                sess_options=sess_options,
-            )
+        sess = _acquire_predictor(
+            args, mode, model_dir, lambda: (_load_onnx_session(args, model_dir), None)
+        )[0]
         inputs = sess.get_inputs()
         return (
             sess,
@@ -236,194 +345,233 @@ def create_predictor(args, mode, logger):
             None,
         )
 
+    predictor, config = _acquire_predictor(
+        args,
+        mode,
+        model_dir,
+        lambda: _load_paddle_predictor(args, mode, logger, model_dir),
+    )
+    input_names = predictor.get_input_names()
+    if mode in ["ser", "re"]:
+        input_tensor = []
+        for name in input_names:
+            input_tensor.append(predictor.get_input_handle(name))
     else:
-        file_names = ["model", "inference"]
-        for file_name in file_names:
-            params_file_path = f"{model_dir}/{file_name}.pdiparams"
-            if os.path.exists(params_file_path):
-                break
-
-        if not os.path.exists(params_file_path):
-            raise ValueError(f"not find {file_name}.pdiparams in {model_dir}")
-
-        if not (
-            os.path.exists(f"{model_dir}/{file_name}.pdmodel")
-            or os.path.exists(f"{model_dir}/{file_name}.json")
-        ):
-            raise ValueError(
-                f"neither {file_name}.json nor {file_name}.pdmodel was found in {model_dir}."
-            )
+        for name in input_names:
+            input_tensor = predictor.get_input_handle(name)
+    output_tensors = get_output_tensors(args, mode, predictor)
+    return predictor, input_tensor, output_tensors, config
 
-        if os.path.exists(f"{model_dir}/{file_name}.json"):
-            model_file_path = f"{model_dir}/{file_name}.json"
-        else:
-            model_file_path = f"{model_dir}/{file_name}.pdmodel"
 
-        config = inference.Config(model_file_path, params_file_path)
+def _load_onnx_session(args, model_dir):
+    import onnxruntime as ort
 
-        if hasattr(args, "precision"):
-            if args.precision == "fp16" and args.use_tensorrt:
-                precision = inference.PrecisionType.Half
-            elif args.precision == "int8":
-                precision = inference.PrecisionType.Int8
-            else:
-                precision = inference.PrecisionType.Float32
+    model_file_path = model_dir
+    if not os.path.exists(model_file_path):
+        raise ValueError("not find model file path {}".format(model_file_path))
+
+    sess_options = args.onnx_sess_options or None
+
+    if args.onnx_providers and len(args.onnx_providers) > 0:
+        sess = ort.InferenceSession(
+            model_file_path,
+            providers=args.onnx_providers,
+            sess_options=sess_options,
+        )
+    elif args.use_gpu:
+        sess = ort.InferenceSession(
+            model_file_path,
+            providers=[
+                (
+                    "CUDAExecutionProvider",
+                    {"device_id": args.gpu_id, "cudnn_conv_algo_search": "DEFAULT"},
+                )
+            ],
+            sess_options=sess_options,
+        )
+    else:
+        sess = ort.InferenceSession(
+            model_file_path,
+            providers=["CPUExecutionProvider"],
+            sess_options=sess_options,
+        )
+    return sess
+
+
+def _load_paddle_predictor(args, mode, logger, model_dir):
+    file_names = ["model", "inference"]
+    for file_name in file_names:
+        params_file_path = f"{model_dir}/{file_name}.pdiparams"
+        if os.path.exists(params_file_path):
+            break
+
+    if not os.path.exists(params_file_path):
+        raise ValueError(f"not find {file_name}.pdiparams in {model_dir}")
+
+    if not (
+        os.path.exists(f"{model_dir}/{file_name}.pdmodel")
+        or os.path.exists(f"{model_dir}/{file_name}.json")
+    ):
+        raise ValueError(
+            f"neither {file_name}.json nor {file_name}.pdmodel was found in {model_dir}."
+        )
+
+    if os.path.exists(f"{model_dir}/{file_name}.json"):
+        model_file_path = f"{model_dir}/{file_name}.json"
+    else:
+        model_file_path = f"{model_dir}/{file_name}.pdmodel"
+
+    config = inference.Config(model_file_path, params_file_path)
+
+    if hasattr(args, "precision"):
+        if args.precision == "fp16" and args.use_tensorrt:
+            precision = inference.PrecisionType.Half
+        elif args.precision == "int8":
+            precision = inference.PrecisionType.Int8
         else:
             precision = inference.PrecisionType.Float32
+    else:
+        precision = inference.PrecisionType.Float32
 
-        if args.use_gpu:
-            gpu_id = get_infer_gpuid()
-            if gpu_id is None:
-                logger.warning(
-                    "GPU is not found in current device by nvidia-smi. Please check your device or ignore it if run on jetson."
-                )
-            config.enable_use_gpu(args.gpu_mem, args.gpu_id)
-            if args.use_tensorrt:
-                if ".json" in model_file_path:
-                    trt_dynamic_shapes = {}
-                    trt_dynamic_shape_input_data = {}
-                    if os.path.exists(f"{model_dir}/inference.yml"):
-                        model_config = load_config(f"{model_dir}/inference.yml")
-                        trt_dynamic_shapes = (
-                            model_config.get("Hpi", {})
-                            .get("backend_configs", {})
-                            .get("paddle_infer", {})
-                            .get("trt_dynamic_shapes", {})
-                        )
-                        trt_dynamic_shape_input_data = (
-                            model_config.get("Hpi", {})
-                            .get("backend_configs", {})
-                            .get("paddle_infer", {})
-                            .get("trt_dynamic_shapes_input_data", {})
-                        )
-
-                    if not trt_dynamic_shapes:
-                        raise RuntimeError(
-                            "Configuration Error: 'trt_dynamic_shapes' must be defined in 'inference.yml' for Paddle Inference TensorRT."
-                        )
-
-                    trt_save_path = f"{model_dir}/.cache/trt/{file_name}"
-                    trt_model_file_path = trt_save_path + ".json"
-                    trt_params_file_path = trt_save_path + ".pdiparams"
-                    if not os.path.exists(trt_model_file_path) or not os.path.exists(
-                        trt_params_file_path
-                    ):
-                        _convert_trt(
-                            {},
-                            model_file_path,
-                            params_file_path,
-                            trt_save_path,
-                            args.gpu_id,
-                            trt_dynamic_shapes,
-                            trt_dynamic_shape_input_data,
-                        )
-                    config = inference.Config(model_file_path, params_file_path)
-                    config.exp_disable_mixed_precision_ops({"feed", "fetch"})
-                    config.enable_use_gpu(args.gpu_mem, args.gpu_id)
-                else:
-                    config.enable_tensorrt_engine(
-                        workspace_size=1 << 30,
-                        precision_mode=precision,
-                        max_batch_size=args.max_batch_size,
-                        min_subgraph_size=args.min_subgraph_size,  # skip the minimum trt subgraph
-                        use_calib_mode=False,
+    if args.use_gpu:
+        gpu_id = get_infer_gpuid()
+        if gpu_id is None:
+            logger.warning(
+                "GPU is not found in current device by nvidia-smi. Please check your device or ignore it if run on jetson."
+            )
+        config.enable_use_gpu(args.gpu_mem, args.gpu_id)
+        if args.use_tensorrt:
+            if ".json" in model_file_path:
+                trt_dynamic_shapes = {}
+                trt_dynamic_shape_input_data = {}
+                if os.path.exists(f"{model_dir}/inference.yml"):
+                    model_config = load_config(f"{model_dir}/inference.yml")
+                    trt_dynamic_shapes = (
+                        model_config.get("Hpi", {})
+                        .get("backend_configs", {})
+                        .get("paddle_infer", {})
+                        .get("trt_dynamic_shapes", {})
                     )
-
-                    # collect shape
-                    trt_shape_f = os.path.join(
-                        model_dir, f"{mode}_trt_dynamic_shape.txt"
+                    trt_dynamic_shape_input_data = (
+                        model_config.get("Hpi", {})
+                        .get("backend_configs", {})
+                        .get("paddle_infer", {})
+                        .get("trt_dynamic_shapes_input_data", {})
                     )
 
-                    if not os.path.exists(trt_shape_f):
-                        config.collect_shape_range_info(trt_shape_f)
-                        logger.info(f"collect dynamic shape info into : {trt_shape_f}")
-                    try:
-                        config.enable_tuned_tensorrt_dynamic_shape(trt_shape_f, True)
-                    except Exception as E:
-                        logger.info(E)
-                        logger.info("Please keep your paddlepaddle-gpu >= 2.3.0!")
-
-        elif args.use_npu:
-            config.enable_custom_device("npu")
-        elif args.use_mlu:
-            config.enable_custom_device("mlu")
-        elif args.use_xpu:
-            config.enable_xpu(10 * 1024 * 1024)
-        elif args.use_gcu:  # for Enflame GCU(General Compute Unit)
-            assert paddle.device.is_compiled_with_custom_device("gcu"), (
-                "Args use_gcu cannot be set as True while your paddle "
-                "is not compiled with gcu! \nPlease try: \n"
-                "\t1. Install paddle-custom-gcu to run model on GCU. \n"
-                "\t2. Set use_gcu as False in args to run model on CPU."
-            )
-            import paddle_custom_device.gcu.passes as gcu_passes
+                if not trt_dynamic_shapes:
+                    raise RuntimeError(
+                        "Configuration Error: 'trt_dynamic_shapes' must be defined in 'inference.yml' for Paddle Inference TensorRT."
+                    )
 
-            gcu_passes.setUp()
-            if args.precision == "fp16":
-                config.enable_custom_device(
-                    "gcu", 0, paddle.inference.PrecisionType.Half
-                )
-                gcu_passes.set_exp_enable_mixed_precision_ops(config)
+                trt_save_path = f"{model_dir}/.cache/trt/{file_name}"
+                trt_model_file_path = trt_save_path + ".json"
+                trt_params_file_path = trt_save_path + ".pdiparams"
+                if not os.path.exists(trt_model_file_path) or not os.path.exists(
+                    trt_params_file_path
+                ):
+                    _convert_trt(
+                        {},
+                        model_file_path,
+                        params_file_path,
+                        trt_save_path,
+                        args.gpu_id,
+                        trt_dynamic_shapes,
+                        trt_dynamic_shape_input_data,
+                    )
+                config = inference.Config(model_file_path, params_file_path)
+                config.exp_disable_mixed_precision_ops({"feed", "fetch"})
+                config.enable_use_gpu(args.gpu_mem, args.gpu_id)
             else:
-                config.enable_custom_device("gcu")
+                config.enable_tensorrt_engine(
+                    workspace_size=1 << 30,
+                    precision_mode=precision,
+                    max_batch_size=args.max_batch_size,
+                    min_subgraph_size=args.min_subgraph_size,  # skip the minimum trt subgraph
+                    use_calib_mode=False,
+                )
 
-            if paddle.framework.use_pir_api():
-                config.enable_new_ir(True)
-                config.enable_new_executor(True)
-            else:
-                pass_builder = config.pass_builder()
-                gcu_passes.append_passes_for_legacy_ir(pass_builder, "PaddleOCR")
+                # collect shape
+                trt_shape_f = os.path.join(model_dir, f"{mode}_trt_dynamic_shape.txt")
+
+                if not os.path.exists(trt_shape_f):
+                    config.collect_shape_range_info(trt_shape_f)
+                    logger.info(f"collect dynamic shape info into : {trt_shape_f}")
+                try:
+                    config.enable_tuned_tensorrt_dynamic_shape(trt_shape_f, True)
+                except Exception as E:
+                    logger.info(E)
+                    logger.info("Please keep your paddlepaddle-gpu >= 2.3.0!")
+
+    elif args.use_npu:
+        config.enable_custom_device("npu")
+    elif args.use_mlu:
+        config.enable_custom_device("mlu")
+    elif args.use_xpu:
+        config.enable_xpu(10 * 1024 * 1024)
+    elif args.use_gcu:  # for Enflame GCU(General Compute Unit)
+        assert paddle.device.is_compiled_with_custom_device("gcu"), (
+            "Args use_gcu cannot be set as True while your paddle "
+            "is not compiled with gcu! \nPlease try: \n"
+            "\t1. Install paddle-custom-gcu to run model on GCU. \n"
+            "\t2. Set use_gcu as False in args to run model on CPU."
+        )
+        import paddle_custom_device.gcu.passes as gcu_passes
+
+        gcu_passes.setUp()
+        if args.precision == "fp16":
+            config.enable_custom_device("gcu", 0, paddle.inference.PrecisionType.Half)
+            gcu_passes.set_exp_enable_mixed_precision_ops(config)
         else:
-            config.disable_gpu()
-            if args.enable_mkldnn is not None:
-                if args.enable_mkldnn:
-                    # cache 10 different shapes for mkldnn to avoid memory leak
-                    config.set_mkldnn_cache_capacity(10)
-                    config.enable_mkldnn()
-                    if args.precision == "fp16":
-                        config.enable_mkldnn_bfloat16()
-                else:
-                    if hasattr(config, "disable_mkldnn"):
-                        config.disable_mkldnn()
-
-            if hasattr(args, "cpu_threads"):
-                config.set_cpu_math_library_num_threads(args.cpu_threads)
-            else:
-                # default cpu threads as 10
-                config.set_cpu_math_library_num_threads(10)
+            config.enable_custom_device("gcu")
 
-            if hasattr(config, "enable_new_ir"):
-                config.enable_new_ir()
-            if hasattr(config, "enable_new_executor"):
-                config.enable_new_executor()
+        if paddle.framework.use_pir_api():
+            config.enable_new_ir(True)
+            config.enable_new_executor(True)
+        else:
+            pass_builder = config.pass_builder()
+            gcu_passes.append_passes_for_legacy_ir(pass_builder, "PaddleOCR")
+    else:
+        config.disable_gpu()
+        if args.enable_mkldnn is not None:
+            if args.enable_mkldnn:
+                # cache 10 different shapes for mkldnn to avoid memory leak
+                config.set_mkldnn_cache_capacity(10)
+                config.enable_mkldnn()
+                if args.precision == "fp16":
+                    config.enable_mkldnn_bfloat16()
+            else:
+                if hasattr(config, "disable_mkldnn"):
+                    config.disable_mkldnn()
 
-        # enable memory optim
-        config.enable_memory_optim()
-        config.disable_glog_info()
-        if not args.use_gcu:  # for Enflame GCU(General Compute Unit)
-            config.delete_pass("conv_transpose_eltwiseadd_bn_fuse_pass")
-        config.delete_pass("matmul_transpose_reshape_fuse_pass")
-        if mode == "rec" and args.rec_algorithm == "SRN":
-            config.delete_pass("gpu_cpu_map_matmul_v2_to_matmul_pass")
-        if mode == "re":
-            config.delete_pass("simplify_with_basic_ops_pass")
-        if mode == "table":
-            config.delete_pass("fc_fuse_pass")  # not supported for table
-        config.switch_use_feed_fetch_ops(False)
-        config.switch_ir_optim(True)
-
-        # create predictor
-        predictor = inference.create_predictor(config)
-        input_names = predictor.get_input_names()
-        if mode in ["ser", "re"]:
-            input_tensor = []
-            for name in input_names:
-                input_tensor.append(predictor.get_input_handle(name))
+        if hasattr(args, "cpu_threads"):
+            config.set_cpu_math_library_num_threads(args.cpu_threads)
         else:
-            for name in input_names:
-                input_tensor = predictor.get_input_handle(name)
-        output_tensors = get_output_tensors(args, mode, predictor)
-        return predictor, input_tensor, output_tensors, config
+            # default cpu threads as 10
+            config.set_cpu_math_library_num_threads(10)
+
+        if hasattr(config, "enable_new_ir"):
+            config.enable_new_ir()
+        if hasattr(config, "enable_new_executor"):
+            config.enable_new_executor()
+
+    # enable memory optim
+    config.enable_memory_optim()
+    config.disable_glog_info()
+    if not args.use_gcu:  # for Enflame GCU(General Compute Unit)
+        config.delete_pass("conv_transpose_eltwiseadd_bn_fuse_pass")
+    config.delete_pass("matmul_transpose_reshape_fuse_pass")
+    if mode == "rec" and args.rec_algorithm == "SRN":
+        config.delete_pass("gpu_cpu_map_matmul_v2_to_matmul_pass")
+    if mode == "re":
+        config.delete_pass("simplify_with_basic_ops_pass")
+    if mode == "table":
+        config.delete_pass("fc_fuse_pass")  # not supported for table
+    config.switch_use_feed_fetch_ops(False)
+    config.switch_ir_optim(True)
+
+    # create predictor
+    return inference.create_predictor(config), config
 
 
 def _convert_trt(
@@ -898,24 +1046,7 @@ def get_rotate_crop_image(img, points):
 
 
 def get_minarea_rect_crop(img, points):
-    bounding_box = cv2.minAreaRect(np.array(points).astype(np.int32))
-    points = sorted(list(cv2.boxPoints(bounding_box)), key=lambda x: x[0])
-
-    index_a, index_b, index_c, index_d = 0, 1, 2, 3
-    if points[1][1] > points[0][1]:
-        index_a = 0
-        index_d = 1
-    else:
-        index_a = 1
-        index_d = 0
-    if points[3][1] > points[2][1]:
-        index_b = 2
-        index_c = 3
-    else:
-        index_b = 3
-        index_c = 2
-
-    box = [points[index_a], points[index_b], points[index_c], points[index_d]]
+    box = minarea_rect_points(points)
     crop_img = get_rotate_crop_image(img, np.array(box))
     return crop_img
 
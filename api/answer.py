@@ -7,6 +7,8 @@ import shutil
 import tempfile
 import threading
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 from re import sub
 from typing import Optional
@@ -17,8 +19,9 @@ from openai import OpenAI
 from urllib3 import disable_warnings, exceptions
 
 from api.answer_check import *
+from api.answer_index import AnswerIndex, canonical_question
 from api.logger import logger
-from api.decode import _ocr_image_to_text, ENABLE_LOCAL_OCR
+from api.decode import ENABLE_LOCAL_OCR, ocr_images_to_text
 
 
 def _strip_json_block(md_str: str) -> str:
@@ -63,7 +66,7 @@ def _clean_option_prefix(option: str) -> str:
 # 关闭警告
 disable_warnings(exceptions.InsecureRequestWarning)
 
-__all__ = ["CacheDAO", "Tiku", "TikuYanxi", "TikuLike", "TikuAdapter", "AI", "SiliconFlow"]
+__all__ = ["CacheDAO", "Tiku", "TikuYanxi", "TikuLike", "TikuAdapter", "AI", "SiliconFlow", "MultiTiku"]
 
 
 _IMG_TAG_PATTERN = re.compile(r'<img[^>]*src=["\'](.*?)["\'][^>]*>', re.IGNORECASE)
@@ -82,17 +85,20 @@ def _apply_ocr_to_title_if_needed(q_info: dict) -> None:
     if not isinstance(title, str) or "<img" not in title:
         return
 
+    # 只处理超星题目图片的域名，避免误伤其他内容；同一标题中的多张图片并发识别
+    srcs = [src for src in _IMG_TAG_PATTERN.findall(title) if "p.ananas.chaoxing.com" in src]
+    try:
+        ocr_results = ocr_images_to_text(srcs)
+    except Exception as exc:
+        logger.debug(f"题目图片 OCR 调用异常: {exc}")
+        ocr_results = {}
+
     def _repl(match: re.Match) -> str:
         src = match.group(1) or ""
-        # 只处理超星题目图片的域名，避免误伤其他内容
         if "p.ananas.chaoxing.com" not in src:
             return match.group(0)
 
-        text = ""
-        try:
-            text = _ocr_image_to_text(src) or ""
-        except Exception as exc:
-            logger.debug(f"题目图片 OCR 调用异常: {exc}")
+        text = ocr_results.get(src) or ""
 
         if text:
             return f"[公式: {text}]"
@@ -110,6 +116,31 @@ class CacheDAO:
     @Reference: https://github.com/SocialSisterYi/xuexiaoyi-to-xuexitong-tampermonkey-proxy
     """
     DEFAULT_CACHE_FILE = "cache.json"
+    # 由 python -m api.answer_index 离线生成的只读答案索引, 可用环境变量 CHAOXING_ANSWER_INDEX 指定路径
+    DEFAULT_INDEX_FILE = "answer_index.bin"
+    _shared = None  # 多进程模式下由协调进程下发的共享字典, 设置后不再读写缓存文件
+    _index: Optional[AnswerIndex] = None
+    _index_loaded = False
+    _index_lock = threading.Lock()
+
+    @classmethod
+    def attach_shared(cls, mapping) -> None:
+        cls._shared = mapping
+
+    @classmethod
+    def open_index(cls) -> Optional[AnswerIndex]:
+        """打开只读答案索引, 每个进程只打开一次; 索引文件不存在时返回 None"""
+        if cls._index_loaded:
+            return cls._index
+        with cls._index_lock:
+            if not cls._index_loaded:
+                path = os.environ.get("CHAOXING_ANSWER_INDEX") or cls.DEFAULT_INDEX_FILE
+                start = time.perf_counter()
+                cls._index = AnswerIndex.open(path)
+                if cls._index is not None:
+                    logger.info(f"已加载答案索引 {path}: {len(cls._index)} 条 ({(time.perf_counter() - start) * 1e3:.1f}ms)")
+                cls._index_loaded = True
+        return cls._index
 
     def __init__(self, file: str = DEFAULT_CACHE_FILE):
         self.cache_file = Path(file)
@@ -203,16 +234,39 @@ class CacheDAO:
             logger.error(f"Failed to write cache: {e}")
 
     def get_cache(self, question: str) -> Optional[str]:
-        data = self._read_cache()
-        return data.get(question)
+        if self._shared is not None:
+            answer = self._shared.get(question)
+        else:
+            answer = self._read_cache().get(question)
+        if answer:
+            return answer
+        # 运行时缓存未命中时查询离线导入的答案索引
+        index = self.open_index()
+        return index.get(question) if index is not None else None
 
     def add_cache(self, question: str, answer: str) -> None:
+        if self._shared is not None:
+            self._shared[question] = answer
+            return
         # 为缓存写入加锁，防止并发写入损坏文件
         with self._lock:
             data = self._read_cache()
             data[question] = answer
             self._write_cache(data)
 
+    def load_all(self) -> dict:
+        """读取缓存文件中的全部条目"""
+        return self._read_cache()
+
+    def update_many(self, entries: dict) -> None:
+        """批量写入缓存条目, 只写一次文件"""
+        if not entries:
+            return
+        with self._lock:
+            data = self._read_cache()
+            data.update(entries)
+            self._write_cache(data)
+
 
 # TODO: 重构此部分代码，将此类改为抽象类，加载题库方法改为静态方法，禁止直接初始化此类
 class Tiku:
@@ -320,8 +374,7 @@ class Tiku:
         # 检测并处理题目中的图片链接：使用本地 OCR 将公式图片转为文本
         _apply_ocr_to_title_if_needed(q_info)
 
-        q_info['title'] = sub(r'^\d+', '', q_info['title'])
-        q_info['title'] = sub(r'（\d+\.\d+分）$', '', q_info['title'])
+        q_info['title'] = canonical_question(q_info['title'])
         logger.debug(f"处理后标题：{q_info['title']}")
 
         # 先过缓存
@@ -336,14 +389,7 @@ class Tiku:
                 answer = answer.strip()
                 logger.info(f"从{self.name}获取答案：{q_info['title']} -> {answer}")
 
-                # 对 AI / 硅基流动等大模型题库更宽松：只要有非空答案就直接使用并写入缓存，
-                # 不再依赖 check_answer 的严格类型判断，避免丢弃诸如“输入/输出”、“Babbage machine”这种正常答案
-                from api.answer import AI, SiliconFlow  # type: ignore
-                if isinstance(self, (AI, SiliconFlow)):
-                    cache_dao.add_cache(q_info['title'], answer)
-                    return answer
-
-                if check_answer(answer, q_info['type'], self):
+                if self.accept_answer(answer, q_info['type']):
                     cache_dao.add_cache(q_info['title'], answer)
                     return answer
                 else:
@@ -361,6 +407,12 @@ class Tiku:
         """
         pass
 
+    def accept_answer(self, answer: str, q_type: str) -> bool:
+        """
+        判断题库返回的答案是否可用, 默认要求答案格式与题目类型相符
+        """
+        return bool(check_answer(answer, q_type, self))
+
 
     def get_tiku_from_config(self):
         """
@@ -379,8 +431,13 @@ class Tiku:
             self.DISABLE = True
             logger.error("未找到题库配置, 已忽略题库功能")
             return self
-        # FIXME: Implement using StrEnum instead. This is not only buggy but also not safe
-        new_cls = globals()[cls_name]()
+        # 以逗号分隔配置多个题库时, 使用组合题库按延迟与成功率路由并对冲请求
+        names = [name.strip() for name in cls_name.split(',') if name.strip()]
+        if len(names) > 1:
+            new_cls = MultiTiku(names)
+        else:
+            # FIXME: Implement using StrEnum instead. This is not only buggy but also not safe
+            new_cls = globals()[names[0]]()
         new_cls.config_set(self._conf)
         return new_cls
 
@@ -464,6 +521,100 @@ class TikuYanxi(Tiku):
     def _init_tiku(self):
         self.load_token()
 
+class TokenPool:
+    """
+    线程安全的 Token 池
+
+    - acquire() 选择使用次数最少且仍有余额的 Token
+    - consume() 原子地扣减余额, 余额耗尽的 Token 立即移出轮换
+    - 余额由后台定时线程刷新, 查询路径上不会发起余额请求
+    """
+
+    def __init__(self, tokens: list[str], fetch_balance, refresh_interval: float = 300, name: str = "Token池"):
+        self.name = name
+        self._tokens = list(tokens)
+        self._fetch_balance = fetch_balance
+        self.refresh_interval = refresh_interval
+        self._balance: dict[str, int] = {}
+        self._used: dict[str, int] = {token: 0 for token in self._tokens}
+        # 各 Token 累计扣减次数, 用于修正刷新期间的并发扣减
+        self._consumed: dict[str, int] = {token: 0 for token in self._tokens}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self, quiet: bool = False) -> None:
+        """
+        查询全部 Token 的余额, 网络请求在锁外进行
+
+        查询失败 (返回 None) 的 Token 保留原余额; 查询期间发生的扣减会从新余额中减去,
+        避免刷新结果覆盖掉并发 consume() 的扣减
+        """
+        with self._lock:
+            consumed_before = dict(self._consumed)
+        balances = {token: self._fetch_balance(token) for token in self._tokens}
+        with self._lock:
+            for token, balance in balances.items():
+                if balance is None:
+                    continue
+                spent = self._consumed[token] - consumed_before[token]
+                self._balance[token] = max(balance - spent, 0)
+        log = logger.debug if quiet else logger.info
+        for token, balance in balances.items():
+            if balance is None:
+                logger.warning(f"{self.name}Token ...{token[-5:]} 余额查询失败, 沿用上次的余额")
+                continue
+            log(f"当前{self.name}Token: ...{token[-5:]} 的剩余查询次数为: {balance} (仅供参考, 实际次数以查询结果为准)")
+
+    def start(self) -> None:
+        """启动后台余额刷新线程"""
+        if self._thread is not None or self.refresh_interval <= 0:
+            return
+        self._thread = threading.Thread(target=self._run, name="token-balance-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+
+    def request_refresh(self) -> None:
+        """提前唤醒后台线程刷新余额, 不阻塞调用方"""
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.refresh_interval)
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+            try:
+                self.refresh(quiet=True)
+            except Exception as e:
+                logger.warning(f"{self.name}后台刷新余额失败: {e}")
+
+    def acquire(self) -> Optional[str]:
+        """选出使用次数最少的有余额 Token, 没有可用 Token 时返回 None"""
+        with self._lock:
+            funded = [t for t in self._tokens if self._balance.get(t, 0) > 0]
+            if not funded:
+                return None
+            token = min(funded, key=self._used.__getitem__)
+            self._used[token] += 1
+            return token
+
+    def consume(self, token: str) -> int:
+        """扣减一次余额并返回剩余次数, 余额耗尽时该 Token 立即不再被选中"""
+        with self._lock:
+            remaining = self._balance.get(token, 0) - 1
+            self._balance[token] = max(remaining, 0)
+            self._consumed[token] = self._consumed.get(token, 0) + 1
+        if remaining <= 0:
+            logger.warning(f"{self.name}Token ...{token[-5:]} 查询次数已用完, 已移出轮换")
+            self.request_refresh()
+        return max(remaining, 0)
+
+
 class TikuLike(Tiku):
     # LIKE知识库实现 参考 https://www.datam.site/
     def __init__(self) -> None:
@@ -479,10 +630,10 @@ class TikuLike(Tiku):
         self._retry = True
         self._retry_times = 3
         self._tokens = []
-        self._balance = {}
+        self._pool: Optional[TokenPool] = None
+        self._balance_refresh_interval = 300
         self._search = False
         self._vision = True
-        self._count = 0
         self._headers = {"Content-Type": "application/json"}
 
     def _query(self, q_info:dict = None):
@@ -498,19 +649,13 @@ class TikuLike(Tiku):
         if q_info['type'] in ['single', 'multiple']:
             question += f"选项为: {options}\n"
 
-        # 随机选择一个token进行查询
-        token = random.choice(self._tokens)
-        
-        # 检查该token是否有余额
-        if self._balance.get(token, 0) <= 0:
-            logger.error(f'{self.name}当前Token查询次数不足: ...{token[-5:]}')
-            # 尝试选择其他有余额的token
-            available_tokens = [t for t in self._tokens if self._balance.get(t, 0) > 0]
-            if available_tokens:
-                token = random.choice(available_tokens)
-            else:
-                logger.error(f'{self.name}所有Token查询次数都不足')
-                return None
+        # 选择使用次数最少且有余额的token进行查询
+        token = self._pool.acquire() if self._pool else None
+        if token is None:
+            logger.error(f'{self.name}所有Token查询次数都不足')
+            if self._pool:
+                self._pool.request_refresh()
+            return None
 
         ans = None
         try_times = 0
@@ -520,16 +665,11 @@ class TikuLike(Tiku):
             ans = self._query_single(token, question)
             try_times += 1
             if ans:  # 如果查询成功，减少余额
-                self._balance[token] -= 1
-                logger.info(f'使用Token ...{token[-5:]} 查询成功，剩余次数: {self._balance[token]}')
+                remaining = self._pool.consume(token)
+                logger.info(f'使用Token ...{token[-5:]} 查询成功，剩余次数: {remaining}')
                 break
             elif try_times < self._retry_times:
                 logger.warning(f'使用Token ...{token[-5:]} 查询失败，进行第 {try_times + 1} 次重试...')
-        
-        # 10次查询后更新余额
-        self._count = (self._count + 1) % 10
-        if self._count == 0:
-            self.update_times()
 
         return ans
     
@@ -717,7 +857,8 @@ class TikuLike(Tiku):
         
         return None
     
-    def get_api_balance(self, token:str = ""):
+    def get_api_balance(self, token:str = "") -> Optional[int]:
+        """查询 Token 余额; 接口明确返回错误时为 0, 网络或解析等临时故障时返回 None"""
         if not token:
             logger.error(f'{self.name}获取余额失败: 未提供有效的token')
             return 0
@@ -742,28 +883,25 @@ class TikuLike(Tiku):
                     return 0
             else:
                 logger.error(f'{self.name}请求余额接口失败，状态码: {res.status_code}')
-                return 0
+                return None
         except requests.exceptions.Timeout:
             logger.error(f'{self.name}获取余额超时: 请求超过30秒')
-            return 0
+            return None
         except requests.exceptions.ConnectionError:
             logger.error(f'{self.name}网络连接错误: 无法连接到余额查询API服务器')
-            return 0
+            return None
         except ValueError:  # json解析错误或int转换错误
             logger.error(f'{self.name}余额响应解析失败: 响应格式不正确')
-            return 0
+            return None
         except Exception as e:
             logger.error(f'{self.name}Token余额查询过程中出现错误: {e}')
-            return 0
+            return None
 
     def update_times(self) -> None:
-        if not self._tokens:
+        if not self._pool:
             logger.warning(f'{self.name}未加载任何Token, 无法更新余额')
             return
-        for token in self._tokens:
-            balance = self.get_api_balance(token)
-            self._balance[token] = balance
-            logger.info(f"当前LIKE知识库Token: ...{token[-5:]} 的剩余查询次数为: {balance} (仅供参考, 实际次数以查询结果为准)")
+        self._pool.refresh()
 
     def load_tokens(self) -> None:
         tokens_str = self._conf.get('tokens')
@@ -786,12 +924,18 @@ class TikuLike(Tiku):
         self._vision = self._conf.get('likeapi_vision', True)
         self._retry = self._conf.get("likeapi_retry", True)
         self._retry_times = self._conf.get("likeapi_retry_times", 3)
+        try:
+            self._balance_refresh_interval = float(self._conf.get("likeapi_balance_refresh", 300))
+        except (TypeError, ValueError):
+            self._balance_refresh_interval = 300
 
     def _init_tiku(self) -> None:
         self.load_config()
         self.load_tokens()
         if self._tokens:
+            self._pool = TokenPool(self._tokens, self.get_api_balance, self._balance_refresh_interval, name=self.name)
             self.update_times()
+            self._pool.start()
         else:
             logger.error(f'{self.name}初始化失败: 未加载任何有效的Token')
             self.DISABLE = True
@@ -844,6 +988,114 @@ class TikuAdapter(Tiku):
         # self.load_token()
         self.api = self._conf['url']
 
+class StreamingAnswerDetector:
+    """
+    增量 JSON 检测器: 逐段接收模型输出, 跳过 <think> 推理段,
+    在其后出现完整且有效的 {"Answer": [...]} 对象时返回答案列表
+
+    已扫描过的字符不会重复扫描: 推理段中只在新片段 (加上可能跨片段的标签前缀) 中查找 </think>,
+    答案区只保留尚未闭合的对象, 字符串中的花括号与转义字符会被正确跳过
+    """
+
+    _THINK_OPEN = "<think>"
+    _THINK_CLOSE = "</think>"
+    _THINK_CLOSE_RE = re.compile(re.escape(_THINK_CLOSE), re.IGNORECASE)
+
+    def __init__(self) -> None:
+        self._chunks: list[str] = []
+        # 尚未判定是否以 <think> 开头时收到的内容
+        self._head = ""
+        # None 表示尚未判定, True 表示仍在推理段中
+        self._in_think: Optional[bool] = None
+        # 推理段中上一片段的结尾, 用于查找跨片段的 </think>
+        self._tail = ""
+        # 答案区中尚未消费的内容, 扫描位置之前的部分只保留未闭合对象
+        self._buf = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._obj_start = -1
+
+    @property
+    def text(self) -> str:
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    def _answer_part(self, chunk: str) -> Optional[str]:
+        """返回本片段中位于推理段之后的内容, 仍在推理段中时返回 None"""
+        if self._in_think is None:
+            self._head += chunk
+            head = self._head.lstrip()[:len(self._THINK_OPEN)].lower()
+            if not head or (self._THINK_OPEN.startswith(head) and head != self._THINK_OPEN):
+                # 可能是尚未接收完整的 <think> 标签
+                return None
+            self._in_think = head == self._THINK_OPEN
+            chunk, self._head = self._head, ""
+        if not self._in_think:
+            return chunk
+        window = self._tail + chunk
+        match = self._THINK_CLOSE_RE.search(window)
+        if match is None:
+            self._tail = window[-(len(self._THINK_CLOSE) - 1):]
+            return None
+        self._in_think = False
+        self._tail = ""
+        return window[match.end():]
+
+    def feed(self, chunk: str) -> Optional[list[str]]:
+        self._chunks.append(chunk)
+        part = self._answer_part(chunk)
+        if not part:
+            return None
+        buf = self._buf = self._buf + part
+        while self._pos < len(buf):
+            ch = buf[self._pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"' and self._depth > 0:
+                self._in_string = True
+            elif ch == "{":
+                if self._depth == 0:
+                    self._obj_start = self._pos
+                self._depth += 1
+            elif ch == "}" and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    answers = self._try_parse(buf[self._obj_start:self._pos + 1])
+                    if answers:
+                        self._buf = buf[self._pos + 1:]
+                        self._pos = 0
+                        return answers
+            self._pos += 1
+        # 丢弃已扫描且不属于未闭合对象的内容
+        keep = self._obj_start if self._depth > 0 else len(buf)
+        self._buf = buf[keep:]
+        self._pos -= keep
+        self._obj_start -= keep
+        return None
+
+    @staticmethod
+    def _try_parse(candidate: str) -> Optional[list[str]]:
+        try:
+            payload = json.loads(candidate)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(payload, dict):
+            return None
+        value = payload.get("Answer") or payload.get("answer")
+        if not isinstance(value, list):
+            return None
+        answers = _ensure_answer_list(value)
+        return answers or None
+
+
 class AI(Tiku):
     """AI大模型答题实现，带重试与更鲁棒的解析"""
 
@@ -859,6 +1111,8 @@ class AI(Tiku):
         self.max_retries: int = 3
         self.retry_delay: float = 2.0
         self.disable_ssl_verify: bool = False
+        # 流式模式：检测到答案后立即结束请求，适合推理模型
+        self.stream: bool = False
         self._interval_lock = threading.Lock()
         # 全局并发控制：限制同一 AI 客户端同时在请求中的题目数量
         self.max_active_requests: int = 3
@@ -935,6 +1189,9 @@ class AI(Tiku):
                     sem.acquire()
                 try:
                     self._respect_interval()
+                    if self.stream:
+                        # 流式模式下请求在读完答案前一直占用并发名额
+                        return self._invoke_streaming(messages)
                     headers = {
                         "Authorization": f"Bearer {self.key}",
                         "Content-Type": "application/json",
@@ -960,65 +1217,7 @@ class AI(Tiku):
 
                 data = response.json()
                 raw_content = data["choices"][0]["message"]["content"] or ""
-
-                # 去掉 <think> 和 </think> 标记本身，但保留其中的内容，以便从中提取 Answer JSON
-                text_without_tags = re.sub(r"(?is)</?think>", "", raw_content)
-                base_text = (text_without_tags or "").strip()
-                if not base_text:
-                    logger.warning("AI大模型返回内容为空（仅包含 <think> 标签或空白），将视为无答案处理")
-                    return None
-
-                answers: list[str] = []
-
-                # 优先从文本中提取包含 Answer/answer 字段的 JSON 段，取最后一个作为最终答案
-                json_candidate = None
-                try:
-                    pattern = r'\{[^{}]*(?:"Answer"|"answer")\s*:\s*\[[^\]]*\][^{}]*\}'
-                    matches = re.findall(pattern, base_text, flags=re.DOTALL)
-                    if matches:
-                        json_candidate = matches[-1].strip()
-                    else:
-                        # 回退到去除 Markdown 代码块后的整体文本
-                        json_candidate = _strip_json_block(base_text)
-                except Exception:
-                    json_candidate = _strip_json_block(base_text)
-
-                json_candidate_stripped = (json_candidate or "").strip()
-
-                if json_candidate_stripped:
-                    # 优先按JSON解析；若失败，再尝试将单引号风格的字典转换为JSON
-                    try:
-                        payload = json.loads(json_candidate_stripped)
-                        answers = _ensure_answer_list(payload.get('Answer') or payload.get('answer'))
-                    except json.JSONDecodeError as json_exc:
-                        payload = None
-                        candidate_fixed = json_candidate_stripped
-                        # 针对形如 {'Answer': ['输入/输出']} 的内容，尝试将单引号替换为双引号后再次解析
-                        if "'" in candidate_fixed and '"' not in candidate_fixed:
-                            try:
-                                candidate_fixed = candidate_fixed.replace("'", '"')
-                                payload = json.loads(candidate_fixed)
-                            except Exception:
-                                payload = None
-                        if payload is not None:
-                            answers = _ensure_answer_list(payload.get('Answer') or payload.get('answer'))
-                        else:
-                            logger.warning(
-                                f"AI大模型返回内容不是标准JSON，将按纯文本处理: {json_exc}; candidate={json_candidate_stripped[:200]!r}"
-                            )
-                            answers = _ensure_answer_list(base_text)
-                else:
-                    # 没有可用的 JSON 片段，直接按纯文本处理
-                    if base_text:
-                        answers = _ensure_answer_list(base_text)
-                    else:
-                        logger.warning("AI大模型返回内容为空，将视为无答案处理")
-                        return None
-
-                if not answers:
-                    logger.warning("AI大模型返回空答案，将视为无答案处理")
-                    return None
-                return "\n".join(answers).strip()
+                return self._parse_completion_text(raw_content)
             except Exception as exc:
                 last_error = exc
                 msg = str(exc)
@@ -1034,10 +1233,129 @@ class AI(Tiku):
         logger.error(f"AI大模型连续失败，最后错误: {last_error}")
         return None
 
+    def _parse_completion_text(self, raw_content: str) -> Optional[str]:
+        """从完整的模型输出中解析答案, 多个答案以换行拼接"""
+        # 去掉 <think> 和 </think> 标记本身，但保留其中的内容，以便从中提取 Answer JSON
+        text_without_tags = re.sub(r"(?is)</?think>", "", raw_content)
+        base_text = (text_without_tags or "").strip()
+        if not base_text:
+            logger.warning("AI大模型返回内容为空（仅包含 <think> 标签或空白），将视为无答案处理")
+            return None
+
+        answers: list[str] = []
+
+        # 优先从文本中提取包含 Answer/answer 字段的 JSON 段，取最后一个作为最终答案
+        json_candidate = None
+        try:
+            pattern = r'\{[^{}]*(?:"Answer"|"answer")\s*:\s*\[[^\]]*\][^{}]*\}'
+            matches = re.findall(pattern, base_text, flags=re.DOTALL)
+            if matches:
+                json_candidate = matches[-1].strip()
+            else:
+                # 回退到去除 Markdown 代码块后的整体文本
+                json_candidate = _strip_json_block(base_text)
+        except Exception:
+            json_candidate = _strip_json_block(base_text)
+
+        json_candidate_stripped = (json_candidate or "").strip()
+
+        if json_candidate_stripped:
+            # 优先按JSON解析；若失败，再尝试将单引号风格的字典转换为JSON
+            try:
+                payload = json.loads(json_candidate_stripped)
+                answers = _ensure_answer_list(payload.get('Answer') or payload.get('answer'))
+            except json.JSONDecodeError as json_exc:
+                payload = None
+                candidate_fixed = json_candidate_stripped
+                # 针对形如 {'Answer': ['输入/输出']} 的内容，尝试将单引号替换为双引号后再次解析
+                if "'" in candidate_fixed and '"' not in candidate_fixed:
+                    try:
+                        candidate_fixed = candidate_fixed.replace("'", '"')
+                        payload = json.loads(candidate_fixed)
+                    except Exception:
+                        payload = None
+                if payload is not None:
+                    answers = _ensure_answer_list(payload.get('Answer') or payload.get('answer'))
+                else:
+                    logger.warning(
+                        f"AI大模型返回内容不是标准JSON，将按纯文本处理: {json_exc}; candidate={json_candidate_stripped[:200]!r}"
+                    )
+                    answers = _ensure_answer_list(base_text)
+        else:
+            # 没有可用的 JSON 片段，直接按纯文本处理
+            if base_text:
+                answers = _ensure_answer_list(base_text)
+            else:
+                logger.warning("AI大模型返回内容为空，将视为无答案处理")
+                return None
+
+        if not answers:
+            logger.warning("AI大模型返回空答案，将视为无答案处理")
+            return None
+        return "\n".join(answers).strip()
+
+    def _invoke_streaming(self, messages: list[dict]) -> Optional[str]:
+        """
+        以 SSE 流式方式请求补全, 在推理内容之后出现完整有效的 Answer 对象时立即关闭连接返回,
+        流结束仍未检测到时按完整输出解析
+        """
+        headers = {
+            "Authorization": f"Bearer {self.key}",
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream",
+        }
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "stream": True,
+        }
+        detector = StreamingAnswerDetector()
+        start = time.monotonic()
+        chunks = 0
+        with self._httpx_client.stream("POST", self.endpoint, headers=headers, json=payload) as response:
+            if response.status_code != 200:
+                response.read()
+                try:
+                    err_body = response.json()
+                except Exception:
+                    err_body = response.text[:200]
+                raise RuntimeError(f"Error code: {response.status_code} - {err_body}")
+
+            for line in response.iter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    chunk = json.loads(data)
+                except json.JSONDecodeError:
+                    continue
+                choices = chunk.get("choices") or []
+                if not choices:
+                    continue
+                # reasoning_content 等推理字段不参与答案检测
+                content = (choices[0].get("delta") or {}).get("content")
+                if not content:
+                    continue
+                chunks += 1
+                answers = detector.feed(content)
+                if answers:
+                    # 离开 with 块时关闭连接, 不再接收后续内容
+                    logger.debug(f"AI流式输出在第 {chunks} 个片段检测到答案, 耗时 {time.monotonic() - start:.2f}s")
+                    return "\n".join(answers).strip()
+
+        return self._parse_completion_text(detector.text)
+
     def _query(self, q_info: dict):
         messages = self._build_messages(q_info)
         return self._invoke_completion(messages)
 
+    def accept_answer(self, answer: str, q_type: str) -> bool:
+        # 对大模型题库更宽松：只要有非空答案就直接使用并写入缓存，
+        # 不再依赖 check_answer 的严格类型判断，避免丢弃诸如“输入/输出”、“Babbage machine”这种正常答案
+        return bool(answer)
+
     def _init_tiku(self):
         self.endpoint = self._conf['endpoint']
         self.key = self._conf['key']
@@ -1048,6 +1366,7 @@ class AI(Tiku):
         self.max_retries = int(self._conf.get('max_retries', 3))
         self.retry_delay = float(self._conf.get('retry_delay', 2))
         self.disable_ssl_verify = str(self._conf.get('disable_ssl_verify', 'false')).lower() in {'1', 'true', 'yes', 'on', 'y'}
+        self.stream = str(self._conf.get('ai_stream', 'false')).lower() in {'1', 'true', 'yes', 'on', 'y'}
         # 允许通过 ai_concurrency 配置最大同时在请求中的题目数量；缺省为 3
         max_req_raw = self._conf.get('ai_concurrency')
         try:
@@ -1135,6 +1454,10 @@ class SiliconFlow(Tiku):
         logger.error(f"硅基流动API连续失败，最后错误: {last_error}")
         return None
 
+    def accept_answer(self, answer: str, q_type: str) -> bool:
+        # 与 AI 题库一致, 大模型返回的非空答案直接使用
+        return bool(answer)
+
     def _init_tiku(self):
         # 从配置文件读取参数
         self.api_endpoint = self._conf.get('siliconflow_endpoint', 'https://api.siliconflow.cn/v1/chat/completions')
@@ -1145,3 +1468,172 @@ class SiliconFlow(Tiku):
         self.max_retries = int(self._conf.get('max_retries', 3))
         self.retry_delay = float(self._conf.get('retry_delay', 2))
         self._session = requests.Session()
+
+
+class ProviderStats:
+    """
+    单个题库的滚动统计: 最近若干次查询的耗时与是否得到可用答案
+    """
+
+    def __init__(self, window: int = 50, default_latency: float = 10.0, min_samples: int = 5):
+        self.default_latency = default_latency
+        self.min_samples = min_samples
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._results: deque[bool] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, success: bool) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+            self._results.append(success)
+
+    def p95(self) -> float:
+        """耗时的 95 分位数, 样本不足时使用默认值"""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.default_latency
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def success_rate(self) -> float:
+        """成功率估计 (拉普拉斯平滑, 新题库默认 0.5 以上)"""
+        with self._lock:
+            return (sum(self._results) + 1) / (len(self._results) + 2)
+
+    def mean_latency(self) -> float:
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.default_latency
+            return sum(self._latencies) / len(self._latencies)
+
+    def cost(self) -> float:
+        """期望得到一个可用答案所需的时间, 越小越优先"""
+        return self.mean_latency() / self.success_rate()
+
+
+class MultiTiku(Tiku):
+    """
+    组合题库: 同时持有多个题库, 按滚动耗时与成功率选择最优题库查询,
+    首选题库超过其 p95 耗时仍未返回时向下一个题库发起对冲请求,
+    采用最先通过校验的答案, 其余未开始的请求会被取消
+
+    配置示例: provider = TikuLike,AI
+    可选配置: hedge_delay (统计样本不足时的对冲等待秒数, 默认 10)
+    """
+
+    def __init__(self, provider_names: list[str]) -> None:
+        super().__init__()
+        self.name = '组合题库'
+        self._provider_names = provider_names
+        self._providers: list[Tiku] = []
+        self._stats: dict[int, ProviderStats] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.hedge_delay = 10.0
+
+    def _init_tiku(self) -> None:
+        try:
+            self.hedge_delay = float(self._conf.get('hedge_delay', 10))
+        except (TypeError, ValueError):
+            self.hedge_delay = 10.0
+
+        for cls_name in self._provider_names:
+            provider_cls = globals().get(cls_name)
+            if not (isinstance(provider_cls, type) and issubclass(provider_cls, Tiku)) or provider_cls is MultiTiku:
+                logger.error(f"未知的题库类型: {cls_name}, 已忽略")
+                continue
+            provider = provider_cls()
+            provider.config_set(self._conf)
+            try:
+                provider.init_tiku()
+            except Exception as e:
+                logger.error(f"{provider.name}初始化失败, 已忽略: {e}")
+                continue
+            if provider.DISABLE:
+                logger.warning(f"{provider.name}不可用, 已从组合题库中移除")
+                continue
+            self._providers.append(provider)
+
+        if not self._providers:
+            logger.error("组合题库中没有可用的题库, 已忽略题库功能")
+            self.DISABLE = True
+            return
+
+        self._stats = {id(p): ProviderStats(default_latency=self.hedge_delay) for p in self._providers}
+        # 被对冲放弃的请求仍会在后台跑完, 预留足够的线程避免阻塞新的查询
+        self._executor = ThreadPoolExecutor(
+            max_workers=4 * len(self._providers), thread_name_prefix="tiku-hedge"
+        )
+        logger.info(f"组合题库已启用: {', '.join(p.name for p in self._providers)}")
+
+    def _ranked_providers(self) -> list[Tiku]:
+        # sorted 是稳定排序, 统计相同时保持配置中的顺序
+        return sorted(self._providers, key=lambda p: self._stats[id(p)].cost())
+
+    def _timed_query(self, provider: Tiku, q_info: dict, settled: threading.Event) -> Optional[str]:
+        """
+        查询单个题库并记录耗时与结果; 得到可用答案时设置 settled,
+        settled 已设置 (其他题库已给出答案) 时不再发起请求
+        """
+        if settled.is_set():
+            return None
+        stats = self._stats[id(provider)]
+        start = time.monotonic()
+        accepted = False
+        try:
+            answer = provider._query(dict(q_info))
+            if answer:
+                answer = answer.strip()
+            accepted = bool(answer) and provider.accept_answer(answer, q_info['type'])
+            if accepted:
+                # 在 future 完成之前设置, 同一线程接着取到的对冲请求会直接放弃
+                settled.set()
+            return answer
+        except Exception as e:
+            logger.warning(f"{provider.name}查询异常: {e}")
+            return None
+        finally:
+            stats.record(time.monotonic() - start, accepted)
+
+    def _query(self, q_info: dict) -> Optional[str]:
+        if not self._executor:
+            return None
+        queue = self._ranked_providers()
+        running = {}
+        settled = threading.Event()
+
+        def launch():
+            provider = queue.pop(0)
+            running[self._executor.submit(self._timed_query, provider, q_info, settled)] = provider
+            return provider
+
+        current = launch()
+        try:
+            while running:
+                # 最近发起的题库超过其 p95 耗时仍未返回时, 向下一个题库发起对冲请求
+                timeout = self._stats[id(current)].p95() if queue else None
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    logger.debug(f"{current.name}超过 {timeout:.1f}s 未返回, 对冲查询下一个题库")
+                    current = launch()
+                    continue
+                for future in done:
+                    provider = running.pop(future)
+                    answer = future.result()
+                    if answer and provider.accept_answer(answer, q_info['type']):
+                        logger.debug(f"组合题库采用{provider.name}的答案")
+                        return answer
+                    if answer:
+                        logger.info(f"从{provider.name}获取到的答案类型与题目类型不符，已舍弃")
+                # 已返回的答案均不可用, 不必等待对冲时间, 立即尝试下一个题库
+                if queue:
+                    current = launch()
+            return None
+        finally:
+            # 未开始的请求取消; 已被线程取走但尚未发起的请求见到 settled 后直接放弃
+            settled.set()
+            for future in running:
+                future.cancel()
+
+    def accept_answer(self, answer: str, q_type: str) -> bool:
+        # 答案在 _query 中已由给出答案的题库按其自身规则校验
+        return bool(answer)
@@ -47,34 +47,40 @@ def check_answer(answer, type, tiku):  # 只会写小杯代码，这里用个tik
     return False
 
 
+# 切割符按优先级排列, 应先按照 '\n' 匹配, 匹配不到再按照其他字符匹配 #391
+_CUT_CHARS = (
+    "\n",
+    ",",
+    "，",
+    "|",
+    "\r",
+    "\t",
+    "#",
+    "*",
+    "-",
+    "_",
+    "+",
+    "@",
+    "~",
+    "/",
+    "\\",
+    ".",
+    "&",
+    " ",
+    "、",
+)
+_CUT_CHAR_SET = frozenset(_CUT_CHARS)
+
+
 def cut(answer):
-    cut_char = [
-        "\n",
-        ",",
-        "，",
-        "|",
-        "\r",
-        "\t",
-        "#",
-        "*",
-        "-",
-        "_",
-        "+",
-        "@",
-        "~",
-        "/",
-        "\\",
-        ".",
-        "&",
-        " ",
-        "、",
-    ]
     if answer is None:
         return None
 
     answer = str(answer)
-    for char in cut_char:
-        if char not in answer:
+    # 一次遍历找出答案中出现的切割符, 只对出现的切割符执行 split
+    present = _CUT_CHAR_SET.intersection(answer)
+    for char in _CUT_CHARS:
+        if char not in present:
             continue
         res = [opt.strip() for opt in answer.split(char) if opt.strip()]
         if res:
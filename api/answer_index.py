@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+题库答案索引
+
+离线把多份题目/答案导出文件(JSONL、CSV、各机器上的 cache.json)合并为一个只读索引文件,
+CacheDAO 启动时以 mmap 方式打开, 无需解析整个文件, 查询时只读取命中的条目。
+
+索引文件格式(小端序):
+    头部  : magic "CXAI" | 版本 u32 | 条目数 n u32 | 保留 u32
+    哈希表: n 个 u64, 题目 blake2b-64 哈希, 升序排列
+    偏移表: n 个 u64, 与哈希表一一对应, 条目在数据区内的偏移
+    数据区: 每个条目为 题目长度 u32 | 题目 UTF-8 | 答案长度 u32 | 答案 UTF-8
+
+用法:
+    python -m api.answer_index 本机/cache.json 导出.jsonl 旧题库.csv -o answer_index.bin
+
+输入文件按优先级从高到低排列, 同一题目答案冲突时以优先级高的来源为准,
+同一来源内重复的题目以后出现的为准。
+"""
+import argparse
+import bisect
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+from pathlib import Path
+from re import sub
+from typing import Iterator, Mapping, Optional
+
+from api.logger import logger
+
+QUESTION_KEYS = ("question", "title", "q")
+ANSWER_KEYS = ("answer", "a")
+
+
+def canonical_question(title: str) -> str:
+    """题目规范化, 与 Tiku.query 查询缓存前的处理一致: 去掉开头的题号与结尾的分值以及残留的首尾空白"""
+    title = sub(r'^\d+', '', title.strip())
+    return sub(r'（\d+\.\d+分）$', '', title).strip()
+
+
+def _hash_question(question: str) -> int:
+    return int.from_bytes(hashlib.blake2b(question.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class AnswerIndex:
+    """只读的题目 -> 答案索引, 通过 mmap 按需读取, 可被多个进程共享页缓存"""
+
+    MAGIC = b"CXAI"
+    VERSION = 1
+    _HEADER = struct.Struct("<4sIII")
+    _U32 = struct.Struct("<I")
+    _U64 = struct.Struct("<Q")
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path)
+        with self.path.open("rb") as fp:
+            self._mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, count, _ = self._HEADER.unpack_from(self._mm, 0)
+            if magic != self.MAGIC or version != self.VERSION:
+                raise ValueError(f"不是有效的答案索引文件: {self.path}")
+            self._count = count
+            self._hash_base = self._HEADER.size
+            self._offset_base = self._hash_base + 8 * count
+            self._data_base = self._offset_base + 8 * count
+            if len(self._mm) < self._data_base:
+                raise ValueError(f"答案索引文件不完整: {self.path}")
+        except Exception:
+            self._mm.close()
+            raise
+        self._hashes = _HashView(self)
+
+    @classmethod
+    def open(cls, path: str | os.PathLike) -> Optional["AnswerIndex"]:
+        """打开索引文件, 文件不存在或格式错误时返回 None"""
+        if not Path(path).is_file():
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning(f"答案索引文件无法打开, 已忽略: {e}")
+            return None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, question: str) -> bool:
+        return self.get(question) is not None
+
+    def _hash_at(self, i: int) -> int:
+        return self._U64.unpack_from(self._mm, self._hash_base + 8 * i)[0]
+
+    def _entry_at(self, i: int) -> tuple[str, str]:
+        pos = self._data_base + self._U64.unpack_from(self._mm, self._offset_base + 8 * i)[0]
+        key_len = self._U32.unpack_from(self._mm, pos)[0]
+        pos += 4
+        key = self._mm[pos:pos + key_len].decode("utf-8")
+        pos += key_len
+        answer_len = self._U32.unpack_from(self._mm, pos)[0]
+        pos += 4
+        return key, self._mm[pos:pos + answer_len].decode("utf-8")
+
+    def get(self, question: str) -> Optional[str]:
+        """查询题目答案, 题目需已规范化"""
+        h = _hash_question(question)
+        i = bisect.bisect_left(self._hashes, h)
+        # 哈希冲突时相同哈希的条目相邻, 逐个比对题目原文
+        while i < self._count and self._hash_at(i) == h:
+            key, answer = self._entry_at(i)
+            if key == question:
+                return answer
+            i += 1
+        return None
+
+    def items(self) -> Iterator[tuple[str, str]]:
+        for i in range(self._count):
+            yield self._entry_at(i)
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> "AnswerIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @classmethod
+    def build(cls, entries: Mapping[str, str], path: str | os.PathLike) -> int:
+        """将题目 -> 答案写为索引文件(写入临时文件后原子替换), 返回条目数"""
+        path = Path(path)
+        keyed = sorted((_hash_question(q), q, a) for q, a in entries.items())
+        hashes = bytearray()
+        offsets = bytearray()
+        data = bytearray()
+        for h, question, answer in keyed:
+            hashes += cls._U64.pack(h)
+            offsets += cls._U64.pack(len(data))
+            for text in (question, answer):
+                raw = text.encode("utf-8")
+                data += cls._U32.pack(len(raw))
+                data += raw
+
+        parent = path.parent if str(path.parent) else Path(".")
+        parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=path.name, dir=str(parent))
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                fp.write(cls._HEADER.pack(cls.MAGIC, cls.VERSION, len(keyed), 0))
+                fp.write(hashes)
+                fp.write(offsets)
+                fp.write(data)
+                fp.flush()
+                os.fsync(fp.fileno())
+            os.replace(tmp_path, str(path))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return len(keyed)
+
+
+class _HashView:
+    """把索引中的哈希表包装为序列, 供 bisect 直接在 mmap 上二分查找"""
+
+    def __init__(self, index: AnswerIndex):
+        self._index = index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getitem__(self, i: int) -> int:
+        return self._index._hash_at(i)
+
+
+def _pick(record: Mapping, keys: tuple[str, ...]) -> Optional[str]:
+    for key in keys:
+        value = record.get(key)
+        if value is not None:
+            return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+    return None
+
+
+def iter_source(path: str | os.PathLike) -> Iterator[tuple[str, str]]:
+    """
+    读取一个导出文件, 产出 (题目, 答案)
+
+    - .jsonl: 每行一个对象, 题目字段为 question/title/q, 答案字段为 answer/a
+    - .csv  : 表头包含上述字段名; 没有可识别的表头时取前两列
+    - .json : cache.json 格式的 {题目: 答案} 对象, 或对象数组
+    - 其他  : 视为已有的答案索引文件, 用于在旧索引基础上追加
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".jsonl":
+        with path.open("r", encoding="utf-8") as fp:
+            for line_no, line in enumerate(fp, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"{path}:{line_no} 不是有效的 JSON, 已跳过")
+                    continue
+                if isinstance(record, dict):
+                    yield _pick(record, QUESTION_KEYS), _pick(record, ANSWER_KEYS)
+    elif suffix == ".csv":
+        with path.open("r", encoding="utf-8-sig", newline="") as fp:
+            rows = csv.reader(fp)
+            header = next(rows, None)
+            if header is None:
+                return
+            names = [name.strip().lower() for name in header]
+            q_col = next((names.index(k) for k in QUESTION_KEYS if k in names), None)
+            a_col = next((names.index(k) for k in ANSWER_KEYS if k in names), None)
+            if q_col is None or a_col is None:
+                q_col, a_col = 0, 1
+                rows = [header, *rows]
+            for row in rows:
+                if len(row) > max(q_col, a_col):
+                    yield row[q_col], row[a_col]
+    elif suffix == ".json":
+        with path.open("r", encoding="utf-8") as fp:
+            data = json.load(fp)
+        if isinstance(data, dict):
+            for question, answer in data.items():
+                yield question, answer if isinstance(answer, str) else json.dumps(answer, ensure_ascii=False)
+        elif isinstance(data, list):
+            for record in data:
+                if isinstance(record, dict):
+                    yield _pick(record, QUESTION_KEYS), _pick(record, ANSWER_KEYS)
+    else:
+        with AnswerIndex(path) as index:
+            yield from index.items()
+
+
+def merge_sources(paths: list[str]) -> tuple[dict[str, str], dict[str, int]]:
+    """
+    按优先级合并多个来源(paths 中靠前的优先), 返回 (题目 -> 答案, 统计信息)
+
+    从优先级最低的来源开始依次覆盖, 因此高优先级来源与同一来源内后出现的条目生效
+    """
+    merged: dict[str, str] = {}
+    stats = {"read": 0, "skipped": 0, "conflicts": 0}
+    for path in reversed(paths):
+        count = 0
+        for question, answer in iter_source(path):
+            stats["read"] += 1
+            question = canonical_question(question or "")
+            answer = (answer or "").strip()
+            if not question or not answer:
+                stats["skipped"] += 1
+                continue
+            previous = merged.get(question)
+            if previous is not None and previous != answer:
+                stats["conflicts"] += 1
+            merged[question] = answer
+            count += 1
+        logger.info(f"读取 {path}: {count} 条")
+    stats["unique"] = len(merged)
+    return merged, stats
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="批量导入题库并生成答案索引文件")
+    parser.add_argument("sources", nargs="+", help="导出文件(.jsonl/.csv/.json/已有索引), 按优先级从高到低排列")
+    parser.add_argument("-o", "--output", default="answer_index.bin", help="输出的索引文件")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    merged, stats = merge_sources(args.sources)
+    count = AnswerIndex.build(merged, args.output)
+    logger.info(
+        f"共读取 {stats['read']} 条, 跳过无效 {stats['skipped']} 条, 答案冲突 {stats['conflicts']} 条, "
+        f"写入 {count} 条到 {args.output} ({time.perf_counter() - start:.2f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+选项匹配模块: 将题库返回的答案映射为提交表单使用的选项字母。
+
+分隔符与清洗用的正则在模块加载时预编译; 每道题的选项只规范化一次,
+候选答案与全部选项的最长公共子序列长度通过一次 rapidfuzz.process.cdist 计算得到,
+子序列判断、包含判断与相似度(fuzz.ratio 即 2*LCS/(len(a)+len(b)))都由该矩阵向量化推出,
+未安装 rapidfuzz 时退化为 difflib 逐对计算。
+"""
+import random
+import re
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import Optional
+
+from api.answer_check import cut
+from api.logger import logger
+
+try:
+    import numpy as np
+    from rapidfuzz.distance import LCSseq
+    from rapidfuzz.process import cdist
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+# 选项/答案前缀, 例如 "A." "B、" "C，" "D "
+_PREFIX_PATTERN = re.compile(r"^\s*([A-Za-z])(?:[.．、,，:：)）]\s*|\s+)")
+# 比较文本前需要去掉的标点与空白
+_PUNCT_PATTERN = re.compile(r"[\s.,!?;:，。！？；：、]+")
+# 纯字母答案中允许出现的分隔符, 例如 "A,C" "A|C" "A C"
+_LETTER_SEP_PATTERN = re.compile(r"[\s,，、;；|/&+#\-_.*~@\\]+")
+# cut 未覆盖的多选答案分隔符
+_EXTRA_SEP_PATTERN = re.compile(r"[;；]")
+
+# 多选题随机作答时, 按可选项数量选择答案个数的权重
+_MULTIPLE_WEIGHTS = {
+    2: [1.0],
+    3: [0.3, 0.7],
+    4: [0.1, 0.5, 0.4],
+    5: [0.1, 0.4, 0.3, 0.2],
+}
+
+
+def is_subsequence(a: str, o: str) -> bool:
+    """判断 a 是否为 o 的子序列"""
+    iter_o = iter(o)
+    return all(c in iter_o for c in a)
+
+
+def normalize_text(text: str) -> str:
+    """去掉选项字母前缀与标点, 用于选项文本与答案文本的比较"""
+    return _PUNCT_PATTERN.sub("", _PREFIX_PATTERN.sub("", str(text), count=1))
+
+
+@dataclass
+class PreparedOptions:
+    """单道题规范化后的选项, 每道题只需构建一次"""
+    items: list[str]
+    letters: str
+    texts: list[str]
+
+
+@dataclass
+class MatchResult:
+    """
+    匹配结果
+
+    answer: 提交用的选项字母, 多选按字母排序, 未能匹配时为空字符串
+    scores: 每个选项字母对应的置信度(0~1)
+    method: 匹配方式, letter 表示答案直接给出了选项字母, text 表示按选项内容匹配
+    """
+    answer: str = ""
+    scores: dict[str, float] = field(default_factory=dict)
+    method: str = ""
+
+
+class AnswerMatcher:
+    """
+    题库答案与选项的匹配器
+
+    - 答案直接给出选项字母(如 "ACD"、"A,C")时按字母匹配
+    - 否则将答案切分为候选项, 与全部选项计算置信度矩阵, 见 score()
+    """
+
+    def __init__(self, min_score: float = 0.8):
+        self.min_score = min_score
+
+    @staticmethod
+    def prepare(options: str) -> Optional[PreparedOptions]:
+        """切分并规范化选项, 无法切分时返回None"""
+        items = cut(options)
+        if not items:
+            return None
+        return PreparedOptions(
+            items=items,
+            letters="".join(item[:1] for item in items),
+            texts=[normalize_text(item) for item in items],
+        )
+
+    @staticmethod
+    def _extract_letters(answer: str, letters: str) -> str:
+        """答案仅由选项字母(及分隔符)组成时返回去重后的字母, 否则返回空字符串"""
+        compact = _LETTER_SEP_PATTERN.sub("", answer)
+        if not compact or not compact.isascii() or not compact.isalpha():
+            return ""
+        if not (compact.isupper() or len(compact) == 1):
+            return ""
+        compact = compact.upper()
+        if any(ch not in letters for ch in compact):
+            return ""
+        return "".join(dict.fromkeys(compact))
+
+    def score(self, prepared: PreparedOptions, candidates: list[str]) -> list[list[float]]:
+        """
+        计算候选答案与全部选项的置信度矩阵, 行对应候选答案, 列对应选项
+
+        - 候选项是选项内容的子序列时置信度为 1
+        - 选项内容(至少两个字)是候选项的子序列时置信度至少为 0.9,
+          例如答案 "牛顿第二定律F=ma" 包含选项 "牛顿第二定律"
+        - 其余按编辑距离相似度计算
+        """
+        if not candidates or not prepared.texts:
+            return []
+        if RAPIDFUZZ_AVAILABLE:
+            return self._score_lcs(prepared.texts, candidates)
+        return self._score_difflib(prepared.texts, candidates)
+
+    @staticmethod
+    def _score_lcs(texts: list[str], candidates: list[str]) -> list[list[float]]:
+        # 选项只有四五个, 矩阵很小, 由 LCS 长度推导置信度时 Python 循环比逐步的 numpy 运算更快
+        lcs = cdist(candidates, texts, scorer=LCSseq.similarity, dtype=np.int32).tolist()
+        text_lens = [len(t) for t in texts]
+        return [
+            [
+                1.0 if common == len(candidate)
+                else max(2.0 * common / (len(candidate) + text_len), 0.9 if common == text_len >= 2 else 0.0)
+                for common, text_len in zip(row, text_lens)
+            ]
+            for candidate, row in zip(candidates, lcs)
+        ]
+
+    @staticmethod
+    def _score_difflib(texts: list[str], candidates: list[str]) -> list[list[float]]:
+        matrix = []
+        for candidate in candidates:
+            row = []
+            for text in texts:
+                if is_subsequence(candidate, text):
+                    row.append(1.0)
+                    continue
+                ratio = SequenceMatcher(None, candidate, text).ratio()
+                if len(text) >= 2 and is_subsequence(text, candidate):
+                    ratio = max(ratio, 0.9)
+                row.append(ratio)
+            matrix.append(row)
+        return matrix
+
+    def match(self, prepared: PreparedOptions, answer, q_type: str) -> MatchResult:
+        """
+        将题库答案匹配为选项字母, 仅处理单选与多选题
+
+        Args:
+            prepared: prepare() 得到的选项
+            answer: 题库返回的答案, 字符串或字符串列表
+            q_type: 题目类型, single 或 multiple
+        """
+        if isinstance(answer, (list, tuple)):
+            answer = "\n".join(str(a) for a in answer)
+        answer = str(answer)
+
+        letters = self._extract_letters(answer, prepared.letters)
+        if letters and (q_type != "single" or len(letters) == 1):
+            return MatchResult(
+                answer="".join(sorted(letters)),
+                scores={ch: 1.0 for ch in letters},
+                method="letter",
+            )
+
+        if q_type == "multiple":
+            parts = [p for part in (cut(answer) or []) for p in _EXTRA_SEP_PATTERN.split(part)]
+        else:
+            parts = [answer]
+        candidates = [c for c in (normalize_text(p) for p in parts) if c]
+        matrix = self.score(prepared, candidates)
+        if not matrix:
+            return MatchResult()
+
+        scores = {
+            letter: max(row[j] for row in matrix)
+            for j, letter in enumerate(prepared.letters)
+        }
+
+        selected: list[str] = []
+        if q_type == "single":
+            best = max(range(len(prepared.letters)), key=lambda j: scores[prepared.letters[j]])
+            if scores[prepared.letters[best]] >= self.min_score:
+                selected.append(prepared.letters[best])
+        else:
+            for row in matrix:
+                exact = [prepared.letters[j] for j, s in enumerate(row) if s >= 1.0]
+                if exact:
+                    selected.extend(exact)
+                    continue
+                best = max(range(len(row)), key=row.__getitem__)
+                if row[best] >= self.min_score:
+                    selected.append(prepared.letters[best])
+
+        return MatchResult(
+            answer="".join(sorted(set(selected))),
+            scores=scores,
+            method="text" if selected else "",
+        )
+
+    @staticmethod
+    def random_answer(prepared: Optional[PreparedOptions], q_type: str) -> str:
+        """在无法获取答案时随机作答"""
+        answer = ""
+        if prepared is None:
+            return answer
+        if q_type == "judgement":
+            answer = "true" if random.choice([True, False]) else "false"
+        elif q_type == "single":
+            answer = random.choice(prepared.letters)
+        elif q_type == "multiple":
+            available_options = len(prepared.letters)
+            if available_options <= 1:
+                select_count = available_options
+            else:
+                max_possible = min(4, available_options)
+                min_possible = min(2, available_options)
+                possible_counts = list(range(min_possible, max_possible + 1))
+                weights = _MULTIPLE_WEIGHTS.get(max_possible, [0.3, 0.4, 0.3])[:len(possible_counts)]
+                select_count = random.choices(possible_counts, weights=weights, k=1)[0]
+            answer = "".join(sorted(random.sample(prepared.letters, select_count)))
+        logger.info(f"随机选择 -> {answer}")
+        return answer
+
+
+# 全局共享的匹配器实例
+default_matcher = AnswerMatcher()
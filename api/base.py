@@ -1,22 +1,23 @@
 # -*- coding: utf-8 -*-
+import copy
 import functools
 import random
 import re
 import threading
 import time
+import zlib
 from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from hashlib import md5
-from typing import Self, Optional, Literal
+from typing import Iterator, Self, Optional, Literal
 
 import requests
 from loguru import logger
 from requests import RequestException
 from requests.adapters import HTTPAdapter
-from tqdm import tqdm
 
 from api.answer import *
-from api.answer_check import cut
+from api.answer_match import PreparedOptions, default_matcher
 from api.cipher import AESCipher
 from api.config import GlobalConst as gc
 from api.cookies import save_cookies, use_cookies
@@ -26,8 +27,24 @@ from api.decode import (
     decode_course_card,
     decode_course_folder,
     decode_questions_info,
+    iter_course_points,
 )
 from api.exceptions import MaxRetryExceeded
+from api.progress import JobFinished, JobProgress, JobStarted, ProgressBus
+from api.records import ChapterPoint
+
+
+# 预取的章节任务点与测验页面的有效期(秒), 超时后重新请求
+PREFETCH_TTL = 600
+
+
+def _pack_page(html: str) -> bytes:
+    """压缩网页源码, 题目解析完成后仅用于输出诊断信息"""
+    return zlib.compress(html.encode("utf-8"), 1)
+
+
+def _unpack_page(page: bytes) -> str:
+    return zlib.decompress(page).decode("utf-8")
 
 
 def get_timestamp():
@@ -36,13 +53,19 @@ def get_timestamp():
 
 class SessionManager:
     _instance = None
+    _init_lock = threading.Lock()
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._init_lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._init_session()
+                    cls._instance = instance
         return cls._instance
 
-    def __init__(self):
+    def _init_session(self):
+        # 只在创建单例时初始化一次, 之后 get_session() 始终返回同一个会话, 复用其 cookies 与连接池
         self._session = requests.Session()
         self._session.mount("https://", HTTPAdapter(max_retries=10))
         self._session.mount("http://", HTTPAdapter(max_retries=10))
@@ -120,6 +143,10 @@ class Chaoxing:
         self.rollback_times = 0
         self.rate_limiter = RateLimiter(0.5) # 其他接口速率限制比较松
         self.video_log_limiter = RateLimiter(2) # 上报进度极其容易卡验证码，限制2s一次
+        # 预取结果: 章节ID -> (时间, 任务点, 任务信息), 测验ID -> (时间, 响应, 题目)
+        self._prefetch_lock = threading.Lock()
+        self._prefetched_jobs: dict[str, tuple[float, list[dict], dict]] = {}
+        self._prefetched_works: dict[str, tuple[float, requests.Response, dict]] = {}
 
     def login(self, login_with_cookies=False):
         if login_with_cookies:
@@ -235,7 +262,93 @@ class Chaoxing:
         logger.info("课程章节读取成功...")
         return decode_course_point(_resp.text)
 
+    def iter_course_points(self, _courseid, _clazzid, _cpi) -> Iterator[ChapterPoint]:
+        """惰性读取课程章节: 首次迭代时才请求页面, 之后逐个解析产出章节, 不保留完整的章节列表"""
+        _session = SessionManager.get_session()
+        _url = f"https://mooc2-ans.chaoxing.com/mooc2-ans/mycourse/studentcourse?courseid={_courseid}&clazzid={_clazzid}&cpi={_cpi}&ut=s"
+        logger.trace("开始读取课程章节...")
+        yield from iter_course_points(_session.get(_url).text)
+
     def get_job_list(self, course: dict, point: dict) -> tuple[list[dict], dict]:
+        prefetched = self._take_prefetched(self._prefetched_jobs, point["id"])
+        if prefetched:
+            job_list, job_info = prefetched
+            logger.debug(f"使用预取的章节任务点: {point['title']}")
+        else:
+            fetched = self._fetch_job_list(course, point)
+            if fetched is None:
+                return [], {}
+            job_list, job_info = fetched
+            if job_info.get("notOpen", False):
+                return [], job_info
+
+        if not job_list:
+            self.study_emptypage(course, point)
+        logger.info("章节任务点读取成功...")
+
+        return job_list, job_info
+
+    def _take_prefetched(self, store: dict, key: str):
+        """取出未过期的预取结果, 每份结果只使用一次"""
+        with self._prefetch_lock:
+            entry = store.pop(key, None)
+        if entry is None or time.monotonic() - entry[0] > PREFETCH_TTL:
+            return None
+        return entry[1:]
+
+    def prefetch_chapter(self, course: dict, point: dict) -> list[dict]:
+        """
+        预取章节的任务点与其中的测验页面, 并预热答案缓存与 OCR 缓存
+
+        工作线程处理到该章节时直接使用预取结果, 答题只剩提交一步需要联网
+
+        Returns:
+            预取到的任务点列表, 用于必要时通过 drop_prefetched 丢弃
+        """
+        fetched = self._fetch_job_list(course, point)
+        if fetched is None or fetched[1].get("notOpen", False):
+            # 未开放的章节可能稍后开放, 不缓存
+            return []
+        job_list, job_info = fetched
+        with self._prefetch_lock:
+            self._prefetched_jobs[point["id"]] = (time.monotonic(), job_list, job_info)
+
+        if self.tiku and not self.tiku.DISABLE:
+            for job in job_list:
+                if job["type"] == "workid":
+                    self.prefetch_work(course, job, job_info)
+        return job_list
+
+    def drop_prefetched(self, point: dict, job_list: list[dict]) -> None:
+        """丢弃章节的预取结果, 用于预取完成前章节已开始处理的情况, 避免之后重试时用到过期页面"""
+        with self._prefetch_lock:
+            self._prefetched_jobs.pop(point["id"], None)
+            for job in job_list:
+                self._prefetched_works.pop(job.get("jobid"), None)
+
+    def prefetch_work(self, _course, _job, _job_info) -> None:
+        """预取测验页面并逐题查询题库, 查询结果写入答案缓存"""
+        self.rate_limiter.limit_rate()
+        try:
+            page, questions = self._fetch_work_questions(
+                SessionManager.get_session(), self._work_params(_course, _job, _job_info), max_retries=1
+            )
+        except Exception as e:
+            logger.debug(f"预取测验失败, 将在答题时重新获取: {e}")
+            return
+        with self._prefetch_lock:
+            self._prefetched_works[_job["jobid"]] = (time.monotonic(), page, questions)
+
+        query_delay = self.kwargs.get("query_delay", 0)
+        for q in questions["questions"]:
+            if query_delay:
+                time.sleep(query_delay)
+            # query 会改写题目标题, 使用副本避免影响答题时的题目信息
+            self.tiku.query(copy.deepcopy(q))
+        logger.debug(f"测验预取完成: {_job['jobid']} 共 {len(questions['questions'])} 题")
+
+    def _fetch_job_list(self, course: dict, point: dict) -> Optional[tuple[list[dict], dict]]:
+        """请求章节任务卡片并解析任务点, 请求失败时返回 None"""
         _session = SessionManager.get_session()
         self.rate_limiter.limit_rate()
         job_list = []
@@ -260,7 +373,7 @@ class Chaoxing:
             if _resp.status_code != 200:
                 logger.error(f"未知错误: {_resp.status_code} 正在跳过")
                 logger.error(_resp.text)
-                return [], {}
+                return None
 
             _job_list, _job_info = decode_course_card(_resp.text)
             if _job_info.get("notOpen", False):
@@ -271,11 +384,7 @@ class Chaoxing:
             job_list += _job_list
             job_info.update(_job_info)
 
-        if not job_list:
-            self.study_emptypage(course, point)
         # logger.trace(f"原始任务点列表内容:\n{_resp.text}")
-        logger.info("章节任务点读取成功...")
-
         return job_list, job_info
 
     def get_enc(self, clazzId, jobid, objectId, playingTime, duration, userid):
@@ -453,7 +562,7 @@ class Chaoxing:
         _job_info,
         _speed: float = 1.0,
         _type: Literal["Video", "Audio"] = "Video",
-        progress_callback=None,
+        progress_bus: Optional[ProgressBus] = None,
     ) -> StudyResult:
         _session = SessionManager.get_session()
 
@@ -475,22 +584,27 @@ class Chaoxing:
 
         duration = int(_video_info["duration"])
         play_time = int(_job["playTime"]) // 1000
+        logger.info(f"开始任务: {_job['name']}, 总时长: {duration}s, 已进行: {play_time}s")
+
+        if progress_bus is not None:
+            progress_bus.publish(JobStarted(_course, _job, float(play_time), float(duration)))
+        result = StudyResult.ERROR
+        try:
+            result = self._play_video(_session, _course, _job, _job_info, _dtoken, duration, play_time,
+                                      _speed, _type, headers, progress_bus)
+            return result
+        finally:
+            # 无论成功、失败还是异常都发布结束事件, 订阅者据此关闭进度条、移除活动任务
+            if progress_bus is not None:
+                progress_bus.publish(JobFinished(_course, _job, result == StudyResult.SUCCESS))
+
+    def _play_video(self, _session, _course, _job, _job_info, _dtoken, duration, play_time,
+                    _speed, _type, headers, progress_bus) -> StudyResult:
+        """模拟播放直至任务点完成, 播放进度发布到 progress_bus"""
         last_log_time = 0
         last_iter = time.time()
         wait_time = int(random.uniform(30, 90))
 
-        logger.info(f"开始任务: {_job['name']}, 总时长: {duration}s, 已进行: {play_time}s")
-
-        # 首次上报进度
-        if callable(progress_callback):
-            try:
-                progress_callback(_course, _job, float(play_time), float(duration))
-            except Exception as exc:
-                logger.debug(f"视频进度回调执行失败(初始): {exc}")
-
-        pbar = tqdm(total=duration, initial=play_time, desc=_job["name"],
-                    unit_scale=True, bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt}')
-
         forbidden_retry = 0
         max_forbidden_retry = 2
 
@@ -541,15 +655,9 @@ class Chaoxing:
             last_iter = time.time()
             play_time = min(duration, play_time+dt)
 
-            pbar.n = int(play_time)
-            pbar.refresh()
-
-            # 实时上报进度给外部（如 Web 前端）
-            if callable(progress_callback):
-                try:
-                    progress_callback(_course, _job, float(play_time), float(duration))
-                except Exception as exc:
-                    logger.debug(f"视频进度回调执行失败: {exc}")
+            # 实时发布进度, 由订阅者(命令行进度条、Web 前端)按各自频率刷新
+            if progress_bus is not None:
+                progress_bus.publish(JobProgress(_course, _job, float(play_time), float(duration)))
 
             time.sleep(gc.THRESHOLD)
 
@@ -589,209 +697,89 @@ class Chaoxing:
             return StudyResult.SUCCESS
 
 
-    def study_work(self, _course, _job, _job_info) -> StudyResult:
-        # FIXME: 这一块可以单独搞一个类出来了，方法里面又套方法，每一次调用都会创建新的方法，十分浪费
-        if self.tiku.DISABLE or not self.tiku:
-            return StudyResult.SUCCESS
-        _ORIGIN_HTML_CONTENT = ""  # 用于配合输出网页源码, 帮助修复#391错误
-
-        def random_answer(options: str) -> str:
-            answer = ""
-            if not options:
-                return answer
-
-            if q["type"] == "multiple":
-                logger.debug(f"当前选项列表[cut前] -> {options}")
-                _op_list = multi_cut(options)
-                logger.debug(f"当前选项列表[cut后] -> {_op_list}")
-
-                if not _op_list:
-                    logger.error(
-                        "选项为空, 未能正确提取题目选项信息! 请反馈并提供以上信息"
-                    )
-                    return answer
-
-                available_options = len(_op_list)
-                select_count = 0
-
-                # 根据可用选项数量调整可能选择的选项数
-                if available_options <= 1:
-                    select_count = available_options
-                else:
-                    max_possible = min(4, available_options)
-                    min_possible = min(2, available_options)
-
-                    weights_map = {
-                        2: [1.0],
-                        3: [0.3, 0.7],
-                        4: [0.1, 0.5, 0.4],
-                        5: [0.1, 0.4, 0.3, 0.2],
-                    }
-
-                    weights = weights_map.get(max_possible, [0.3, 0.4, 0.3])
-                    possible_counts = list(range(min_possible, max_possible + 1))
-
-                    weights = weights[:len(possible_counts)]
-
-                    weights_sum = sum(weights)
-                    if weights_sum > 0:
-                        weights = [w / weights_sum for w in weights]
-
-                    select_count = random.choices(possible_counts, weights=weights, k=1)[0]
-
-                selected_options = random.sample(_op_list, select_count) if select_count > 0 else []
-
-                for option in selected_options:
-                    answer += option[:1]  # 取首字为答案，例如A或B
-
-                answer = "".join(sorted(answer))
-            elif q["type"] == "single":
-                answer = random.choice(options.split("\n"))[:1]  # 取首字为答案, 例如A或B
-            # 判断题处理
-            elif q["type"] == "judgement":
-                # answer = self.tiku.jugement_select(_answer)
-                answer = "true" if random.choice([True, False]) else "false"
-            logger.info(f"随机选择 -> {answer}")
-            return answer
-
-        def multi_cut(answer: str):
-            """
-            将多选题答案字符串按特定字符进行切割, 并返回切割后的答案列表
-
-            参数:
-            answer(str): 多选题答案字符串.
-
-            返回:
-            list[str]: 切割后的答案列表,如果无法切割, 则返回默认的选项列表None
-
-            注意:
-            如果无法从网页中提取题目信息,将记录警告日志并返回None
-            """
-            # cut_char = [',','，','|','\n','\r','\t','#','*','-','_','+','@','~','/','\\','.','&',' ']    # 多选答案切割符
-            # ',' 在常规被正确划分的, 选项中出现, 导致 multi_cut 无法正确划分选项 #391
-            # IndexError: Cannot choose from an empty sequence #391
-            # 同时为了避免没有考虑到的 case, 应该先按照 '\n' 匹配, 匹配不到再按照其他字符匹配
-            cut_char = [
-                "\n",
-                ",",
-                "，",
-                "|",
-                "\r",
-                "\t",
-                "#",
-                "*",
-                "-",
-                "_",
-                "+",
-                "@",
-                "~",
-                "/",
-                "\\",
-                ".",
-                "&",
-                " ",
-                "、",
-            ]  # 多选答案切割符
-            res = cut(answer)
-            if res is None:
-                logger.warning(
-                    f"未能从网页中提取题目信息, 以下为相关信息：\n\t{answer}\n\n{_ORIGIN_HTML_CONTENT}\n"
-                )  # 尝试输出网页内容和选项信息
-                logger.warning("未能正确提取题目选项信息! 请反馈并提供以上信息")
-                return None
-            else:
-                return res
-
-        def clean_res(res):
-            cleaned_res = []
-            if isinstance(res, str):
-                res = [res]
-            for c in res:
-                cleaned = re.sub(r'^[A-Za-z]|[.,!?;:，。！？；：]', '', c)
-                cleaned_res.append(cleaned.strip())
-
-            return cleaned_res
-
-        def is_subsequence(a, o):
-            iter_o = iter(o)
-            return all(c in iter_o for c in a)
+    @staticmethod
+    def _work_params(_course, _job, _job_info) -> dict:
+        """章节测验页面的请求参数"""
+        return {
+            "api": "1",
+            "workId": _job["jobid"].replace("work-", ""),
+            "jobid": _job["jobid"],
+            "originJobId": _job["jobid"],
+            "needRedirect": "true",
+            "skipHeader": "true",
+            "knowledgeid": str(_job_info["knowledgeid"]),
+            "ktoken": _job_info["ktoken"],
+            "cpi": _job_info["cpi"],
+            "ut": "s",
+            "clazzId": _course["clazzId"],
+            "type": "",
+            "enc": _job["enc"],
+            "mooc2": "1",
+            "courseid": _course["courseId"],
+        }
 
+    def _fetch_work_questions(self, _session, params: dict, max_retries: int = 3, delay: float = 1):
+        """获取章节测验页面并解析题目, 失败时按指数退避重试, 返回 (压缩的网页源码, 题目信息)"""
         # FIXME: Use tenacity for retrying
-        def with_retry(max_retries=3, delay=1):
-            def decorator(func):
-                def wrapper(*args, **kwargs):
-                    retries = 0
-                    while retries < max_retries:
-                        try:
-                            _resp = func(*args, **kwargs)
-
-                            # 未创建完成该测验则不进行答题，目前遇到的情况是未创建完成等同于没题目
-                            if '教师未创建完成该测验' in _resp.text:
-                                raise PermissionError("教师未创建完成该测验")
+        retries = 0
+        while retries < max_retries:
+            try:
+                _resp = _session.get("https://mooc1.chaoxing.com/mooc-ans/api/work", params=params)
 
-                            questions = decode_questions_info(_resp.text)
+                # 未创建完成该测验则不进行答题，目前遇到的情况是未创建完成等同于没题目
+                if '教师未创建完成该测验' in _resp.text:
+                    raise PermissionError("教师未创建完成该测验")
 
-                            if _resp.status_code == 200 and questions.get("questions"):
-                                return (_resp, questions)
+                questions = decode_questions_info(_resp.text)
 
-                            logger.warning(
-                                f"无效响应 (Code: {getattr(_resp, 'status_code', 'Unknown')}), 重试中... ({retries + 1}/{max_retries})")
+                if _resp.status_code == 200 and questions.get("questions"):
+                    # 解析完成后只保留压缩的网页源码用于诊断, 不再持有原始响应
+                    return _pack_page(_resp.text), questions
 
-                        except requests.exceptions.RequestException as e:
-                            logger.warning(f"请求失败: {str(e)[:50]}, 重试中... ({retries + 1}/{max_retries})")
-                        retries += 1
-                        time.sleep(delay * (2 ** retries))
-                    raise MaxRetryExceeded(f"超过最大重试次数 ({max_retries})")
+                logger.warning(
+                    f"无效响应 (Code: {getattr(_resp, 'status_code', 'Unknown')}), 重试中... ({retries + 1}/{max_retries})")
 
-                return wrapper
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"请求失败: {str(e)[:50]}, 重试中... ({retries + 1}/{max_retries})")
+            retries += 1
+            time.sleep(delay * (2 ** retries))
+        raise MaxRetryExceeded(f"超过最大重试次数 ({max_retries})")
 
-            return decorator
+    def study_work(self, _course, _job, _job_info) -> StudyResult:
+        if self.tiku.DISABLE or not self.tiku:
+            return StudyResult.SUCCESS
 
         # 学习通这里根据参数差异能重定向至两个不同接口, 需要定向至https://mooc1.chaoxing.com/mooc-ans/workHandle/handle
         _session = SessionManager.get_session()
 
-        _url = "https://mooc1.chaoxing.com/mooc-ans/api/work"
-
-        @with_retry(max_retries=3, delay=1)
-        def fetch_response():
-            return _session.get(
-                _url,
-                params={
-                    "api": "1",
-                    "workId": _job["jobid"].replace("work-", ""),
-                    "jobid": _job["jobid"],
-                    "originJobId": _job["jobid"],
-                    "needRedirect": "true",
-                    "skipHeader": "true",
-                    "knowledgeid": str(_job_info["knowledgeid"]),
-                    "ktoken": _job_info["ktoken"],
-                    "cpi": _job_info["cpi"],
-                    "ut": "s",
-                    "clazzId": _course["clazzId"],
-                    "type": "",
-                    "enc": _job["enc"],
-                    "mooc2": "1",
-                    "courseid": _course["courseId"],
-                }
-            )
-
-        final_resp = {}
-        questions = {}
-
-        try:
-            final_resp, questions = fetch_response()
-        except Exception as e:
-            logger.error(f"请求失败: {e}")
-            return StudyResult.ERROR
+        prefetched = self._take_prefetched(self._prefetched_works, _job["jobid"])
+        if prefetched:
+            page, questions = prefetched
+            logger.debug(f"使用预取的测验页面: {_job['jobid']}")
+        else:
+            try:
+                page, questions = self._fetch_work_questions(
+                    _session, params=self._work_params(_course, _job, _job_info)
+                )
+            except Exception as e:
+                logger.error(f"请求失败: {e}")
+                return StudyResult.ERROR
 
-        _ORIGIN_HTML_CONTENT = final_resp.text  # 用于配合输出网页源码, 帮助修复#391错误
+        def prepare_options(options: str) -> Optional[PreparedOptions]:
+            prepared = default_matcher.prepare(options)
+            if prepared is None:
+                # 输出网页源码, 帮助修复#391错误
+                logger.warning(
+                    f"未能从网页中提取题目信息, 以下为相关信息：\n\t{options}\n\n{_unpack_page(page)}\n"
+                )  # 尝试输出网页内容和选项信息
+                logger.warning("未能正确提取题目选项信息! 请反馈并提供以上信息")
+            return prepared
 
         # 搜题
         total_questions = len(questions["questions"])
         found_answers = 0
 
         def _handle_question(q, inc_found):
-            nonlocal found_answers
             logger.debug(f"当前题目信息 -> {q}")
             # 添加搜题延迟 #428 - 默认0s延迟
             query_delay = self.kwargs.get("query_delay", 0)
@@ -799,56 +787,25 @@ class Chaoxing:
                 time.sleep(query_delay)
             res = self.tiku.query(q)
             answer = ""
+            # 每道题的选项只规范化一次, 供匹配答案与随机作答共用
+            if q["type"] in ("single", "multiple"):
+                prepared = prepare_options(q["options"])
+            else:
+                prepared = default_matcher.prepare(q["options"])
+
             if not res:
                 # 随机答题
-                answer = random_answer(q["options"])
-                q[f'answerSource{q["id"]}'] = "random"
+                answer = default_matcher.random_answer(prepared, q["type"])
+                q["answer_source"] = "random"
             else:
                 # 根据响应结果选择答案
-                if q["type"] == "multiple":
-                    # 多选处理
-                    options_list = multi_cut(q["options"])
-                    if options_list is not None:
-                        # 1) 优先尝试直接使用 AI 返回的选项字母（例如 "ACD" 或 ["A", "C"]）
-                        opt_letters = "".join(o[:1] for o in options_list)
-                        letters_raw = "".join(ch for ch in str(res) if ch.isalpha()).upper()
-                        letters_filtered = "".join(ch for ch in letters_raw if ch in opt_letters)
-                        if letters_filtered:
-                            # 去重并排序，保证提交格式稳定
-                            unique_letters = []
-                            for ch in letters_filtered:
-                                if ch not in unique_letters:
-                                    unique_letters.append(ch)
-                            answer = "".join(sorted(unique_letters))
-                        else:
-                            # 2) 回退到基于选项内容的子序列匹配
-                            res_list = multi_cut(res)
-                            if res_list is not None:
-                                for _a in clean_res(res_list):
-                                    for o in options_list:
-                                        if is_subsequence(_a, o):  # 去掉各种符号和前面ABCD的答案应当是选项的子序列
-                                            answer += o[:1]
-                                # 对答案进行排序, 否则会提交失败
-                                answer = "".join(sorted(answer))
-                    # else 如果分割失败那么就直接到下面去随机选
-                elif q["type"] == "single":
-                    # 单选题：优先解析为选项字母，其次再根据选项文本匹配
-                    options_list = multi_cut(q["options"])
-                    if options_list is not None:
-                        opt_letters = "".join(o[:1] for o in options_list)
-                        letters_raw = "".join(ch for ch in str(res) if ch.isalpha()).upper()
-                        letters_filtered = "".join(ch for ch in letters_raw if ch in opt_letters)
-                        if len(letters_filtered) == 1:
-                            # AI 已经明确给出单个选项字母
-                            answer = letters_filtered
-                        else:
-                            # 回退到基于选项文本的匹配逻辑
-                            t_res = clean_res(res)
-                            if t_res:
-                                for o in options_list:
-                                    if is_subsequence(t_res[0], o):
-                                        answer = o[:1]
-                                        break
+                if q["type"] in ("single", "multiple"):
+                    # 优先使用题库直接给出的选项字母，其次根据选项内容匹配
+                    # 如果选项分割失败那么就直接到下面去随机选
+                    if prepared is not None:
+                        match = default_matcher.match(prepared, res, q["type"])
+                        logger.debug(f"选项匹配置信度 -> {match.scores}")
+                        answer = match.answer
                 elif q["type"] == "judgement":
                     answer = "true" if self.tiku.judgement_select(res) else "false"
                 elif q["type"] == "completion":
@@ -867,11 +824,11 @@ class Chaoxing:
 
                 if not answer:  # 检查 answer 是否为空
                     logger.warning(f"找到答案但答案未能匹配 -> {res}\t随机选择答案")
-                    answer = random_answer(q["options"])  # 如果为空，则随机选择答案
-                    q[f'answerSource{q["id"]}'] = "random"
+                    answer = default_matcher.random_answer(prepared, q["type"])  # 如果为空，则随机选择答案
+                    q["answer_source"] = "random"
                 else:
                     logger.info(f"成功获取到答案：{answer}")
-                    q[f'answerSource{q["id"]}'] = "cover"
+                    q["answer_source"] = "cover"
                     inc_found()
             # 填充答案
             q["answerField"][f'answer{q["id"]}'] = answer
@@ -921,11 +878,11 @@ class Chaoxing:
         def _fill_answers_into_form(is_save: bool):
             """将每道题的 answerField 写回提交表单。
 
-            - is_save=True: 仅在 answerSource 为 cover 时写入答案（随机答案留空）。
+            - is_save=True: 仅在 answer_source 为 cover 时写入答案（随机答案留空）。
             - is_save=False: 所有 answer* 字段直接写入（提交时保留随机答案）。
             """
             for q in questions["questions"]:
-                src = q.get(f'answerSource{q["id"]}', "")
+                src = q.get("answer_source", "")
                 # 写入所有 answer* 字段（包括 answer{id}, answer{id}_0 等）
                 for key, val in q["answerField"].items():
                     if not isinstance(key, str) or not key.startswith("answer"):
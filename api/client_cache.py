@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Web 后端的已登录客户端缓存
+
+/api/login、/api/courses、/api/start 原先每次请求都新建 Chaoxing 实例并完整登录一次,
+打开选课界面就要登录两三次。这里缓存最近一次登录的客户端:
+    - 复用期间直接使用进程内的会话与连接池, 不再请求登录接口
+    - 所有 Chaoxing 实例共用 SessionManager 的同一个会话, 会话同一时间只属于一个账号,
+      因此只缓存一个账号; 其他账号登录后旧条目即失效, 从不把缓存的 cookies 写回共享会话,
+      以免正在学习的线程被切换到别的账号
+    - 距上次使用超过 validate_after 秒的条目视为可能过期, 复用前通过 _validate_cookie_session 校验一次,
+      校验失败才重新登录
+    - 空闲超过 idle_ttl 秒的条目被移除
+"""
+import hashlib
+import hmac
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from api.answer import Tiku
+from api.base import Account, Chaoxing, SessionManager
+from api.logger import logger
+
+# 空闲超过该时间(秒)的客户端被移除
+CLIENT_IDLE_TTL = 30 * 60
+# 超过该时间(秒)未使用的客户端, 复用前先校验 cookies 是否仍然有效
+CLIENT_VALIDATE_AFTER = 5 * 60
+
+
+def _digest(password: str) -> bytes:
+    return hashlib.sha256((password or "").encode("utf-8")).digest()
+
+
+@dataclass
+class _CachedClient:
+    username: str
+    chaoxing: Chaoxing
+    password_digest: bytes
+    uid: Optional[str]
+    last_used: float
+
+
+class AuthenticatedClientCache:
+    """缓存当前共享会话所属账号的已登录客户端, 线程安全; 登录串行进行, 同一账号的并发请求只登录一次"""
+
+    def __init__(self, idle_ttl: float = CLIENT_IDLE_TTL, validate_after: float = CLIENT_VALIDATE_AFTER):
+        self.idle_ttl = idle_ttl
+        self.validate_after = validate_after
+        self._entry: Optional[_CachedClient] = None
+        # 登录会改写共享会话的 cookies, 不同账号的登录也不能并发
+        self._lock = threading.Lock()
+
+    def acquire(self, username: str, password: str, use_cookies: bool = False) -> tuple[Optional[Chaoxing], dict]:
+        """
+        获取账号对应的已登录客户端, 必要时登录
+
+        Returns:
+            (客户端, 登录结果), 登录失败时客户端为 None
+        """
+        with self._lock:
+            now = time.monotonic()
+            entry = self._entry
+            if entry is not None and now - entry.last_used > self.idle_ttl:
+                logger.debug(f"移除空闲的已登录客户端: {entry.username}")
+                entry = self._entry = None
+            if (
+                entry is not None
+                and entry.username == username
+                and hmac.compare_digest(entry.password_digest, _digest(password))
+            ):
+                client = self._reuse(entry, now)
+                if client is not None:
+                    return client, {"status": True, "msg": "登录成功"}
+            self._entry = None
+
+            chaoxing = Chaoxing(account=Account(username, password), tiku=Tiku(), query_delay=0)
+            login_result = chaoxing.login(login_with_cookies=use_cookies)
+            if not login_result["status"]:
+                return None, login_result
+            self._entry = _CachedClient(
+                username=username,
+                chaoxing=chaoxing,
+                password_digest=_digest(password),
+                uid=SessionManager.get_session().cookies.get("_uid"),
+                last_used=now,
+            )
+            return chaoxing, login_result
+
+    def _reuse(self, entry: _CachedClient, now: float) -> Optional[Chaoxing]:
+        if SessionManager.get_session().cookies.get("_uid") != entry.uid:
+            # 共享会话已被其他途径切换到别的账号, 需要重新登录
+            return None
+        if now - entry.last_used > self.validate_after and not entry.chaoxing._validate_cookie_session():
+            logger.info("已缓存的登录状态失效, 重新登录")
+            return None
+        entry.last_used = now
+        return entry.chaoxing
+
+    def invalidate(self, username: str) -> None:
+        with self._lock:
+            if self._entry is not None and self._entry.username == username:
+                self._entry = None
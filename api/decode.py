@@ -11,29 +11,41 @@ import os
 import sys
 import tempfile
 import threading
-import io
-from typing import List, Dict, Tuple, Any, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple, Any, Optional, Union, MutableMapping, Iterable, Iterator
 
 from bs4 import BeautifulSoup, NavigableString
+from lxml import etree
 
 from api.font_decoder import FontDecoder
 from api.logger import logger
 from api.config import GlobalConst as gc
 from api.cookies import use_cookies
-from api.vision_ocr import vision_ocr, is_vision_ocr_enabled
+from api.vision_ocr import vision_ocr, vision_ocr_many, is_vision_ocr_enabled
+from api.ocr_preprocess import decode_image, iter_variants
+from api.records import ChapterPoint, JobRecord, QuestionRecord
 import requests
-
-try:
-    from PIL import Image, ImageEnhance, ImageFilter
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
+from requests.adapters import HTTPAdapter
 
 ENABLE_LOCAL_OCR = os.environ.get("CHAOXING_ENABLE_OCR", "0").strip().lower() in {"1", "true", "yes", "y", "on"}
 _PADDLE_OCR_ENGINE = None
 _PADDLE_OCR_INITIALIZED = False
 _PADDLE_OCR_DEVICE = None  # 记录当前 OCR 引擎运行的设备（gpu / cpu）
 _PADDLE_OCR_LOCK = threading.RLock()
+# 图片地址 -> OCR 识别文本, 多进程模式下会替换为共享字典
+_OCR_RESULT_CACHE: MutableMapping[str, str] = {}
+# 同一页面中多张题目图片并发下载/识别时的最大线程数
+_OCR_PREFETCH_WORKERS = 4
+# 章节列表页面每次交给增量解析器的字符数
+_COURSE_PAGE_SLICE = 16 * 1024
+_IMAGE_SESSION: Optional[requests.Session] = None
+_IMAGE_SESSION_LOCK = threading.Lock()
+
+
+def set_ocr_cache(cache: MutableMapping[str, str]) -> None:
+    """替换 OCR 结果缓存, 用于多进程模式下在进程间共享识别结果"""
+    global _OCR_RESULT_CACHE
+    _OCR_RESULT_CACHE = cache
 
 
 def _init_paddle_ocr(preferred_device: Optional[str] = None):
@@ -110,81 +122,6 @@ def _init_paddle_ocr(preferred_device: Optional[str] = None):
         return _PADDLE_OCR_ENGINE
 
 
-def _preprocess_image_for_ocr(image_bytes: bytes, enhance_mode: int = 0) -> bytes:
-    """预处理图片以提高 OCR 识别率。
-    
-    enhance_mode:
-        0 - 标准预处理：调整大小、增强对比度
-        1 - 高对比度模式：更强的对比度增强 + 锐化
-        2 - 二值化模式：转灰度后进行阈值处理
-    
-    返回处理后的 PNG 图片字节数据。
-    """
-    if not PIL_AVAILABLE:
-        return image_bytes
-    
-    try:
-        img = Image.open(io.BytesIO(image_bytes))
-        
-        # 转换为 RGB（处理 RGBA 或其他模式）
-        if img.mode in ('RGBA', 'LA', 'P'):
-            background = Image.new('RGB', img.size, (255, 255, 255))
-            if img.mode == 'P':
-                img = img.convert('RGBA')
-            background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
-            img = background
-        elif img.mode != 'RGB':
-            img = img.convert('RGB')
-        
-        # 如果图片太小，放大以提高识别率
-        min_dimension = 100
-        width, height = img.size
-        if width < min_dimension or height < min_dimension:
-            scale = max(min_dimension / width, min_dimension / height, 2.0)
-            new_size = (int(width * scale), int(height * scale))
-            img = img.resize(new_size, Image.Resampling.LANCZOS)
-        
-        # 如果图片太大，缩小以加快处理速度
-        max_dimension = 2000
-        width, height = img.size
-        if width > max_dimension or height > max_dimension:
-            scale = min(max_dimension / width, max_dimension / height)
-            new_size = (int(width * scale), int(height * scale))
-            img = img.resize(new_size, Image.Resampling.LANCZOS)
-        
-        if enhance_mode == 0:
-            # 标准模式：轻微增强对比度和锐度
-            enhancer = ImageEnhance.Contrast(img)
-            img = enhancer.enhance(1.3)
-            enhancer = ImageEnhance.Sharpness(img)
-            img = enhancer.enhance(1.2)
-        elif enhance_mode == 1:
-            # 高对比度模式
-            enhancer = ImageEnhance.Contrast(img)
-            img = enhancer.enhance(1.8)
-            enhancer = ImageEnhance.Sharpness(img)
-            img = enhancer.enhance(1.5)
-            # 轻微去噪
-            img = img.filter(ImageFilter.MedianFilter(size=3))
-        elif enhance_mode == 2:
-            # 二值化模式：转灰度，增强对比度，然后用阈值处理
-            img = img.convert('L')
-            enhancer = ImageEnhance.Contrast(img)
-            img = enhancer.enhance(2.0)
-            # 简单阈值二值化
-            threshold = 180
-            img = img.point(lambda p: 255 if p > threshold else 0)
-            img = img.convert('RGB')
-        
-        # 输出为 PNG
-        output = io.BytesIO()
-        img.save(output, format='PNG')
-        return output.getvalue()
-    except Exception as exc:
-        logger.debug(f"图片预处理失败: {exc}")
-        return image_bytes
-
-
 def _call_http_ocr(ocr_endpoint: str, image_bytes: bytes, img_url: str) -> str:
     """调用 HTTP OCR 服务"""
     try:
@@ -208,7 +145,119 @@ def _call_http_ocr(ocr_endpoint: str, image_bytes: bytes, img_url: str) -> str:
     return ""
 
 
+def _has_any_ocr() -> bool:
+    """是否配置了任意一种 OCR 方式"""
+    return bool(
+        is_vision_ocr_enabled()
+        or ENABLE_LOCAL_OCR
+        or os.environ.get("CHAOXING_OCR_ENDPOINT", "").strip()
+    )
+
+
+def _get_image_session() -> requests.Session:
+    """获取下载题目图片用的会话, 连接池在所有图片间复用"""
+    global _IMAGE_SESSION
+    with _IMAGE_SESSION_LOCK:
+        if _IMAGE_SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=_OCR_PREFETCH_WORKERS)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(gc.HEADERS)
+            _IMAGE_SESSION = session
+        return _IMAGE_SESSION
+
+
+def _download_image(img_url: str) -> Optional[bytes]:
+    """使用带登录 Cookie 的会话下载题目图片, 失败时返回 None"""
+    try:
+        session = _get_image_session()
+        # 每次下载前同步最新的 Cookie, 避免登录状态变化后 403
+        session.cookies.update(use_cookies())
+
+        # 对超星图片域名补充一个简单 Referer，进一步降低 403 概率
+        extra_headers = {}
+        if "p.ananas.chaoxing.com" in img_url:
+            extra_headers["Referer"] = "https://mooc1.chaoxing.com/"
+
+        resp = session.get(img_url, headers=extra_headers or None, timeout=8)
+        if resp.status_code != 200:
+            logger.debug(f"下载题目图片失败: {img_url} -> {resp.status_code}")
+            return None
+        return resp.content
+    except Exception as exc:
+        logger.debug(f"下载题目图片异常: {exc}")
+        return None
+
+
+def ocr_images_to_text(img_urls: Iterable[str]) -> Dict[str, str]:
+    """
+    并发识别一组题目图片, 返回 图片地址 -> 识别文本 (失败为空字符串)
+
+    - 已缓存的图片直接返回
+    - 配置了外部视觉 OCR 时, 先并发下载全部图片, 再交给视觉 OCR 客户端统一调度
+      (连接复用、并发限制、相同图片去重, 支持时合并为多图请求)
+    - 否则按图片并发执行 _ocr_image_to_text (本地 PaddleOCR 推理本身仍串行)
+    """
+    urls = list(dict.fromkeys(url for url in img_urls if url))
+    results: Dict[str, str] = {}
+    if not urls or not _has_any_ocr():
+        return {url: "" for url in urls}
+
+    pending = []
+    for url in urls:
+        cached = _OCR_RESULT_CACHE.get(url)
+        if cached:
+            results[url] = cached
+        else:
+            pending.append(url)
+    if not pending:
+        return results
+
+    workers = min(_OCR_PREFETCH_WORKERS, len(pending))
+    if not is_vision_ocr_enabled():
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results.update(zip(pending, executor.map(_ocr_image_to_text, pending)))
+        return results
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        downloaded = list(zip(pending, executor.map(_download_image, pending)))
+    ok = [(url, image_bytes) for url, image_bytes in downloaded if image_bytes is not None]
+    try:
+        texts = vision_ocr_many([image_bytes for _, image_bytes in ok])
+    except Exception as exc:
+        logger.debug(f"外部 AI 视觉 OCR 调用失败: {exc}")
+        texts = ["" for _ in ok]
+
+    ocr_endpoint = os.environ.get("CHAOXING_OCR_ENDPOINT", "").strip()
+    for (url, image_bytes), text in zip(ok, texts):
+        if text:
+            logger.debug(f"外部 AI 视觉 OCR 识别成功: {text[:100]}... 来自 {url}")
+        elif ocr_endpoint:
+            # 与 _run_ocr 一致: 外部 OCR 失败时仅回退到 HTTP OCR 服务
+            text = _call_http_ocr(ocr_endpoint, image_bytes, url)
+        if text:
+            _OCR_RESULT_CACHE[url] = text
+        results[url] = text
+    for url, image_bytes in downloaded:
+        results.setdefault(url, "")
+    return results
+
+
 def _ocr_image_to_text(img_url: str) -> str:
+    """带缓存的 OCR 入口, 同一图片地址只识别一次, 识别失败的结果不缓存"""
+    if not img_url:
+        return ""
+    cached = _OCR_RESULT_CACHE.get(img_url)
+    if cached:
+        return cached
+    text = _run_ocr(img_url)
+    if text:
+        _OCR_RESULT_CACHE[img_url] = text
+    return text
+
+
+def _run_ocr(img_url: str) -> str:
     """可选的 OCR 钩子：将题干中的图片转为接近 LaTeX 的文本。
 
     OCR 识别逻辑：
@@ -225,33 +274,12 @@ def _ocr_image_to_text(img_url: str) -> str:
     use_external_ocr = is_vision_ocr_enabled()
 
     # 检查是否有任何 OCR 方式可用
-    has_any_ocr = (
-        use_external_ocr
-        or ENABLE_LOCAL_OCR
-        or os.environ.get("CHAOXING_OCR_ENDPOINT", "").strip()
-    )
-    if not has_any_ocr:
+    if not _has_any_ocr():
         return ""
 
     # 下载图片
-    try:
-        # 使用带登录 Cookie 的会话下载图片，避免 403
-        session = requests.Session()
-        session.headers.update(gc.HEADERS)
-        session.cookies.update(use_cookies())
-
-        # 对超星图片域名补充一个简单 Referer，进一步降低 403 概率
-        extra_headers = {}
-        if "p.ananas.chaoxing.com" in img_url:
-            extra_headers["Referer"] = "https://mooc1.chaoxing.com/"
-
-        resp = session.get(img_url, headers=extra_headers or None, timeout=8)
-        if resp.status_code != 200:
-            logger.debug(f"下载题目图片失败: {img_url} -> {resp.status_code}")
-            return ""
-        image_bytes = resp.content
-    except Exception as exc:
-        logger.debug(f"下载题目图片异常: {exc}")
+    image_bytes = _download_image(img_url)
+    if image_bytes is None:
         return ""
 
     # 1) 若配置了外部 AI 视觉 OCR，优先使用，跳过本地 OCR
@@ -280,11 +308,6 @@ def _ocr_image_to_text(img_url: str) -> str:
     if engine is not None:
         tmp_path = None
         try:
-            # 尝试多种预处理模式，直到获得有效文本
-            # 模式 0: 标准预处理（对比度+锐化）
-            # 模式 1: 高对比度模式
-            # 模式 2: 二值化模式
-            preprocessing_modes = [0, 1, 2]
             
             def _parse_ocr_result(ocr_result) -> List[str]:
                 """解析 OCR 结果，返回识别的文本列表"""
@@ -316,26 +339,27 @@ def _ocr_image_to_text(img_url: str) -> str:
                         parsed_texts.append(result_str)
                 return parsed_texts
             
-            final_texts: List[str] = []
-            for preprocess_mode in preprocessing_modes:
-                # 预处理图片
-                processed_bytes = _preprocess_image_for_ocr(image_bytes, enhance_mode=preprocess_mode)
-                
-                # 写入临时文件
-                if tmp_path:
-                    try:
-                        os.remove(tmp_path)
-                    except OSError:
-                        pass
+            # 图片只解码一次，依次尝试多种预处理模式，直到获得有效文本
+            # 模式 0: 标准预处理（对比度+锐化）
+            # 模式 1: 高对比度模式
+            # 模式 2: 二值化模式
+            base_image = decode_image(image_bytes)
+            if base_image is not None:
+                ocr_inputs = iter_variants(base_image)
+            else:
+                # 无法解码为数组（缺少 numpy / PIL 或格式不支持）时，交给 PaddleOCR 直接读取原图
                 fd, tmp_path = tempfile.mkstemp(suffix=".png")
                 with os.fdopen(fd, "wb") as f:
-                    f.write(processed_bytes)
-                
+                    f.write(image_bytes)
+                ocr_inputs = iter([(0, tmp_path)])
+
+            final_texts: List[str] = []
+            for preprocess_mode, ocr_input in ocr_inputs:
                 # 执行 OCR
                 for device_attempt in range(2):
                     try:
                         with _PADDLE_OCR_LOCK:
-                            ocr_result = engine.ocr(tmp_path)
+                            ocr_result = engine.ocr(ocr_input)
                         final_texts = _parse_ocr_result(ocr_result)
                         break
                     except Exception as exc:
@@ -463,26 +487,60 @@ def decode_course_point(html_text: str) -> Dict[str, Any]:
     Returns:
         章节信息字典，包含是否锁定状态和章节点列表
     """
-    logger.trace("开始解码章节列表...")
-    soup = BeautifulSoup(html_text, "lxml")
     course_point = {
         "hasLocked": False,  # 用于判断该课程任务是否是需要解锁
         "points": [],
     }
 
-    for chapter_unit in soup.find_all("div", class_="chapter_unit"):
-        points = _extract_points_from_chapter(chapter_unit)
+    for point in iter_course_points(html_text):
         # 检查是否有锁定内容
-        for point in points:
-            if point.get("need_unlock", False):
-                course_point["hasLocked"] = True
-                
-        course_point["points"].extend(points)
+        if point.get("need_unlock", False):
+            course_point["hasLocked"] = True
+        course_point["points"].append(point)
     
     return course_point
 
 
-def _extract_points_from_chapter(chapter_unit) -> List[Dict[str, Any]]:
+def iter_course_points(html_text: str) -> Iterator[ChapterPoint]:
+    """
+    惰性解析章节列表页面，逐个产出章节点
+
+    页面按 _COURSE_PAGE_SLICE 分段交给 lxml 增量解析器, 每个 chapter_unit 的结束标签解析完成后
+    即产出其章节点, 并从解析树中清除该节点及之前已处理的兄弟节点;
+    解析树只保留当前尚未处理完的部分, 原始 HTML 字符串仍由调用方持有。
+
+    Args:
+        html_text: 章节列表页面的HTML内容
+
+    Yields:
+        章节点记录
+    """
+    logger.trace("开始解码章节列表...")
+    if not html_text.strip():
+        return
+    parser = etree.HTMLPullParser(events=("end",), tag="div")
+    for start in range(0, len(html_text), _COURSE_PAGE_SLICE):
+        parser.feed(html_text[start:start + _COURSE_PAGE_SLICE])
+        yield from _drain_chapter_units(parser)
+    parser.close()
+    yield from _drain_chapter_units(parser)
+
+
+def _drain_chapter_units(parser) -> Iterator[ChapterPoint]:
+    """取出解析器中已完整解析的 chapter_unit, 产出其章节点后释放对应的解析树节点"""
+    for _, element in parser.read_events():
+        if "chapter_unit" not in (element.get("class") or "").split():
+            continue
+        chapter_unit = BeautifulSoup(etree.tostring(element, encoding="unicode"), "lxml")
+        points = _extract_points_from_chapter(chapter_unit)
+        element.clear()
+        parent = element.getparent()
+        while parent is not None and element.getprevious() is not None:
+            del parent[0]
+        yield from points
+
+
+def _extract_points_from_chapter(chapter_unit) -> List[ChapterPoint]:
     """
     从章节单元中提取章节点信息
     
@@ -516,19 +574,19 @@ def _extract_points_from_chapter(chapter_unit) -> List[Dict[str, Any]]:
         if point.select_one("span.bntHoverTips") and "已完成" in point.select_one("span.bntHoverTips").text:
             is_finished = True
             
-        point_detail = {
-            "id": point_id,
-            "title": point_title,
-            "jobCount": job_count,
-            "has_finished": is_finished,
-            "need_unlock": need_unlock
-        }
+        point_detail = ChapterPoint(
+            id=point_id,
+            title=point_title,
+            jobCount=job_count,
+            has_finished=is_finished,
+            need_unlock=need_unlock,
+        )
         point_list.append(point_detail)
         
     return point_list
 
 
-def decode_course_card(html_text: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+def decode_course_card(html_text: str) -> Tuple[List[JobRecord], Dict[str, Any]]:
     """
     解析任务点列表页面，提取任务点信息
     
@@ -591,7 +649,7 @@ def _extract_job_info(cards_data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def _process_attachment_cards(cards: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def _process_attachment_cards(cards: List[Dict[str, Any]]) -> List[JobRecord]:
     """
     处理所有附件任务卡片，强化直播任务识别逻辑
     
@@ -667,91 +725,91 @@ def _process_attachment_cards(cards: List[Dict[str, Any]]) -> List[Dict[str, Any
     return job_list
 
 
-def _process_live_task(card: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+def _process_live_task(card: Dict[str, Any]) -> Optional[JobRecord]:
     """处理直播类型任务，提取所有必要参数"""
     try:
         property_data = card.get("property", {})
-        return {
-            "type": "live",
-            "jobid": card.get("jobid", str(card.get("id", ""))),  # 兼容不同格式的任务ID
-            "name": property_data.get("title", property_data.get("name", "未知直播")),
-            "otherinfo": card.get("otherInfo", ""),
-            "property": property_data,  # 保留完整属性用于后续处理
-            "mid": card.get("mid", ""),
-            "objectid": card.get("objectId", ""),
-            "aid": card.get("aid", ""),
+        return JobRecord(
+            type="live",
+            jobid=card.get("jobid", str(card.get("id", ""))),  # 兼容不同格式的任务ID
+            name=property_data.get("title", property_data.get("name", "未知直播")),
+            otherinfo=card.get("otherInfo", ""),
+            property=property_data,  # 保留完整属性用于后续处理
+            mid=card.get("mid", ""),
+            objectid=card.get("objectId", ""),
+            aid=card.get("aid", ""),
             # 补充直播特有标识
-            "liveId": property_data.get("liveId"),
-            "streamName": property_data.get("streamName")
-        }
+            liveId=property_data.get("liveId"),
+            streamName=property_data.get("streamName"),
+        )
     except Exception as e:
         logger.error(f"解析直播任务失败: {str(e)}, 任务数据: {str(card)[:200]}")
         return None
-def _process_read_task(card: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+def _process_read_task(card: Dict[str, Any]) -> Optional[JobRecord]:
     """处理阅读类型任务"""
     read_flag = _normalize_bool(card.get("property", {}).get("read", False))
     if not (card.get("type") == "read" and not read_flag):
         return None
         
-    return {
-        "title": card.get("property", {}).get("title", ""),
-        "type": "read",
-        "id": card.get("property", {}).get("id", ""),
-        "jobid": card.get("jobid", ""),
-        "jtoken": card.get("jtoken", ""),
-        "mid": card.get("mid", ""),
-        "otherinfo": card.get("otherInfo", ""),
-        "enc": card.get("enc", ""),
-        "aid": card.get("aid", "")
-    }
+    return JobRecord(
+        title=card.get("property", {}).get("title", ""),
+        type="read",
+        id=card.get("property", {}).get("id", ""),
+        jobid=card.get("jobid", ""),
+        jtoken=card.get("jtoken", ""),
+        mid=card.get("mid", ""),
+        otherinfo=card.get("otherInfo", ""),
+        enc=card.get("enc", ""),
+        aid=card.get("aid", ""),
+    )
 
 
-def _process_video_task(card: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+def _process_video_task(card: Dict[str, Any]) -> Optional[JobRecord]:
     """处理视频类型任务"""
     try:
-        return {
-            "type": "video",
-            "jobid": card.get("jobid", ""),
-            "name": card.get("property", {}).get("name", ""),
-            "otherinfo": card.get("otherInfo", ""),
-            "mid": card["mid"],  # 必须字段，如果不存在会抛出异常
-            "objectid": card.get("objectId", ""),
-            "aid": card.get("aid", ""),
-            "playTime": card.get("playTime", 0),
-            "rt": card.get("property", {}).get("rt", ""),
-            "attDuration": card.get("attDuration", ""),
-            "attDurationEnc": card.get("attDurationEnc", ""),
-            "videoFaceCaptureEnc": card.get("videoFaceCaptureEnc", ""),
-        }
+        return JobRecord(
+            type="video",
+            jobid=card.get("jobid", ""),
+            name=card.get("property", {}).get("name", ""),
+            otherinfo=card.get("otherInfo", ""),
+            mid=card["mid"],  # 必须字段，如果不存在会抛出异常
+            objectid=card.get("objectId", ""),
+            aid=card.get("aid", ""),
+            playTime=card.get("playTime", 0),
+            rt=card.get("property", {}).get("rt", ""),
+            attDuration=card.get("attDuration", ""),
+            attDurationEnc=card.get("attDurationEnc", ""),
+            videoFaceCaptureEnc=card.get("videoFaceCaptureEnc", ""),
+        )
     except KeyError:
         logger.warning("出现转码失败视频，已跳过...")
         return None
 
 
-def _process_document_task(card: Dict[str, Any]) -> Dict[str, Any]:
+def _process_document_task(card: Dict[str, Any]) -> JobRecord:
     """处理文档类型任务"""
-    return {
-        "type": "document",
-        "jobid": card.get("jobid", ""),
-        "otherinfo": card.get("otherInfo", ""),
-        "jtoken": card.get("jtoken", ""),
-        "mid": card.get("mid", ""),
-        "enc": card.get("enc", ""),
-        "aid": card.get("aid", ""),
-        "objectid": card.get("property", {}).get("objectid", "")
-    }
+    return JobRecord(
+        type="document",
+        jobid=card.get("jobid", ""),
+        otherinfo=card.get("otherInfo", ""),
+        jtoken=card.get("jtoken", ""),
+        mid=card.get("mid", ""),
+        enc=card.get("enc", ""),
+        aid=card.get("aid", ""),
+        objectid=card.get("property", {}).get("objectid", ""),
+    )
 
 
-def _process_work_task(card: Dict[str, Any]) -> Dict[str, Any]:
+def _process_work_task(card: Dict[str, Any]) -> JobRecord:
     """处理作业类型任务"""
-    return {
-        "type": "workid",
-        "jobid": card.get("jobid", ""),
-        "otherinfo": card.get("otherInfo", ""),
-        "mid": card.get("mid", ""),
-        "enc": card.get("enc", ""),
-        "aid": card.get("aid", "")
-    }
+    return JobRecord(
+        type="workid",
+        jobid=card.get("jobid", ""),
+        otherinfo=card.get("otherInfo", ""),
+        mid=card.get("mid", ""),
+        enc=card.get("enc", ""),
+        aid=card.get("aid", ""),
+    )
 
 
 def decode_questions_info(html_content: str) -> Dict[str, Any]:
@@ -778,8 +836,16 @@ def decode_questions_info(html_content: str) -> Dict[str, Any]:
     
     # 处理所有问题
     questions = []
-    for div_tag in soup.find("form").find_all("div", class_="singleQuesId"):
-        question = _process_question(div_tag, font_decoder)
+    question_divs = soup.find("form").find_all("div", class_="singleQuesId")
+    # 先并发识别全部题干图片, 解析题干时直接使用识别结果
+    ocr_results = ocr_images_to_text(
+        img.get("src", "")
+        for div_tag in question_divs
+        for title_div in div_tag.find_all("div", class_="Zy_TItle")
+        for img in title_div.find_all("img")
+    )
+    for div_tag in question_divs:
+        question = _process_question(div_tag, font_decoder, ocr_results)
         if question:
             questions.append(question)
     
@@ -807,7 +873,7 @@ def _extract_form_data(soup: BeautifulSoup) -> Dict[str, Any]:
     return form_data
 
 
-def _process_question(div_tag, font_decoder=None) -> Dict[str, Any]:
+def _process_question(div_tag, font_decoder=None, ocr_results: Optional[Dict[str, str]] = None) -> QuestionRecord:
     """处理单个问题"""
     # 提取问题ID和题目类型
     question_id = div_tag.attrs.get("data", "")
@@ -819,7 +885,7 @@ def _process_question(div_tag, font_decoder=None) -> Dict[str, Any]:
     options_list = div_tag.find("ul").find_all("li") if div_tag.find("ul") else []
     
     # 解析题目和选项
-    q_title = _extract_title(title_div, font_decoder)
+    q_title = _extract_title(title_div, font_decoder, ocr_results)
     q_options = []
     for li in options_list:
         q_options.append(_extract_choices(li, font_decoder))
@@ -846,13 +912,13 @@ def _process_question(div_tag, font_decoder=None) -> Dict[str, Any]:
         if name not in answer_field:
             answer_field[name] = input_tag.attrs.get("value", "")
 
-    return {
-        "id": question_id,
-        "title": q_title,
-        "options": q_options,
-        "type": q_type,
-        "answerField": answer_field,
-    }
+    return QuestionRecord(
+        id=question_id,
+        title=q_title,
+        options=q_options,
+        type=q_type,
+        answerField=answer_field,
+    )
 
 
 def _get_question_type(type_code: str) -> str:
@@ -872,8 +938,8 @@ def _get_question_type(type_code: str) -> str:
     return "unknown"
 
 
-def _extract_title(element, font_decoder=None) -> str:
-    """提取标题内容，支持解码加密字体"""
+def _extract_title(element, font_decoder=None, ocr_results: Optional[Dict[str, str]] = None) -> str:
+    """提取标题内容，支持解码加密字体；ocr_results 为预先识别好的图片文本"""
     if not element:
         return ""
         
@@ -885,7 +951,10 @@ def _extract_title(element, font_decoder=None) -> str:
         elif item.name == "img":
             img_url = item.get("src", "")
             # 如果启用了本地 OCR，则尝试将图片转换为接近 LaTeX 的文本表达
-            ocr_text = _ocr_image_to_text(img_url)
+            if ocr_results is not None and img_url in ocr_results:
+                ocr_text = ocr_results[img_url]
+            else:
+                ocr_text = _ocr_image_to_text(img_url)
             if ocr_text:
                 content.append(f"[公式: {ocr_text}]")
             else:
@@ -1,17 +1,134 @@
 """
 通知服务模块，用于向外部服务发送通知消息。
 支持多种通知服务，如ServerChan、Qmsg和Bark。
+
+消息默认交由后台分发线程异步发送：短时间内的多条消息会合并为一条摘要，
+发送失败按指数退避重试，程序退出时会将队列中剩余的消息一并发出。
 """
 
+import atexit
 import configparser
+import queue
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from api.logger import logger
 
 
+_STOP = object()  # 分发线程退出标记
+
+
+class NotificationDispatcher:
+    """
+    后台通知分发器
+
+    - 有界队列: 队列满时丢弃新消息并记录警告, 不阻塞调用方
+    - 消息合并: 首条消息到达后等待 coalesce_window 秒, 期间到达的消息合并为一条摘要
+    - 退避重试: 发送失败时按 retry_delay * 2^n 秒退避重试
+    - 退出刷新: close() 会立即发送队列中剩余的消息后再结束线程
+    """
+
+    def __init__(
+        self,
+        send_func: Callable[[str], bool],
+        name: str = "Notification",
+        coalesce_window: float = 3.0,
+        queue_size: int = 100,
+        max_retries: int = 3,
+        retry_delay: float = 2.0,
+    ):
+        self._send_func = send_func
+        self.name = name
+        self.coalesce_window = max(0.0, coalesce_window)
+        self.max_retries = max(1, max_retries)
+        self.retry_delay = max(0.0, retry_delay)
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=f"{name}-dispatcher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, message: str) -> bool:
+        """
+        将消息放入发送队列, 立即返回
+
+        Returns:
+            成功入队返回True, 队列已满或分发器已关闭返回False
+        """
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait(message)
+            return True
+        except queue.Full:
+            logger.warning(f"{self.name}通知队列已满, 已丢弃消息: {message[:50]}")
+            return False
+
+    def close(self, timeout: float = 10.0) -> None:
+        """停止接收新消息, 发送队列中剩余的消息并等待分发线程结束"""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning(f"{self.name}通知队列无法在 {timeout} 秒内清空, 剩余消息将被丢弃")
+            return
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            batch = [first]
+            stopping = False
+            deadline = time.monotonic() + self.coalesce_window
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    # 关闭后不再等待合并窗口, 直接取出队列中剩余的消息
+                    item = self._queue.get(timeout=remaining) if remaining > 0 and not stopping \
+                        else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    continue
+                batch.append(item)
+
+            self._deliver(self._digest(batch), fast=stopping)
+            if stopping:
+                return
+
+    @staticmethod
+    def _digest(batch: List[str]) -> str:
+        if len(batch) == 1:
+            return batch[0]
+        parts = [f"[{i}] {message}" for i, message in enumerate(batch, start=1)]
+        return f"共 {len(batch)} 条通知:\n\n" + "\n\n".join(parts)
+
+    def _deliver(self, message: str, fast: bool = False) -> None:
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                if self._send_func(message):
+                    return
+            except Exception as e:
+                logger.error(f"{self.name}通知发送异常: {e}")
+            if attempt < self.max_retries:
+                delay = self.retry_delay * (2 ** (attempt - 1))
+                # 退出刷新时缩短退避时间, 避免拖慢程序退出
+                time.sleep(min(delay, 1.0) if fast else delay)
+        logger.error(f"{self.name}通知连续发送失败 {self.max_retries} 次, 已放弃")
+
+
 class NotificationService(ABC):
     """
     通知服务基类，定义通知服务的公共接口和实现。
@@ -19,6 +136,7 @@ class NotificationService(ABC):
     """
 
     CONFIG_PATH = "config.ini"
+    TIMEOUT = 10  # 单次推送请求超时时间(秒)
 
     def __init__(self):
         """初始化通知服务"""
@@ -27,6 +145,8 @@ class NotificationService(ABC):
         self.tg_chat_id = ""
         self._conf = None
         self.disabled = False
+        self._session: Optional[requests.Session] = None
+        self._dispatcher: Optional[NotificationDispatcher] = None
 
     def config_set(self, config: Dict[str, str]) -> None:
         """
@@ -61,6 +181,43 @@ class NotificationService(ABC):
         if not self.disabled and self._conf:
             self._init_service()
 
+        if not self.disabled and self._conf:
+            self._init_dispatcher()
+
+    def _conf_value(self, key: str, default, cast):
+        """读取数值型配置, 缺省或格式错误时使用默认值"""
+        try:
+            return cast(self._conf.get(key, default))
+        except (TypeError, ValueError):
+            return default
+
+    def _init_dispatcher(self) -> None:
+        """创建连接池会话, 并根据配置启动后台分发线程"""
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        async_send = str(self._conf.get('async_send', 'true')).strip().lower()
+        if async_send in {'0', 'false', 'no', 'off', 'n'}:
+            return
+
+        self._dispatcher = NotificationDispatcher(
+            self._send,
+            name=self.name,
+            coalesce_window=self._conf_value('coalesce_window', 3.0, float),
+            queue_size=self._conf_value('queue_size', 100, int),
+            max_retries=self._conf_value('max_retries', 3, int),
+            retry_delay=self._conf_value('retry_delay', 2.0, float),
+        )
+
+    def _post(self, *args, **kwargs) -> requests.Response:
+        """使用连接池会话发送POST请求, 未初始化会话时退化为requests.post"""
+        kwargs.setdefault('timeout', self.TIMEOUT)
+        if self._session is None:
+            return requests.post(*args, **kwargs)
+        return self._session.post(*args, **kwargs)
+
     @abstractmethod
     def _init_service(self) -> None:
         """
@@ -69,25 +226,46 @@ class NotificationService(ABC):
         pass
 
     @abstractmethod
-    def _send(self, message: str) -> None:
+    def _send(self, message: str) -> bool:
         """
         发送通知消息，由子类实现
         
         Args:
             message: 要发送的消息内容
+
+        Returns:
+            发送成功返回True, 失败返回False(由分发器决定是否重试)
         """
         pass
 
     def send(self, message: str) -> None:
         """
-        发送通知消息的公共接口
+        发送通知消息的公共接口, 启用后台分发时仅入队, 不阻塞调用方
         
         Args:
             message: 要发送的消息内容
         """
-        if not self.disabled:
+        if self.disabled:
+            return
+        if self._dispatcher is not None:
+            self._dispatcher.submit(message)
+        else:
             self._send(message)
 
+    def close(self, timeout: float = 10.0) -> None:
+        """
+        发送队列中剩余的消息并停止后台分发线程
+        
+        Args:
+            timeout: 等待发送完成的最长时间(秒)
+        """
+        if self._dispatcher is not None:
+            self._dispatcher.close(timeout)
+            self._dispatcher = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
 
 class NotificationFactory:
     """
@@ -125,8 +303,8 @@ class DefaultNotification(NotificationService):
     def _init_service(self) -> None:
         pass
 
-    def _send(self, message: str) -> None:
-        pass
+    def _send(self, message: str) -> bool:
+        return True
 
     def get_notification_from_config(self) -> NotificationService:
         """
@@ -179,7 +357,7 @@ class ServerChan(NotificationService):
         self.url = self._conf['url']
         logger.info(f"已初始化Server酱通知服务，URL: {self.url}")
 
-    def _send(self, message: str) -> None:
+    def _send(self, message: str) -> bool:
         """
         通过Server酱发送通知
         
@@ -195,14 +373,18 @@ class ServerChan(NotificationService):
         }
 
         try:
-            response = requests.post(self.url, json=params, headers=headers)
+            response = self._post(self.url, json=params, headers=headers)
             response.raise_for_status()
             result = response.json()
             logger.info(f"Server酱通知发送成功: {result}")
+            return True
         except requests.RequestException as e:
             logger.error(f"Server酱通知发送失败: {e}")
+            return False
         except ValueError as e:
+            # 请求已送达, 仅响应解析失败, 不再重试
             logger.error(f"Server酱返回数据解析失败: {e}")
+            return True
 
 
 class Qmsg(NotificationService):
@@ -220,7 +402,7 @@ class Qmsg(NotificationService):
         self.url = self._conf['url']
         logger.info(f"已初始化Qmsg酱通知服务，URL: {self.url}")
 
-    def _send(self, message: str) -> None:
+    def _send(self, message: str) -> bool:
         """
         通过Qmsg酱发送通知
         
@@ -231,14 +413,18 @@ class Qmsg(NotificationService):
         headers = {'Content-Type': 'application/json;charset=utf-8'}
 
         try:
-            response = requests.post(self.url, params=params, headers=headers)
+            response = self._post(self.url, params=params, headers=headers)
             response.raise_for_status()
             result = response.json()
             logger.info(f"Qmsg酱通知发送成功: {result}")
+            return True
         except requests.RequestException as e:
             logger.error(f"Qmsg酱通知发送失败: {e}")
+            return False
         except ValueError as e:
+            # 请求已送达, 仅响应解析失败, 不再重试
             logger.error(f"Qmsg酱返回数据解析失败: {e}")
+            return True
 
 
 class Bark(NotificationService):
@@ -256,7 +442,7 @@ class Bark(NotificationService):
         self.url = self._conf['url']
         logger.info(f"已初始化Bark通知服务，URL: {self.url}")
 
-    def _send(self, message: str) -> None:
+    def _send(self, message: str) -> bool:
         """
         通过Bark发送通知
         
@@ -266,14 +452,18 @@ class Bark(NotificationService):
         params = {'body': message}
 
         try:
-            response = requests.post(self.url, params=params)
+            response = self._post(self.url, params=params)
             response.raise_for_status()
             result = response.json()
             logger.info(f"Bark通知发送成功: {result}")
+            return True
         except requests.RequestException as e:
             logger.error(f"Bark通知发送失败: {e}")
+            return False
         except ValueError as e:
+            # 请求已送达, 仅响应解析失败, 不再重试
             logger.error(f"Bark返回数据解析失败: {e}")
+            return True
 
 class Telegram(NotificationService):
     """
@@ -290,7 +480,7 @@ class Telegram(NotificationService):
         self.url = self._conf['url']
         logger.info(f"已初始化Telegram通知服务，Chat_id: {self.tg_chat_id} URL: {self.url}")
 
-    def _send(self, message: str) -> None:
+    def _send(self, message: str) -> bool:
         """
         通过Telegram发送通知
         
@@ -304,17 +494,21 @@ class Telegram(NotificationService):
         }
 
         try:
-            response = requests.post(self.url, data=params)
+            response = self._post(self.url, data=params)
             response.raise_for_status()
             result = response.json()
             if result.get('ok'):
                 logger.info(f"Telegram通知发送成功: {result}")
-            else:
-                logger.error(f"Telegram通知发送失败: {result}")
+                return True
+            logger.error(f"Telegram通知发送失败: {result}")
+            return False
         except requests.RequestException as e:
             logger.error(f"Telegram通知发送失败: {e}")
+            return False
         except ValueError as e:
+            # 请求已送达, 仅响应解析失败, 不再重试
             logger.error(f"Telegram返回数据解析失败: {e}")
+            return True
 
 # 为了向后兼容，保留原来的Notification类
 Notification = DefaultNotification
\ No newline at end of file
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+OCR 图片预处理模块: 题目图片只解码一次, 各增强模式在 NumPy 数组上向量化计算,
+结果以 BGR 数组直接交给 PaddleOCR, 不再经过 PNG 编码与临时文件。
+
+增强模式:
+    0 - 标准预处理：轻微增强对比度和锐度 (与原 PIL 实现一致)
+    1 - 高对比度模式：更强的对比度与锐度 + 3x3 中值滤波去噪 (与原 PIL 实现一致)
+    2 - 二值化模式：转灰度、增强对比度后按 Otsu 阈值二值化 (原实现为固定阈值 180)
+"""
+import io
+from typing import Iterator, Optional, Tuple
+
+try:
+    import numpy as np
+    from PIL import Image
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# 小于该尺寸的图片会先放大, 提高识别率
+MIN_DIMENSION = 100
+# 大于该尺寸的图片会先缩小, 加快处理速度
+MAX_DIMENSION = 2000
+# 与 PIL "L" 模式一致的灰度系数
+_GRAY_WEIGHTS = (0.299, 0.587, 0.114)
+# PIL ImageFilter.SMOOTH 的卷积核为 ((1, 1, 1), (1, 5, 1), (1, 1, 1)) / 13,
+# ImageEnhance.Sharpness 以其结果作为退化图像
+_SMOOTH_SCALE = 13.0
+
+PREPROCESSING_MODES = (0, 1, 2)
+
+
+def decode_image(image_bytes: bytes) -> Optional["np.ndarray"]:
+    """
+    解码图片为 RGB uint8 数组 (H, W, 3), 透明背景填充为白色, 过小的图片放大, 过大的图片缩小
+
+    解码失败或缺少 numpy / PIL 时返回 None
+    """
+    if not NUMPY_AVAILABLE:
+        return None
+    try:
+        img = Image.open(io.BytesIO(image_bytes))
+        if img.mode == "P":
+            img = img.convert("RGBA")
+        if img.mode in ("RGBA", "LA"):
+            background = Image.new("RGB", img.size, (255, 255, 255))
+            background.paste(img, mask=img.split()[-1])
+            img = background
+        elif img.mode != "RGB":
+            img = img.convert("RGB")
+
+        width, height = img.size
+        if width < MIN_DIMENSION or height < MIN_DIMENSION:
+            scale = max(MIN_DIMENSION / width, MIN_DIMENSION / height, 2.0)
+            img = img.resize((int(width * scale), int(height * scale)), Image.Resampling.LANCZOS)
+
+        width, height = img.size
+        if width > MAX_DIMENSION or height > MAX_DIMENSION:
+            scale = min(MAX_DIMENSION / width, MAX_DIMENSION / height)
+            img = img.resize((int(width * scale), int(height * scale)), Image.Resampling.LANCZOS)
+        return np.asarray(img, dtype=np.uint8)
+    except Exception:
+        return None
+
+
+def to_gray(rgb: "np.ndarray") -> "np.ndarray":
+    """RGB 转灰度 (float32)"""
+    return rgb.astype(np.float32) @ np.asarray(_GRAY_WEIGHTS, dtype=np.float32)
+
+
+def adjust_contrast(img: "np.ndarray", factor: float) -> "np.ndarray":
+    """与 ImageEnhance.Contrast 相同: 以灰度均值为基准线性拉伸, 与 Image.blend 一样向下取整"""
+    gray = img if img.ndim == 2 else to_gray(img)
+    mean = float(int(gray.mean() + 0.5))
+    return np.clip(np.floor(mean + factor * (img.astype(np.float32) - mean)), 0, 255)
+
+
+def _pad_edges(img: "np.ndarray") -> "np.ndarray":
+    pad = ((1, 1), (1, 1)) + ((0, 0),) * (img.ndim - 2)
+    return np.pad(img, pad, mode="edge")
+
+
+def _neighbourhood(img: "np.ndarray"):
+    """依次返回 3x3 邻域内 9 个偏移位置的视图 (行偏移, 列偏移, 视图), 按行优先顺序"""
+    padded = _pad_edges(img)
+    h, w = img.shape[:2]
+    for dy in range(3):
+        for dx in range(3):
+            yield dy, dx, padded[dy:dy + h, dx:dx + w]
+
+
+def adjust_sharpness(img: "np.ndarray", factor: float) -> "np.ndarray":
+    """与 ImageEnhance.Sharpness 相同: 在 SMOOTH 平滑结果与原图之间插值 (factor > 1 即反锐化掩模)"""
+    img = img.astype(np.float32)
+    # SMOOTH 卷积核为 3x3 全 1 再给中心加 4, 先按行后按列求 3x3 邻域和
+    padded = _pad_edges(img)
+    rows = padded[:-2] + padded[1:-1] + padded[2:]
+    box = rows[:, :-2] + rows[:, 1:-1] + rows[:, 2:]
+    smooth = np.floor((box + 4.0 * img) / _SMOOTH_SCALE + 0.5)
+    # PIL 的 3x3 卷积不处理最外圈像素, 原样保留
+    smooth[[0, -1]] = img[[0, -1]]
+    smooth[:, [0, -1]] = img[:, [0, -1]]
+    return np.clip(np.floor(smooth + factor * (img - smooth)), 0, 255)
+
+
+# 9 个元素求中值的比较交换网络 (19 次比较), 结果位于下标 4
+_MEDIAN9_NETWORK = (
+    (1, 2), (4, 5), (7, 8), (0, 1), (3, 4), (6, 7), (1, 2), (4, 5), (7, 8), (0, 3),
+    (5, 8), (4, 7), (3, 6), (1, 4), (2, 5), (4, 7), (4, 2), (6, 4), (4, 2),
+)
+
+
+def median3(img: "np.ndarray") -> "np.ndarray":
+    """3x3 中值滤波, 通过逐元素 min/max 组成的排序网络向量化计算"""
+    p = [view for _, _, view in _neighbourhood(img)]
+    for a, b in _MEDIAN9_NETWORK:
+        p[a], p[b] = np.minimum(p[a], p[b]), np.maximum(p[a], p[b])
+    return p[4]
+
+
+def otsu_threshold(gray: "np.ndarray") -> int:
+    """Otsu 阈值: 使前景/背景类间方差最大的灰度值"""
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256, dtype=np.float64)
+    weight_bg = np.cumsum(hist)
+    weight_fg = weight_bg[-1] - weight_bg
+    cum_mean = np.cumsum(hist * levels)
+    total_mean = cum_mean[-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_bg = cum_mean / weight_bg
+        mean_fg = (total_mean - cum_mean) / weight_fg
+        between = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+    between = np.nan_to_num(between, nan=0.0, posinf=0.0)
+    return int(np.argmax(between))
+
+
+def _to_bgr(rgb: "np.ndarray") -> "np.ndarray":
+    """PaddleOCR 按 OpenCV 约定接收 BGR 数组"""
+    return np.ascontiguousarray(rgb.astype(np.uint8)[..., ::-1])
+
+
+def enhance(base: "np.ndarray", enhance_mode: int) -> "np.ndarray":
+    """按增强模式处理解码后的 RGB 数组, 返回 BGR uint8 数组"""
+    if enhance_mode == 0:
+        img = adjust_sharpness(adjust_contrast(base, 1.3), 1.2)
+    elif enhance_mode == 1:
+        img = adjust_sharpness(adjust_contrast(base, 1.8), 1.5)
+        img = median3(img.astype(np.uint8))
+    elif enhance_mode == 2:
+        gray = np.round(to_gray(base))
+        gray = adjust_contrast(gray, 2.0).astype(np.uint8)
+        binary = np.where(gray > otsu_threshold(gray), 255, 0).astype(np.uint8)
+        img = np.repeat(binary[..., None], 3, axis=2)
+    else:
+        img = base
+    return _to_bgr(np.round(img))
+
+
+def iter_variants(base: "np.ndarray", modes=PREPROCESSING_MODES) -> Iterator[Tuple[int, "np.ndarray"]]:
+    """按顺序惰性生成各增强模式的结果, 前一模式识别成功时后续模式不会计算"""
+    for mode in modes:
+        yield mode, enhance(base, mode)
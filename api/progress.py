@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+进度事件总线
+
+学习流程(视频任务、章节处理)只负责发布类型化的进度事件, 命令行进度条与 Web 任务状态作为订阅者各自消费。
+每个订阅者可以设置最大刷新频率: 限频订阅者的事件先放入待发送缓冲区, 同一任务的进度事件、
+同一任务的开始/结束事件与同一章节的开始/完成事件各只保留最新一条, 缓冲区大小不超过涉及的任务与章节数,
+由订阅者自己的后台线程按频率批量投递, 发布方在热循环中的开销与订阅者的处理速度无关。
+"""
+import itertools
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+from tqdm import tqdm
+
+from api.logger import logger
+
+
+@dataclass(frozen=True)
+class JobStarted:
+    """音视频任务开始, position / duration 单位为秒"""
+    course: dict
+    job: dict
+    position: float
+    duration: float
+
+
+@dataclass(frozen=True)
+class JobProgress:
+    """音视频任务播放进度"""
+    course: dict
+    job: dict
+    position: float
+    duration: float
+
+
+@dataclass(frozen=True)
+class JobFinished:
+    """音视频任务结束(成功或失败)"""
+    course: dict
+    job: dict
+    success: bool
+
+
+@dataclass(frozen=True)
+class ChapterStarted:
+    """开始处理章节"""
+    course: dict
+    point: dict
+
+
+@dataclass(frozen=True)
+class ChapterDone:
+    """章节所有任务点均已完成"""
+    course: dict
+    point: dict
+
+
+ProgressEvent = JobStarted | JobProgress | JobFinished | ChapterStarted | ChapterDone
+
+_unique_keys = itertools.count()
+
+
+def _coalesce_key(event: ProgressEvent) -> Hashable:
+    """
+    合并键相同的事件只投递最新一条: 同一任务的进度事件、同一任务的开始/结束事件、同一章节的开始/完成事件,
+    这样订阅者处理阻塞时缓冲区也不会无限增长
+    """
+    if isinstance(event, JobProgress):
+        return "progress", event.job.get("jobid")
+    if isinstance(event, (JobStarted, JobFinished)):
+        return "job", event.job.get("jobid")
+    if isinstance(event, (ChapterStarted, ChapterDone)):
+        return "chapter", event.course.get("courseId"), event.point.get("id")
+    return next(_unique_keys)
+
+
+class Subscription:
+    """
+    订阅者
+
+    max_rate 为空时在发布线程中同步调用 handler;
+    否则事件进入缓冲区, 由后台线程每 1/max_rate 秒投递一次
+    """
+
+    def __init__(self, handler: Callable[[ProgressEvent], Any], max_rate: Optional[float] = None, name: str = ""):
+        self.handler = handler
+        self.name = name or getattr(handler, "__name__", type(handler).__name__)
+        self.interval = 1.0 / max_rate if max_rate else 0.0
+        self._pending: "OrderedDict[Hashable, ProgressEvent]" = OrderedDict()
+        self._lock = threading.Lock()
+        # 保证同一订阅者的 handler 不会被后台线程与 flush() 并发调用
+        self._deliver_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if self.interval:
+            self._thread = threading.Thread(target=self._run, name=f"progress-{self.name}", daemon=True)
+            self._thread.start()
+
+    def offer(self, event: ProgressEvent) -> None:
+        if not self.interval:
+            self._deliver(event)
+            return
+        key = _coalesce_key(event)
+        with self._lock:
+            # 同一任务只保留最新的进度事件, 并按最新事件的发布顺序投递
+            self._pending.pop(key, None)
+            self._pending[key] = event
+
+    def _deliver(self, event: ProgressEvent) -> None:
+        try:
+            self.handler(event)
+        except Exception as e:
+            logger.debug(f"进度订阅者 {self.name} 处理事件失败: {e}")
+
+    def flush(self) -> None:
+        with self._deliver_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                events = list(self._pending.values())
+                self._pending.clear()
+            for event in events:
+                self._deliver(event)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.flush()
+
+    def close(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        self.flush()
+
+
+class ProgressBus:
+    """进度事件总线, 线程安全"""
+
+    def __init__(self):
+        self._subscriptions: list[Subscription] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, handler: Callable[[ProgressEvent], Any], max_rate: Optional[float] = None,
+                  name: str = "") -> Subscription:
+        subscription = Subscription(handler, max_rate, name)
+        with self._lock:
+            self._subscriptions = self._subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+        subscription.close()
+
+    def publish(self, event: ProgressEvent) -> None:
+        # 订阅列表整体替换而非原地修改, 发布时无需加锁
+        for subscription in self._subscriptions:
+            subscription.offer(event)
+
+    def flush(self) -> None:
+        """立即投递所有限频订阅者缓冲区中的事件"""
+        for subscription in self._subscriptions:
+            subscription.flush()
+
+    def close(self) -> None:
+        """停止所有限频订阅者的后台线程, 并投递缓冲区中剩余的事件"""
+        with self._lock:
+            subscriptions, self._subscriptions = self._subscriptions, []
+        for subscription in subscriptions:
+            subscription.close()
+
+
+def format_time(seconds: float) -> str:
+    """秒数格式化为 mm:ss 或 hh:mm:ss"""
+    total_time = round(seconds)
+    sec = total_time % 60
+    mins = (total_time % 3600) // 60
+    hrs = total_time // 3600
+
+    if hrs > 0:
+        return f"{hrs:02d}:{mins:02d}:{sec:02d}"
+
+    return f"{mins:02d}:{sec:02d}"
+
+
+class _PlaybackBar(tqdm):
+    """以 mm:ss 显示播放进度的进度条, 通过 format_dict 提供额外的格式字段, 无需修改全局的 tqdm.format_sizeof"""
+
+    @property
+    def format_dict(self):
+        d = super().format_dict
+        d["played"] = format_time(self.n)
+        d["length"] = format_time(self.total or 0)
+        return d
+
+
+class TqdmRenderer:
+    """命令行进度条订阅者: 每个音视频任务一个进度条"""
+
+    BAR_FORMAT = "{l_bar}{bar}| {played}/{length}"
+
+    def __init__(self):
+        self._bars: dict[Any, tqdm] = {}
+
+    def __call__(self, event: ProgressEvent) -> None:
+        if isinstance(event, (JobStarted, JobProgress)):
+            bar = self._bars.get(event.job.get("jobid"))
+            if bar is None:
+                bar = _PlaybackBar(total=int(event.duration), desc=event.job.get("name", ""),
+                                   bar_format=self.BAR_FORMAT)
+                self._bars[event.job.get("jobid")] = bar
+            bar.n = int(event.position)
+            bar.refresh()
+        elif isinstance(event, JobFinished):
+            bar = self._bars.pop(event.job.get("jobid"), None)
+            if bar is not None:
+                bar.close()
+
+    def close(self) -> None:
+        for bar in self._bars.values():
+            bar.close()
+        self._bars.clear()
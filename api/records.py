@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+章节、任务点、题目的紧凑记录类型
+
+解码器原先为每个章节/任务点/题目创建一个 dict, 大课程下这些 dict 的哈希表开销随课程规模增长。
+这里的记录类型使用 __slots__ 存储字段, 同时实现 MutableMapping 接口,
+现有代码中的 record["title"]、record.get("has_finished")、dict(record) 等写法无需修改。
+未赋值的字段视为不存在, 与 dict 缺少对应键的行为一致。
+"""
+from collections.abc import MutableMapping
+from typing import Any, Iterator
+
+
+class SlotRecord(MutableMapping):
+    """以 __slots__ 为字段的映射, 只能读写 __slots__ 中声明的键"""
+
+    __slots__ = ()
+
+    def __init__(self, **fields: Any):
+        for key, value in fields.items():
+            self[key] = value
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        try:
+            setattr(self, key, value)
+        except (AttributeError, TypeError):
+            raise KeyError(f"{type(self).__name__} 不支持字段 {key}") from None
+
+    def __delitem__(self, key: str) -> None:
+        try:
+            delattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        for cls in type(self).__mro__:
+            for key in cls.__dict__.get("__slots__", ()):
+                if hasattr(self, key):
+                    yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def to_dict(self) -> dict[str, Any]:
+        return dict(self)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # 多进程模式下记录需要经 Manager 队列传递
+        return dict(self)
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for key, value in state.items():
+            setattr(self, key, value)
+
+
+class ChapterPoint(SlotRecord):
+    """章节(decode_course_point 的解析结果), status 供 Web 端记录章节处理状态"""
+
+    __slots__ = ("id", "title", "jobCount", "has_finished", "need_unlock", "status")
+
+
+class JobRecord(SlotRecord):
+    """任务点, 各任务类型只填写用到的字段"""
+
+    __slots__ = (
+        "type", "jobid", "name", "title", "id", "otherinfo", "mid", "objectid", "aid", "enc", "jtoken",
+        "playTime", "rt", "attDuration", "attDurationEnc", "videoFaceCaptureEnc",
+        "property", "liveId", "streamName",
+    )
+
+
+class QuestionRecord(SlotRecord):
+    """测验题目, answer_source 记录答案来源(cover 题库命中 / random 随机作答)"""
+
+    __slots__ = ("id", "title", "options", "type", "answerField", "answer_source")
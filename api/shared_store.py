@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+多进程共享存储模块
+
+协调进程通过 multiprocessing.Manager 创建 SharedStore, 以代理对象的形式传给各工作进程,
+用于在进程之间共享答案缓存、OCR 缓存、接口限速状态, 并把进度事件回报给协调进程。
+"""
+import random
+import time
+from typing import Any
+
+from api.logger import logger
+
+
+class SharedStore:
+    """
+    跨进程共享的状态集合, 所有成员均为 Manager 代理对象, 可直接作为 Process 参数传递
+
+    - answers: 答案缓存 (题目 -> 答案)
+    - ocr: OCR 结果缓存 (图片地址 -> 识别文本)
+    - rate_state / rate_lock: 各限速器最近一次调用的时间
+    - events: 工作进程上报给协调进程的进度事件队列
+    """
+
+    def __init__(self, manager):
+        self.answers = manager.dict()
+        self.ocr = manager.dict()
+        self.rate_state = manager.dict()
+        self.rate_lock = manager.Lock()
+        self.events = manager.Queue()
+
+    def attach(self) -> None:
+        """在工作进程中调用, 将本进程的答案缓存与 OCR 缓存切换为共享存储"""
+        from api.answer import CacheDAO
+        from api.decode import set_ocr_cache
+
+        CacheDAO.attach_shared(self.answers)
+        set_ocr_cache(self.ocr)
+
+    def publish(self, kind: str, *args: Any) -> None:
+        """上报进度事件, 失败时仅记录日志, 不影响学习流程"""
+        try:
+            self.events.put((kind, args))
+        except Exception as e:
+            logger.debug(f"上报进度事件失败: {kind} {e}")
+
+
+class SharedRateLimiter:
+    """
+    跨进程共享的限速器, 接口与 api.base.RateLimiter 一致
+
+    同一 key 的所有限速器共用一个调用时间, 保证多个工作进程合计的请求频率不超过限制
+    """
+
+    def __init__(self, store: SharedStore, key: str, call_interval: float):
+        self._store = store
+        self.key = key
+        self.call_interval = call_interval
+
+    def limit_rate(self, random_time=False, random_min=0.0, random_max=1.0):
+        with self._store.rate_lock:
+            if random_time:
+                time.sleep(random.uniform(random_min, random_max))
+            now = time.time()
+            time_elapsed = now - self._store.rate_state.get(self.key, 0.0)
+            if time_elapsed <= self.call_interval:
+                time.sleep(self.call_interval - time_elapsed)
+                now = time.time()
+            self._store.rate_state[self.key] = now
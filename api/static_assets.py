@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Web 前端静态资源服务
+
+启动时把 web/dist 中的构建产物一次性读入内存, 为可压缩的文件预先生成 gzip / brotli 版本,
+请求时按 Accept-Encoding 直接返回对应字节, 不再访问文件系统。
+文件名带内容哈希的构建资源(assets/index-3f9a1c2b.js)使用一年的 immutable 缓存,
+index.html 等入口文件每次通过 ETag 协商缓存。
+
+同时提供 API 响应压缩: 超过阈值的 JSON 响应按客户端支持的编码压缩后返回。
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+from flask import Request, Response
+
+from api.logger import logger
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Vite 构建产物文件名中的内容哈希, 例如 index-BvRjT3kA.js
+_HASHED_NAME_PATTERN = re.compile(r"[.-][A-Za-z0-9_-]{8,}\.[a-z0-9]+$")
+_COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml",
+                       "application/xml", "application/manifest+json", "application/wasm")
+# 小于该大小的文件/响应压缩收益不明显
+MIN_COMPRESS_SIZE = 1024
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+@dataclass
+class StaticAsset:
+    """内存中的单个静态文件及其预压缩版本"""
+    body: bytes
+    mimetype: str
+    etag: str
+    cache_control: str
+    encoded: dict[str, bytes] = field(default_factory=dict)  # 编码名 -> 压缩后的内容
+
+
+def _is_compressible(mimetype: str) -> bool:
+    return mimetype.startswith(_COMPRESSIBLE_TYPES)
+
+
+def _accepted_encodings(request: Request) -> set[str]:
+    header = request.headers.get("Accept-Encoding", "")
+    accepted = set()
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if name and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            accepted.add(name.lower())
+    return accepted
+
+
+class StaticAssetIndex:
+    """web/dist 的内存索引, 构造时加载全部文件"""
+
+    ENCODING_PREFERENCE = ("br", "gzip")
+
+    def __init__(self, root: str):
+        self.root = root
+        self.assets: dict[str, StaticAsset] = {}
+        total = 0
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                full_path = os.path.join(dirpath, filename)
+                rel_path = os.path.relpath(full_path, root).replace(os.sep, "/")
+                # 构建工具生成的 .gz / .br 由对应原文件加载时使用
+                if rel_path.endswith((".gz", ".br")) and os.path.exists(full_path[:-3]):
+                    continue
+                self.assets[rel_path] = self._load(full_path, rel_path)
+                total += len(self.assets[rel_path].body)
+        logger.info(f"已加载前端静态资源 {len(self.assets)} 个文件, 共 {total / 1024:.0f} KB")
+
+    @staticmethod
+    def _load(full_path: str, rel_path: str) -> StaticAsset:
+        with open(full_path, "rb") as fp:
+            body = fp.read()
+        mimetype = mimetypes.guess_type(rel_path)[0] or "application/octet-stream"
+        if mimetype.startswith("text/") or mimetype == "application/javascript":
+            mimetype += "; charset=utf-8"
+        hashed = _HASHED_NAME_PATTERN.search(os.path.basename(rel_path)) and "/" in rel_path
+        asset = StaticAsset(
+            body=body,
+            mimetype=mimetype,
+            etag=hashlib.sha1(body).hexdigest()[:20],
+            cache_control=IMMUTABLE_CACHE_CONTROL if hashed else REVALIDATE_CACHE_CONTROL,
+        )
+        if len(body) < MIN_COMPRESS_SIZE or not _is_compressible(mimetype):
+            return asset
+
+        for encoding, suffix in (("gzip", ".gz"), ("br", ".br")):
+            if os.path.exists(full_path + suffix):
+                with open(full_path + suffix, "rb") as fp:
+                    asset.encoded[encoding] = fp.read()
+        if "gzip" not in asset.encoded:
+            asset.encoded["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+        if "br" not in asset.encoded and BROTLI_AVAILABLE:
+            asset.encoded["br"] = brotli.compress(body, quality=11)
+        # 压缩后反而更大的版本不保留
+        asset.encoded = {k: v for k, v in asset.encoded.items() if len(v) < len(body)}
+        return asset
+
+    def get(self, path: str) -> Optional[StaticAsset]:
+        return self.assets.get(path)
+
+    def response(self, asset: StaticAsset, request: Request) -> Response:
+        """按 If-None-Match / Accept-Encoding 构造响应"""
+        headers = {
+            "ETag": f'"{asset.etag}"',
+            "Cache-Control": asset.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if asset.etag in request.if_none_match:
+            return Response(status=304, headers=headers)
+
+        body = asset.body
+        if asset.encoded:
+            accepted = _accepted_encodings(request)
+            for encoding in self.ENCODING_PREFERENCE:
+                if encoding in asset.encoded and encoding in accepted:
+                    body = asset.encoded[encoding]
+                    headers["Content-Encoding"] = encoding
+                    break
+        return Response(body, mimetype=asset.mimetype, headers=headers)
+
+
+def compress_response(response: Response, request: Request, min_size: int = MIN_COMPRESS_SIZE) -> Response:
+    """压缩较大的 JSON 响应, 供 after_request 使用"""
+    if (
+        response.direct_passthrough
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+        or response.mimetype != "application/json"
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+    data = response.get_data()
+    if len(data) < min_size:
+        return response
+
+    accepted = _accepted_encodings(request)
+    if BROTLI_AVAILABLE and "br" in accepted:
+        # 动态内容使用较低的压缩等级, 兼顾压缩率与耗时
+        encoded, encoding = brotli.compress(data, quality=4), "br"
+    elif "gzip" in accepted:
+        encoded, encoding = gzip.compress(data, compresslevel=5), "gzip"
+    else:
+        return response
+    response.set_data(encoded)
+    response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return response
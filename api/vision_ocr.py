@@ -15,14 +15,23 @@
 - CHAOXING_VISION_OCR_KEY: API 密钥
 - CHAOXING_VISION_OCR_MODEL: 模型名称 (可选，各提供商有默认值)
 - CHAOXING_VISION_OCR_PROMPT: 自定义 OCR 提示词 (可选)
+- CHAOXING_VISION_OCR_CONCURRENCY: 同时进行的识别请求数 (可选，默认 4)
+- CHAOXING_VISION_OCR_BATCH_SIZE: 单次请求携带的图片数 (可选，默认 1，即每张图片单独请求)
+
+同一张图片（按内容摘要判断）同时被多次请求时只会调用一次 API，识别结果会被缓存。
 """
 
 import base64
+import hashlib
 import os
+import re
 import threading
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Dict, Any, List
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from api.logger import logger
 
@@ -52,6 +61,23 @@ DEFAULT_OCR_PROMPT = """你是一个专业的 OCR 文字识别引擎。请严格
 
 现在请识别图片内容："""
 
+# 多图模式下追加到提示词末尾的说明
+BATCH_PROMPT_SUFFIX = """
+
+【多图模式】本次共有 {count} 张图片，请按图片顺序逐张识别。
+每张图片的结果前单独输出一行标记【图片k】（k 从 1 开始），标记之外不要输出任何其他内容。"""
+
+_BATCH_MARKER_PATTERN = re.compile(r"【图片(\d+)】")
+
+# 支持单次请求携带多张图片的提供商（openai_compatible 无法确认后端能力，不启用）
+MULTI_IMAGE_PROVIDERS = {"openai", "claude", "qwen", "siliconflow"}
+
+# 识别结果缓存上限（按图片内容摘要）
+RESULT_CACHE_SIZE = 512
+
+# 表示图片中没有文字的无效响应
+_EMPTY_RESULTS = ("[空]", "无文字内容", "[空白]", "")
+
 # 提供商默认配置
 PROVIDER_DEFAULTS: Dict[str, Dict[str, str]] = {
     "openai": {
@@ -83,7 +109,15 @@ _VISION_OCR_CONFIG: Optional[Dict[str, str]] = None
 _VISION_OCR_LOCK = threading.Lock()
 
 
-def _load_vision_ocr_config() -> Optional[Dict[str, str]]:
+def _env_int(name: str, default: int) -> int:
+    """读取正整数环境变量，缺省或格式错误时使用默认值"""
+    try:
+        return max(1, int(os.environ.get(name, "").strip() or default))
+    except ValueError:
+        return default
+
+
+def _load_vision_ocr_config() -> Optional[Dict[str, Any]]:
     """从环境变量加载视觉 OCR 配置"""
     global _VISION_OCR_ENABLED, _VISION_OCR_CONFIG
 
@@ -126,6 +160,8 @@ def _load_vision_ocr_config() -> Optional[Dict[str, str]]:
             "api_key": api_key,
             "model": model,
             "prompt": prompt,
+            "concurrency": _env_int("CHAOXING_VISION_OCR_CONCURRENCY", 4),
+            "batch_size": _env_int("CHAOXING_VISION_OCR_BATCH_SIZE", 1),
         }
         _VISION_OCR_ENABLED = True
         logger.info(f"外部 AI 视觉 OCR 已启用: provider={provider}, model={model}")
@@ -151,38 +187,43 @@ def _detect_image_type(image_bytes: bytes) -> str:
         return "image/png"  # 默认
 
 
-def _call_openai_compatible(config: Dict[str, str], image_bytes: bytes) -> str:
-    """调用 OpenAI 兼容 API（包括 OpenAI、硅基流动、通义千问等）"""
-    image_base64 = _image_to_base64(image_bytes)
-    image_type = _detect_image_type(image_bytes)
+def _clean_result(text: str) -> str:
+    """去除首尾空白并过滤表示无文字的响应"""
+    text = (text or "").strip()
+    return "" if text in _EMPTY_RESULTS else text
 
+
+def _call_openai_compatible(config: Dict[str, Any], images: List[bytes],
+                            session: Optional[requests.Session] = None, prompt: Optional[str] = None) -> str:
+    """调用 OpenAI 兼容 API（包括 OpenAI、硅基流动、通义千问等），返回原始文本"""
     headers = {
         "Authorization": f"Bearer {config['api_key']}",
         "Content-Type": "application/json",
     }
 
+    content: List[Dict[str, Any]] = [{"type": "text", "text": prompt or config["prompt"]}]
+    for image_bytes in images:
+        content.append({
+            "type": "image_url",
+            "image_url": {
+                "url": f"data:{_detect_image_type(image_bytes)};base64,{_image_to_base64(image_bytes)}"
+            }
+        })
+
     payload = {
         "model": config["model"],
         "messages": [
             {
                 "role": "user",
-                "content": [
-                    {"type": "text", "text": config["prompt"]},
-                    {
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:{image_type};base64,{image_base64}"
-                        }
-                    }
-                ]
+                "content": content
             }
         ],
-        "max_tokens": 1024,
+        "max_tokens": 1024 * len(images),
         "temperature": 0.1,
     }
 
     try:
-        resp = requests.post(
+        resp = (session or requests).post(
             config["endpoint"],
             headers=headers,
             json=payload,
@@ -197,53 +238,48 @@ def _call_openai_compatible(config: Dict[str, str], image_bytes: bytes) -> str:
         choices = data.get("choices", [])
         if choices:
             message = choices[0].get("message", {})
-            content = message.get("content", "")
-            if content:
-                content = content.strip()
-                # 过滤掉空白标记和无效响应
-                if content in ("[空]", "无文字内容", "[空白]", ""):
-                    return ""
-                return content
+            return message.get("content", "") or ""
         return ""
     except Exception as exc:
         logger.debug(f"OpenAI 兼容 API 调用失败: {exc}")
         return ""
 
 
-def _call_claude(config: Dict[str, str], image_bytes: bytes) -> str:
-    """调用 Claude API (Anthropic)"""
-    image_base64 = _image_to_base64(image_bytes)
-    image_type = _detect_image_type(image_bytes)
-
+def _call_claude(config: Dict[str, Any], images: List[bytes],
+                 session: Optional[requests.Session] = None, prompt: Optional[str] = None) -> str:
+    """调用 Claude API (Anthropic)，返回原始文本"""
     headers = {
         "x-api-key": config["api_key"],
         "Content-Type": "application/json",
         "anthropic-version": "2023-06-01",
     }
 
+    content: List[Dict[str, Any]] = [
+        {
+            "type": "image",
+            "source": {
+                "type": "base64",
+                "media_type": _detect_image_type(image_bytes),
+                "data": _image_to_base64(image_bytes),
+            }
+        }
+        for image_bytes in images
+    ]
+    content.append({"type": "text", "text": prompt or config["prompt"]})
+
     payload = {
         "model": config["model"],
-        "max_tokens": 1024,
+        "max_tokens": 1024 * len(images),
         "messages": [
             {
                 "role": "user",
-                "content": [
-                    {
-                        "type": "image",
-                        "source": {
-                            "type": "base64",
-                            "media_type": image_type,
-                            "data": image_base64,
-                        }
-                    },
-                    {"type": "text", "text": config["prompt"]}
-                ]
+                "content": content
             }
         ]
     }
 
     try:
-        resp = requests.post(
+        resp = (session or requests).post(
             config["endpoint"],
             headers=headers,
             json=payload,
@@ -258,19 +294,159 @@ def _call_claude(config: Dict[str, str], image_bytes: bytes) -> str:
         content_blocks = data.get("content", [])
         for block in content_blocks:
             if block.get("type") == "text":
-                text = block.get("text", "")
-                if text:
-                    text = text.strip()
-                    # 过滤掉空白标记和无效响应
-                    if text in ("[空]", "无文字内容", "[空白]", ""):
-                        return ""
-                    return text
+                return block.get("text", "") or ""
         return ""
     except Exception as exc:
         logger.debug(f"Claude API 调用失败: {exc}")
         return ""
 
 
+def _split_batch_result(text: str, count: int) -> Optional[List[str]]:
+    """按【图片k】标记拆分多图识别结果，标记数量不符时返回 None"""
+    parts = _BATCH_MARKER_PATTERN.split(text or "")
+    # split 结果形如 [前缀, "1", 内容1, "2", 内容2, ...]
+    results: Dict[int, str] = {}
+    for i in range(1, len(parts) - 1, 2):
+        results[int(parts[i])] = _clean_result(parts[i + 1])
+    if sorted(results) != list(range(1, count + 1)):
+        return None
+    return [results[k] for k in range(1, count + 1)]
+
+
+class VisionOCRClient:
+    """
+    视觉 OCR 客户端
+
+    - 复用带连接池的会话，并用信号量限制同时进行的请求数
+    - 同一图片摘要的并发请求共享一次 API 调用，结果按摘要缓存
+    - 提供商支持时，可将多张图片合并到一次请求中识别
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.concurrency = int(config.get("concurrency", 4))
+        self.batch_size = int(config.get("batch_size", 1))
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._semaphore = threading.BoundedSemaphore(self.concurrency)
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+
+    @staticmethod
+    def digest(image_bytes: bytes) -> str:
+        return hashlib.sha256(image_bytes).hexdigest()
+
+    def _call(self, images: List[bytes], prompt: Optional[str] = None) -> str:
+        call = _call_claude if self.config["provider"] == "claude" else _call_openai_compatible
+        with self._semaphore:
+            return call(self.config, images, session=self._session, prompt=prompt)
+
+    def _remember(self, key: str, text: str) -> None:
+        if not text:
+            return
+        self._cache[key] = text
+        self._cache.move_to_end(key)
+        while len(self._cache) > RESULT_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def _claim(self, keys: List[str]) -> tuple[Dict[str, str], Dict[str, Future], Dict[str, Future]]:
+        """
+        对每个摘要: 命中缓存则直接返回结果; 已有请求在进行中则等待其结果; 否则由当前线程负责请求
+
+        Returns:
+            (缓存命中结果, 需等待的 Future, 当前线程负责完成的 Future)
+        """
+        cached: Dict[str, str] = {}
+        waiting: Dict[str, Future] = {}
+        owned: Dict[str, Future] = {}
+        with self._lock:
+            for key in keys:
+                if key in cached or key in waiting or key in owned:
+                    continue
+                if key in self._cache:
+                    cached[key] = self._cache[key]
+                elif key in self._inflight:
+                    waiting[key] = self._inflight[key]
+                else:
+                    owned[key] = self._inflight[key] = Future()
+        return cached, waiting, owned
+
+    def _complete(self, key: str, future: Future, text: str) -> None:
+        with self._lock:
+            self._remember(key, text)
+            self._inflight.pop(key, None)
+        future.set_result(text)
+
+    def ocr(self, image_bytes: bytes) -> str:
+        """识别单张图片"""
+        return self.ocr_many([image_bytes])[0]
+
+    def ocr_many(self, images: List[bytes]) -> List[str]:
+        """并发识别多张图片，返回与输入顺序一致的结果列表"""
+        keys = [self.digest(image_bytes) for image_bytes in images]
+        cached, waiting, owned = self._claim(keys)
+
+        if owned:
+            by_key = {key: image_bytes for key, image_bytes in zip(keys, images)}
+            pending = list(owned)
+            try:
+                if self.batch_size > 1 and len(pending) > 1 and self.config["provider"] in MULTI_IMAGE_PROVIDERS:
+                    groups = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+                    run = self._run_batch
+                else:
+                    groups = [[key] for key in pending]
+                    run = self._run_single
+                if len(groups) == 1:
+                    run(groups[0], by_key, owned)
+                else:
+                    with ThreadPoolExecutor(max_workers=min(self.concurrency, len(groups))) as executor:
+                        list(executor.map(lambda group: run(group, by_key, owned), groups))
+            finally:
+                # 出现异常时也要释放等待中的其他线程
+                for key, future in owned.items():
+                    if not future.done():
+                        self._complete(key, future, "")
+
+        results = {key: future.result() for key, future in {**owned, **waiting}.items()}
+        results.update(cached)
+        return [results[key] for key in keys]
+
+    def _run_single(self, group: List[str], by_key: Dict[str, bytes], owned: Dict[str, Future]) -> None:
+        key = group[0]
+        self._complete(key, owned[key], _clean_result(self._call([by_key[key]])))
+
+    def _run_batch(self, group: List[str], by_key: Dict[str, bytes], owned: Dict[str, Future]) -> None:
+        if len(group) == 1:
+            self._run_single(group, by_key, owned)
+            return
+        prompt = self.config["prompt"] + BATCH_PROMPT_SUFFIX.format(count=len(group))
+        texts = _split_batch_result(self._call([by_key[key] for key in group], prompt=prompt), len(group))
+        if texts is None:
+            logger.debug(f"多图识别结果无法按图片拆分，改为逐张识别 ({len(group)} 张)")
+            for key in group:
+                self._run_single([key], by_key, owned)
+            return
+        for key, text in zip(group, texts):
+            self._complete(key, owned[key], text)
+
+
+_VISION_OCR_CLIENT: Optional[VisionOCRClient] = None
+
+
+def _get_client() -> Optional[VisionOCRClient]:
+    global _VISION_OCR_CLIENT
+    config = _load_vision_ocr_config()
+    if not config:
+        return None
+    with _VISION_OCR_LOCK:
+        if _VISION_OCR_CLIENT is None or _VISION_OCR_CLIENT.config is not config:
+            _VISION_OCR_CLIENT = VisionOCRClient(config)
+        return _VISION_OCR_CLIENT
+
+
 def vision_ocr(image_bytes: bytes) -> str:
     """使用外部 AI 视觉模型进行 OCR 识别
 
@@ -280,17 +456,25 @@ def vision_ocr(image_bytes: bytes) -> str:
     Returns:
         识别出的文字内容，失败时返回空字符串
     """
-    config = _load_vision_ocr_config()
-    if not config:
+    client = _get_client()
+    if client is None:
         return ""
+    return client.ocr(image_bytes)
 
-    provider = config["provider"]
 
-    if provider == "claude":
-        return _call_claude(config, image_bytes)
-    else:
-        # openai, qwen, siliconflow, openai_compatible 都使用 OpenAI 兼容格式
-        return _call_openai_compatible(config, image_bytes)
+def vision_ocr_many(images: List[bytes]) -> List[str]:
+    """使用外部 AI 视觉模型并发识别多张图片
+
+    Args:
+        images: 图片的二进制数据列表
+
+    Returns:
+        与输入顺序一致的识别结果列表，失败的图片对应空字符串
+    """
+    client = _get_client()
+    if client is None:
+        return ["" for _ in images]
+    return client.ocr_many(images)
 
 
 def is_vision_ocr_enabled() -> bool:
@@ -301,7 +485,8 @@ def is_vision_ocr_enabled() -> bool:
 
 def reset_vision_ocr_config():
     """重置视觉 OCR 配置（用于测试或重新加载配置）"""
-    global _VISION_OCR_ENABLED, _VISION_OCR_CONFIG
+    global _VISION_OCR_ENABLED, _VISION_OCR_CONFIG, _VISION_OCR_CLIENT
     with _VISION_OCR_LOCK:
         _VISION_OCR_ENABLED = None
         _VISION_OCR_CONFIG = None
+        _VISION_OCR_CLIENT = None
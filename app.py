@@ -1,6 +1,8 @@
+import argparse
 import os
 import sys
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import threading
 import queue
@@ -14,23 +16,48 @@ if SCRIPT_DIR not in sys.path:
     sys.path.insert(0, SCRIPT_DIR)
 STATIC_DIR = os.path.join(SCRIPT_DIR, "web", "dist")
 
-from api.base import Chaoxing, Account, StudyResult
-from api.answer import Tiku
+from api.base import StudyResult
+from api.client_cache import AuthenticatedClientCache
 from api.exceptions import LoginError
 from api.logger import logger
+from api.progress import ChapterDone, ChapterStarted, JobFinished, JobProgress, JobStarted, ProgressBus
+from api.records import ChapterPoint, SlotRecord
+from api.static_assets import StaticAssetIndex, compress_response
 import main as main_module
 
-# 如果存在构建好的前端，则使用静态文件服务
-if os.path.exists(STATIC_DIR):
-    app = Flask(__name__, static_folder=STATIC_DIR, static_url_path='')
-else:
-    app = Flask(__name__)
 
+class RecordJSONProvider(DefaultJSONProvider):
+    """支持将章节等紧凑记录序列化为 JSON 对象"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, SlotRecord):
+            return o.to_dict()
+        return DefaultJSONProvider.default(o)
+
+
+# 如果存在构建好的前端，则把构建产物载入内存并由 serve_static 提供
+STATIC_INDEX = StaticAssetIndex(STATIC_DIR) if os.path.isdir(STATIC_DIR) else None
+app = Flask(__name__, static_folder=None)
+
+app.json = RecordJSONProvider(app)
 CORS(app)
 
+
+@app.after_request
+def compress_json(response):
+    """较大的 JSON 响应(任务详情、日志、课程列表)压缩后返回"""
+    return compress_response(response, request)
+
 # Web 配置文件路径
 CONFIG_FILE = os.path.join(os.path.dirname(__file__), "web_config.json")
 
+# 前端轮询任务详情, 视频进度每秒最多更新 4 次即可
+WEB_PROGRESS_RATE = 4
+
+# 按账号缓存已登录的客户端, 登录、获取课程、开始任务共用同一会话
+CLIENT_CACHE = AuthenticatedClientCache()
+
 
 def load_web_config() -> Dict:
   """加载前端保存的配置"""
@@ -95,11 +122,7 @@ def login():
         if not username or not password:
             return jsonify({'status': False, 'msg': '用户名或密码不能为空'}), 400
         
-        account = Account(username, password)
-        tiku = Tiku()
-        chaoxing = Chaoxing(account=account, tiku=tiku, query_delay=0)
-        
-        login_result = chaoxing.login(login_with_cookies=use_cookies)
+        _, login_result = CLIENT_CACHE.acquire(username, password, use_cookies)
         
         if login_result['status']:
             # 保存登录状态到session
@@ -126,11 +149,8 @@ def get_courses():
         password = data.get('password')
         use_cookies = data.get('use_cookies', False)
         
-        account = Account(username, password)
-        tiku = Tiku()
-        chaoxing = Chaoxing(account=account, tiku=tiku, query_delay=0)
-        
-        login_result = chaoxing.login(login_with_cookies=use_cookies)
+        # 复用 /api/login 时已登录的客户端，避免重复登录
+        chaoxing, login_result = CLIENT_CACHE.acquire(username, password, use_cookies)
         if not login_result['status']:
             return jsonify({'status': False, 'msg': '登录失败'}), 401
         
@@ -171,6 +191,9 @@ def start_study():
         course_list = data.get('course_list', [])
         speed = float(data.get('speed', 1.0))
         jobs = int(data.get('jobs', 4))
+        processes = int(data.get('processes', 1))
+        prefetch = int(data.get('prefetch', 0))
+        stream_window = int(data.get('stream_window', 0))
         notopen_action = data.get('notopen_action', 'retry')
         tiku_config = data.get('tiku_config', {})
         notification_config = data.get('notification_config', {})
@@ -228,6 +251,9 @@ def start_study():
             'course_list': course_list,
             'speed': min(2.0, max(1.0, speed)),
             'jobs': jobs,
+            'processes': max(1, processes),
+            'prefetch': max(0, prefetch),
+            'stream_window': max(0, stream_window),
             'notopen_action': notopen_action,
             'use_cookies': False
         }
@@ -244,35 +270,31 @@ def start_study():
             
             def update_video_progress(course, job, current_time, duration):
                 """更新视频播放进度"""
-                try:
-                    if task_id in task_details:
-                        task_details[task_id]['active_jobs'][job['jobid']] = {
-                            'course_name': course['title'],
-                            'job_name': job.get('name', '未知任务'),
-                            'current_time': current_time,
-                            'duration': duration,
-                            'progress': (current_time / duration * 100) if duration > 0 else 0,
-                            'timestamp': time.time()
-                        }
-                        
-                        # 清理太久没有更新的任务（例如已完成或异常退出的）
-                        current_ts = time.time()
-                        expired_jobs = []
-                        for jid, info in task_details[task_id]['active_jobs'].items():
-                            if current_ts - info['timestamp'] > 10:  # 10秒无更新视为非活跃
-                                expired_jobs.append(jid)
-                        for jid in expired_jobs:
-                            task_details[task_id]['active_jobs'].pop(jid, None)
-                except Exception:
-                    pass
+                if task_id in task_details:
+                    task_details[task_id]['active_jobs'][job['jobid']] = {
+                        'course_name': course['title'],
+                        'job_name': job.get('name', '未知任务'),
+                        'current_time': current_time,
+                        'duration': duration,
+                        'progress': (current_time / duration * 100) if duration > 0 else 0,
+                        'timestamp': time.time()
+                    }
+
+            def finish_video(job):
+                """视频任务结束(成功或失败)后从活跃任务中移除"""
+                if task_id in task_details:
+                    task_details[task_id]['active_jobs'].pop(job['jobid'], None)
+
+            # 进度事件由学习线程发布, 这里按 WEB_PROGRESS_RATE 合并后更新任务状态
+            progress_bus = ProgressBus()
+            common_config['progress_bus'] = progress_bus
 
             try:
                 # 初始化超星实例
                 chaoxing = main_module.init_chaoxing(common_config, tiku_config)
                 
-                # 注入回调
-                common_config['video_progress_callback'] = update_video_progress
-                login_result = chaoxing.login(login_with_cookies=False)
+                # 会话为进程内共享，账号已登录时直接复用，无需再次登录
+                _, login_result = CLIENT_CACHE.acquire(username, password)
                 
                 if not login_result['status']:
                     task_status[task_id]['status'] = 'error'
@@ -347,73 +369,114 @@ def start_study():
                     except Exception as e:
                         logger.debug(f"更新章节统计失败: {e}")
 
-                # 将回调注入 common_config，供 main.process_course / process_chapter 使用
-                common_config['chapter_start_callback'] = chapter_start_callback
-                common_config['chapter_done_callback'] = chapter_done_callback
-
-                for idx, course in enumerate(course_task):
-                    course_detail = task_details[task_id]['courses'][idx]
-                    course_detail['status'] = 'running'
-                    course_detail['start_time'] = time.time()
-                    
-                    task_status[task_id]['current_course'] = course['title']
-                    task_status[task_id]['progress'] = idx
-                    
-                    # 获取章节信息并处理
-                    try:
-                        point_list = chaoxing.get_course_point(
-                            course['courseId'], course['clazzId'], course['cpi']
+                def handle_progress(event):
+                    if isinstance(event, (JobStarted, JobProgress)):
+                        update_video_progress(event.course, event.job, event.position, event.duration)
+                    elif isinstance(event, JobFinished):
+                        finish_video(event.job)
+                    elif isinstance(event, ChapterStarted):
+                        chapter_start_callback(event.course, event.point)
+                    elif isinstance(event, ChapterDone):
+                        chapter_done_callback(event.course, event.point)
+
+                # 订阅进度总线，供 main.process_course / process_chapter 发布的事件实时更新章节与任务统计
+                progress_bus.subscribe(handle_progress, max_rate=WEB_PROGRESS_RATE, name="web")
+
+                def register_chapters(course, course_detail):
+                    """读取课程章节并登记到任务详情与统计中"""
+                    stats = task_status[task_id]['stats']
+
+                    # 逐个解析章节并记录章节信息与任务数量，不保留完整的章节列表
+                    for point in chaoxing.iter_course_points(
+                        course['courseId'], course['clazzId'], course['cpi']
+                    ):
+                        stats['total_chapters'] += 1
+                        has_finished = point.get('has_finished', False)
+                        # jobCount 来自 decode_course_point，表示章节内任务数量，缺失时按 1 计
+                        try:
+                            job_count = int(point.get('jobCount', 1) or 1)
+                        except (TypeError, ValueError):
+                            job_count = 1
+
+                        # 使用紧凑的章节记录，返回前端时由 RecordJSONProvider 转换为 JSON 对象
+                        chapter_info = ChapterPoint(
+                            id=point.get('id'),
+                            title=point.get('title', ''),
+                            status='completed' if has_finished else 'pending',
+                            has_finished=has_finished,
+                            jobCount=job_count,
                         )
+                        course_detail['chapters'].append(chapter_info)
 
-                        points = point_list.get('points', [])
-                        stats = task_status[task_id]['stats']
-
-                        # 统计总章节数
-                        stats['total_chapters'] += len(points)
-
-                        # 记录章节信息与任务数量
-                        for point in points:
-                            has_finished = point.get('has_finished', False)
-                            # jobCount 来自 decode_course_point，表示章节内任务数量，缺失时按 1 计
-                            try:
-                                job_count = int(point.get('jobCount', 1) or 1)
-                            except (TypeError, ValueError):
-                                job_count = 1
-
-                            chapter_info = {
-                                'id': point.get('id'),
-                                'title': point.get('title', ''),
-                                'status': 'completed' if has_finished else 'pending',
-                                'has_finished': has_finished,
-                                'jobCount': job_count,
-                            }
-                            course_detail['chapters'].append(chapter_info)
-
-                            # 累计任务统计
-                            stats['total_tasks'] += job_count
-                            if has_finished:
-                                stats['completed_chapters'] += 1
-                                stats['completed_tasks'] += job_count
-
-                        # 处理课程（原有逻辑，但章节/任务统计通过回调实时更新）
-                        main_module.process_course(chaoxing, course, common_config)
+                        # 累计任务统计
+                        stats['total_tasks'] += job_count
+                        if has_finished:
+                            stats['completed_chapters'] += 1
+                            stats['completed_tasks'] += job_count
 
+                def finish_course(course_detail, error=None):
+                    if error is None:
                         # 课程处理完成后，确保已完成的章节状态为 completed（统计已在回调中完成）
                         for chapter in course_detail['chapters']:
                             if chapter.get('has_finished'):
                                 chapter['status'] = 'completed'
-
                         course_detail['status'] = 'completed'
-                        course_detail['end_time'] = time.time()
-
-                    except Exception as course_error:
-                        logger.error(f"课程处理失败 {course['title']}: {course_error}")
+                    else:
                         course_detail['status'] = 'error'
-                        course_detail['error'] = str(course_error)
-                        course_detail['end_time'] = time.time()
-                    
-                    task_status[task_id]['progress'] = idx + 1
-                
+                        course_detail['error'] = error
+                    course_detail['end_time'] = time.time()
+
+                if common_config['processes'] > 1 and len(course_task) > 1:
+                    # 协调模式：先登记所有课程章节，再由多个工作进程并行学习
+                    detail_by_id = {}
+                    for idx, course in enumerate(course_task):
+                        course_detail = task_details[task_id]['courses'][idx]
+                        detail_by_id[course['courseId']] = course_detail
+                        try:
+                            register_chapters(course, course_detail)
+                        except Exception as course_error:
+                            logger.error(f"读取课程章节失败 {course['title']}: {course_error}")
+
+                    def course_start_callback(course_obj):
+                        course_detail = detail_by_id.get(course_obj['courseId'])
+                        if course_detail:
+                            course_detail['status'] = 'running'
+                            course_detail['start_time'] = time.time()
+                        task_status[task_id]['current_course'] = course_obj['title']
+
+                    def course_done_callback(course_obj, ok):
+                        course_detail = detail_by_id.get(course_obj['courseId'])
+                        if course_detail:
+                            finish_course(course_detail, None if ok else '课程处理失败')
+                        task_status[task_id]['progress'] += 1
+
+                    common_config['course_start_callback'] = course_start_callback
+                    common_config['course_done_callback'] = course_done_callback
+                    main_module.run_coordinator(common_config, tiku_config, course_task)
+                    task_status[task_id]['progress'] = len(course_task)
+                else:
+                    for idx, course in enumerate(course_task):
+                        course_detail = task_details[task_id]['courses'][idx]
+                        course_detail['status'] = 'running'
+                        course_detail['start_time'] = time.time()
+
+                        task_status[task_id]['current_course'] = course['title']
+                        task_status[task_id]['progress'] = idx
+
+                        # 获取章节信息并处理
+                        try:
+                            register_chapters(course, course_detail)
+
+                            # 处理课程（原有逻辑，但章节/任务统计通过回调实时更新）
+                            main_module.process_course(chaoxing, course, common_config)
+                            finish_course(course_detail)
+
+                        except Exception as course_error:
+                            logger.error(f"课程处理失败 {course['title']}: {course_error}")
+                            finish_course(course_detail, str(course_error))
+
+                        task_status[task_id]['progress'] = idx + 1
+
                 task_status[task_id]['status'] = 'completed'
                 
                 # 发送完成通知
@@ -432,6 +495,10 @@ def start_study():
                     except Exception:
                         pass
             finally:
+                progress_bus.close()
+                # 发送尚未发出的通知并停止通知分发线程
+                if notification:
+                    notification.close()
                 # 无论任务成功或失败，都移除当前任务的日志捕获 sink
                 try:
                     logger.remove(log_sink_id)
@@ -515,38 +582,62 @@ def health():
 @app.route('/')
 def serve_index():
     """服务前端首页"""
-    if os.path.exists(STATIC_DIR):
-        return send_from_directory(STATIC_DIR, 'index.html')
+    if STATIC_INDEX is not None and STATIC_INDEX.get('index.html'):
+        return STATIC_INDEX.response(STATIC_INDEX.get('index.html'), request)
     return jsonify({'status': False, 'msg': '前端未构建，请访问 http://localhost:5173 使用开发模式'}), 404
 
 
 @app.route('/<path:path>')
 def serve_static(path):
     """服务静态文件，支持 SPA 客户端路由"""
-    if os.path.exists(STATIC_DIR):
+    if STATIC_INDEX is not None:
         # 如果请求的是 API 路径，跳过（已被上面的路由处理）
         if path.startswith('api/'):
             return jsonify({'status': False, 'msg': 'Not Found'}), 404
         
-        # 尝试提供静态文件
-        file_path = os.path.join(STATIC_DIR, path)
-        if os.path.exists(file_path) and os.path.isfile(file_path):
-            return send_from_directory(STATIC_DIR, path)
-        
-        # 对于 SPA 客户端路由，返回 index.html
-        return send_from_directory(STATIC_DIR, 'index.html')
+        # 尝试提供静态文件，对于 SPA 客户端路由，返回 index.html
+        asset = STATIC_INDEX.get(path) or STATIC_INDEX.get('index.html')
+        if asset:
+            return STATIC_INDEX.response(asset, request)
     
     return jsonify({'status': False, 'msg': '前端未构建'}), 404
 
 
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="超星学习通 Web 后端")
+    parser.add_argument("--host", default="0.0.0.0", help="监听地址")
+    parser.add_argument("--port", type=int, default=5000, help="监听端口")
+    parser.add_argument(
+        "--production", action="store_true",
+        help="生产模式: 使用 waitress WSGI 服务器代替 Flask 调试服务器 (也可设置 CHAOXING_WEB_PRODUCTION=1)"
+    )
+    parser.add_argument("--threads", type=int, default=8, help="生产模式下处理请求的线程数")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
+    args = parse_args()
+    production = args.production or os.environ.get("CHAOXING_WEB_PRODUCTION", "0").strip().lower() in {"1", "true", "yes", "y", "on"}
+
     # 检测是否存在前端构建
-    if os.path.exists(STATIC_DIR):
+    if STATIC_INDEX is not None:
         logger.info(f"检测到前端构建，将提供静态文件服务: {STATIC_DIR}")
-        logger.info("请在浏览器中打开: http://localhost:5000")
+        logger.info(f"请在浏览器中打开: http://localhost:{args.port}")
     else:
         logger.info("未检测到前端构建，仅提供 API 服务")
         logger.info("前端开发模式请访问: http://localhost:5173")
-    
-    # use_reloader=False 避免热重载导致后台线程 ThreadPoolExecutor 崩溃
-    app.run(host='0.0.0.0', port=5000, debug=True, use_reloader=False)
+
+    if production:
+        try:
+            from waitress import serve
+        except ImportError:
+            logger.warning("未安装 waitress, 无法使用生产模式, 将使用 Flask 调试服务器 (pip install waitress)")
+            production = False
+
+    if production:
+        logger.info(f"生产模式: waitress 监听 {args.host}:{args.port}, {args.threads} 个工作线程")
+        serve(app, host=args.host, port=args.port, threads=args.threads)
+    else:
+        # use_reloader=False 避免热重载导致后台线程 ThreadPoolExecutor 崩溃
+        app.run(host=args.host, port=args.port, debug=True, use_reloader=False)
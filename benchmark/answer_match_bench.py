@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+选项匹配基准测试: 对比 study_work 旧版嵌套循环匹配与 AnswerMatcher 的耗时与准确率。
+
+语料为 JSONL, 每行包含 type(single/multiple)、options、answer 与期望的 expected 选项字母。
+
+用法:
+    python benchmark/answer_match_bench.py
+    python benchmark/answer_match_bench.py --corpus my_pairs.jsonl --repeat 200
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from api.answer_check import cut
+from api.answer_match import RAPIDFUZZ_AVAILABLE, AnswerMatcher
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "answer_pairs.jsonl")
+
+
+def legacy_match(options: str, res: str, q_type: str) -> str:
+    """study_work 中原有的匹配逻辑(每次调用重新定义辅助函数)"""
+
+    def clean_res(res):
+        cleaned_res = []
+        if isinstance(res, str):
+            res = [res]
+        for c in res:
+            cleaned = re.sub(r'^[A-Za-z]|[.,!?;:，。！？；：]', '', c)
+            cleaned_res.append(cleaned.strip())
+        return cleaned_res
+
+    def is_subsequence(a, o):
+        iter_o = iter(o)
+        return all(c in iter_o for c in a)
+
+    answer = ""
+    options_list = cut(options)
+    if options_list is None:
+        return answer
+    opt_letters = "".join(o[:1] for o in options_list)
+    letters_raw = "".join(ch for ch in str(res) if ch.isalpha()).upper()
+    letters_filtered = "".join(ch for ch in letters_raw if ch in opt_letters)
+    if q_type == "multiple":
+        if letters_filtered:
+            unique_letters = []
+            for ch in letters_filtered:
+                if ch not in unique_letters:
+                    unique_letters.append(ch)
+            return "".join(sorted(unique_letters))
+        res_list = cut(res)
+        if res_list is not None:
+            for _a in clean_res(res_list):
+                for o in options_list:
+                    if is_subsequence(_a, o):
+                        answer += o[:1]
+            answer = "".join(sorted(answer))
+        return answer
+    if len(letters_filtered) == 1:
+        return letters_filtered
+    t_res = clean_res(res)
+    if t_res:
+        for o in options_list:
+            if is_subsequence(t_res[0], o):
+                return o[:1]
+    return answer
+
+
+def load_corpus(path: str) -> list[dict]:
+    with open(path, "r", encoding="utf8") as fp:
+        return [json.loads(line) for line in fp if line.strip()]
+
+
+def run(corpus: list[dict], repeat: int) -> None:
+    matcher = AnswerMatcher()
+
+    def bench(name, func):
+        correct = sum(func(item) == item["expected"] for item in corpus)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for item in corpus:
+                func(item)
+        elapsed = time.perf_counter() - start
+        per_item = elapsed / (repeat * len(corpus)) * 1e6
+        print(f"{name:<16} 准确率 {correct}/{len(corpus)}  平均耗时 {per_item:8.2f} us/题")
+
+    bench("legacy", lambda item: legacy_match(item["options"], item["answer"], item["type"]))
+    bench("matcher", lambda item: matcher.match(matcher.prepare(item["options"]), item["answer"], item["type"]).answer)
+
+    mismatches = [
+        (item, matcher.match(matcher.prepare(item["options"]), item["answer"], item["type"]))
+        for item in corpus
+    ]
+    for item, result in mismatches:
+        if result.answer != item["expected"]:
+            print(f"未匹配: {item['answer']!r} -> {result.answer!r} (期望 {item['expected']!r}) {result.scores}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="选项匹配基准测试")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="JSONL 语料路径")
+    parser.add_argument("--repeat", type=int, default=100, help="重复次数")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    print(f"语料: {args.corpus} ({len(corpus)} 题), rapidfuzz: {'可用' if RAPIDFUZZ_AVAILABLE else '不可用, 使用 difflib'}")
+    run(corpus, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+OCR 预处理基准测试: 对比旧版 PIL 流程(每种模式重新解码、增强、编码 PNG 再由 OCR 引擎解码)
+与 api.ocr_preprocess 的单次解码向量化流程的耗时, 并给出两者输出的像素差异。
+
+语料为题目图片目录(png/jpg/gif/bmp); 未指定时生成一组模拟题目公式图片。
+
+用法:
+    python benchmark/ocr_preprocess_bench.py
+    python benchmark/ocr_preprocess_bench.py --images ./question_images --repeat 20
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageEnhance, ImageFilter
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from api.ocr_preprocess import PREPROCESSING_MODES, decode_image, enhance
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".gif", ".bmp")
+
+
+def legacy_preprocess(image_bytes: bytes, enhance_mode: int = 0) -> bytes:
+    """decode._preprocess_image_for_ocr 的旧实现"""
+    img = Image.open(io.BytesIO(image_bytes))
+    if img.mode in ('RGBA', 'LA', 'P'):
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        if img.mode == 'P':
+            img = img.convert('RGBA')
+        background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
+        img = background
+    elif img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    min_dimension = 100
+    width, height = img.size
+    if width < min_dimension or height < min_dimension:
+        scale = max(min_dimension / width, min_dimension / height, 2.0)
+        img = img.resize((int(width * scale), int(height * scale)), Image.Resampling.LANCZOS)
+
+    max_dimension = 2000
+    width, height = img.size
+    if width > max_dimension or height > max_dimension:
+        scale = min(max_dimension / width, max_dimension / height)
+        img = img.resize((int(width * scale), int(height * scale)), Image.Resampling.LANCZOS)
+
+    if enhance_mode == 0:
+        img = ImageEnhance.Contrast(img).enhance(1.3)
+        img = ImageEnhance.Sharpness(img).enhance(1.2)
+    elif enhance_mode == 1:
+        img = ImageEnhance.Contrast(img).enhance(1.8)
+        img = ImageEnhance.Sharpness(img).enhance(1.5)
+        img = img.filter(ImageFilter.MedianFilter(size=3))
+    elif enhance_mode == 2:
+        img = img.convert('L')
+        img = ImageEnhance.Contrast(img).enhance(2.0)
+        img = img.point(lambda p: 255 if p > 180 else 0)
+        img = img.convert('RGB')
+
+    output = io.BytesIO()
+    img.save(output, format='PNG')
+    return output.getvalue()
+
+
+def legacy_pipeline(image_bytes: bytes, mode: int) -> np.ndarray:
+    """旧流程: 预处理得到 PNG 后, OCR 引擎再从文件解码为 BGR 数组"""
+    png = legacy_preprocess(image_bytes, mode)
+    return np.asarray(Image.open(io.BytesIO(png)).convert("RGB"))[..., ::-1]
+
+
+def synthetic_corpus(count: int, seed: int = 0) -> list[bytes]:
+    """生成模拟的题目公式图片: 小尺寸、浅色背景、带透明通道或调色板的图片都有"""
+    rng = random.Random(seed)
+    tokens = ["x^2", "+", "y", "=", "√2", "∫", "sinθ", "∑", "a_n", "(1/2)", "π", "dx"]
+    images = []
+    for i in range(count):
+        width, height = rng.choice([(60, 24), (120, 32), (240, 48), (480, 64), (800, 120)])
+        mode = rng.choice(["RGB", "RGBA", "P", "L"])
+        img = Image.new("RGBA" if mode == "RGBA" else "RGB", (width, height),
+                        (0, 0, 0, 0) if mode == "RGBA" else (rng.randint(220, 255),) * 3)
+        draw = ImageDraw.Draw(img)
+        x = 4
+        while x < width - 20:
+            text = rng.choice(tokens)
+            draw.text((x, rng.randint(2, max(3, height - 14))), text, fill=(rng.randint(0, 90),) * 3)
+            x += 8 * len(text) + rng.randint(2, 10)
+        if mode == "P":
+            img = img.convert("P")
+        elif mode == "L":
+            img = img.convert("L")
+        buf = io.BytesIO()
+        img.save(buf, format="PNG")
+        images.append(buf.getvalue())
+    return images
+
+
+def load_corpus(path: str) -> list[bytes]:
+    images = []
+    for name in sorted(os.listdir(path)):
+        if name.lower().endswith(IMAGE_SUFFIXES):
+            with open(os.path.join(path, name), "rb") as fp:
+                images.append(fp.read())
+    return images
+
+
+def run(corpus: list[bytes], repeat: int) -> None:
+    def bench(name, func):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for image_bytes in corpus:
+                func(image_bytes)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<28} 平均耗时 {elapsed / (repeat * len(corpus)) * 1e3:8.3f} ms/图")
+
+    def legacy_all(image_bytes):
+        for mode in PREPROCESSING_MODES:
+            legacy_pipeline(image_bytes, mode)
+
+    def vectorized_all(image_bytes):
+        base = decode_image(image_bytes)
+        for mode in PREPROCESSING_MODES:
+            enhance(base, mode)
+
+    print("-- 仅模式0(首个模式即识别成功的常见情况)")
+    bench("legacy", lambda b: legacy_pipeline(b, 0))
+    bench("vectorized", lambda b: enhance(decode_image(b), 0))
+    print("-- 全部三种模式(前两种模式均未识别出文本)")
+    bench("legacy", legacy_all)
+    bench("vectorized", vectorized_all)
+
+    print("-- 与旧流程输出的差异 (平均绝对误差 / 差异像素占比)")
+    for mode in PREPROCESSING_MODES:
+        mae, ratio = [], []
+        for image_bytes in corpus:
+            old = legacy_pipeline(image_bytes, mode).astype(np.int16)
+            new = enhance(decode_image(image_bytes), mode).astype(np.int16)
+            diff = np.abs(old - new)
+            mae.append(diff.mean())
+            ratio.append((diff > 8).mean())
+        print(f"模式{mode}: MAE {np.mean(mae):6.2f}  差异>8 的像素 {np.mean(ratio) * 100:5.2f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR 预处理基准测试")
+    parser.add_argument("--images", default=None, help="题目图片目录, 缺省时使用生成的模拟图片")
+    parser.add_argument("--count", type=int, default=60, help="生成的模拟图片数量")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.images) if args.images else synthetic_corpus(args.count)
+    if not corpus:
+        print("语料为空")
+        return
+    print(f"语料: {args.images or '模拟题目图片'} ({len(corpus)} 张)")
+    run(corpus, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
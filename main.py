@@ -2,31 +2,39 @@
 import argparse
 import configparser
 import enum
+import heapq
+import multiprocessing
+import queue
+import random
 import sys
 import threading
 import time
 import traceback
+from collections import deque
 from concurrent.futures.thread import ThreadPoolExecutor
 from dataclasses import dataclass
-from queue import PriorityQueue
 try:
     from queue import ShutDown
 except ImportError:
     # ShutDown is only available in Python 3.13+
     class ShutDown(Exception):
         pass
-from threading import RLock
-from typing import Any
+from typing import Any, Iterable
 
-from tqdm import tqdm
-
-from api.answer import Tiku
+from api.answer import CacheDAO, Tiku
 from api.base import Chaoxing, Account, StudyResult
 from api.exceptions import LoginError, InputFormatError
 from api.logger import logger
 from api.notification import Notification
+from api.progress import ChapterDone, ChapterStarted, ProgressBus, TqdmRenderer
 from api.live import Live
 from api.live_process import LiveProcessor
+from api.shared_store import SharedRateLimiter, SharedStore
+
+# 命令行进度条与工作进程转发进度事件的最大频率(次/秒)
+CLI_PROGRESS_RATE = 2
+WORKER_PROGRESS_RATE = 4
+
 
 class ChapterResult(enum.Enum):
     SUCCESS=0,
@@ -89,6 +97,18 @@ def parse_args():
         choices=["retry", "ask", "continue"],
         help="遇到关闭任务点时的行为: retry-重试, ask-询问, continue-继续"
     )
+    parser.add_argument(
+        "--prefetch", type=int, default=0,
+        help="提前获取后续章节任务点与测验并预热答案缓存的章节数 (默认0, 不预取)"
+    )
+    parser.add_argument(
+        "--stream-window", type=int, default=0,
+        help="流式处理大课程时同时在途的章节数 (默认0, 一次性载入全部章节)"
+    )
+    parser.add_argument(
+        "--processes", type=int, default=1,
+        help="同时学习课程的进程数 (默认1, 大于1时按课程分配到多个工作进程)"
+    )
 
     # 在解析之前捕获 -h 的行为
     if len(sys.argv) == 2 and sys.argv[1] in {"-h", "--help"}:
@@ -118,6 +138,12 @@ def load_config_from_file(config_path):
             common_config["speed"] = float(common_config["speed"])
         if "jobs" in common_config:
             common_config["jobs"] = int(common_config["jobs"])
+        if "processes" in common_config:
+            common_config["processes"] = int(common_config["processes"])
+        if "prefetch" in common_config:
+            common_config["prefetch"] = int(common_config["prefetch"])
+        if "stream_window" in common_config:
+            common_config["stream_window"] = int(common_config["stream_window"])
         # 处理notopen_action，设置默认值为retry
         if "notopen_action" not in common_config:
             common_config["notopen_action"] = "retry"
@@ -152,6 +178,9 @@ def build_config_from_args(args):
         "course_list": [item.strip() for item in args.list.split(",") if item.strip()] if args.list else None,
         "speed": args.speed if args.speed else 1.0,
         "jobs": args.jobs,
+        "processes": args.processes,
+        "prefetch": args.prefetch,
+        "stream_window": args.stream_window,
         "notopen_action": args.notopen_action if args.notopen_action else "retry"
     }
     return common_config, {}, {}
@@ -197,19 +226,19 @@ def init_chaoxing(common_config, tiku_config):
     return chaoxing
 
 
-def process_job(chaoxing: Chaoxing, course: dict, job: dict, job_info: dict, speed: float, progress_callback=None) -> StudyResult:
+def process_job(chaoxing: Chaoxing, course: dict, job: dict, job_info: dict, speed: float, progress_bus: ProgressBus | None = None) -> StudyResult:
     """处理单个任务点"""
     # 视频任务
     if job["type"] == "video":
         logger.trace(f"识别到视频任务, 任务章节: {course['title']} 任务ID: {job['jobid']}")
         # 超星的接口没有返回当前任务是否为Audio音频任务
         video_result = chaoxing.study_video(
-            course, job, job_info, _speed=speed, _type="Video", progress_callback=progress_callback
+            course, job, job_info, _speed=speed, _type="Video", progress_bus=progress_bus
         )
         if video_result.is_failure():
             logger.warning("当前任务非视频任务, 正在尝试音频任务解码")
             video_result = chaoxing.study_video(
-                course, job, job_info, _speed=speed, _type="Audio", progress_callback=progress_callback)
+                course, job, job_info, _speed=speed, _type="Audio", progress_bus=progress_bus)
         if video_result.is_failure():
             logger.warning(
                 f"出现异常任务 -> 任务章节: {course['title']} 任务ID: {job['jobid']}, 已跳过"
@@ -262,46 +291,258 @@ def process_job(chaoxing: Chaoxing, course: dict, job: dict, job_info: dict, spe
     return StudyResult.ERROR
 
 
-@dataclass(order=True)
+@dataclass(order=True, slots=True)
 class ChapterTask:
     index: int
     point: dict[str, Any]
     result: ChapterResult = ChapterResult.PENDING
     tries: int = 0
+    waits: int = 0  # 未开放章节的退避次数, 不计入 tries
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """章节重试的退避策略: base * factor^(tries-1), 上限 max_delay, 并附加 ±jitter 比例的随机抖动"""
+    base: float
+    factor: float
+    max_delay: float
+    jitter: float = 0.2
+
+    def delay(self, tries: int) -> float:
+        delay = min(self.max_delay, self.base * self.factor ** max(0, tries - 1))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+# ERROR 按指数退避重试; NOT_OPEN 主要依赖前序章节完成事件唤醒, 退避时间仅作为兜底
+RETRY_POLICIES: dict[ChapterResult, RetryPolicy] = {
+    ChapterResult.ERROR: RetryPolicy(base=2, factor=2, max_delay=60),
+    ChapterResult.NOT_OPEN: RetryPolicy(base=15, factor=2, max_delay=120),
+}
+
+
+class DelayQueue:
+    """
+    延迟队列: 每个任务带有就绪时间, get() 阻塞直到有任务就绪。
+    就绪的任务按章节下标出队, 保证前面的章节(包括到期的重试)优先处理。
+    """
+
+    def __init__(self):
+        self._delayed: list[tuple[float, int, ChapterTask]] = []  # (就绪时间, 下标, 任务)
+        self._ready: list[tuple[int, ChapterTask]] = []  # (下标, 任务)
+        self._cond = threading.Condition()
+        self._shutdown = False
+
+    def put(self, task: ChapterTask, delay: float = 0.0) -> None:
+        with self._cond:
+            if delay <= 0:
+                heapq.heappush(self._ready, (task.index, task))
+            else:
+                heapq.heappush(self._delayed, (time.monotonic() + delay, task.index, task))
+            self._cond.notify()
+
+    def get(self) -> ChapterTask:
+        with self._cond:
+            while True:
+                if self._shutdown:
+                    raise ShutDown
+                now = time.monotonic()
+                while self._delayed and self._delayed[0][0] <= now:
+                    _, index, task = heapq.heappop(self._delayed)
+                    heapq.heappush(self._ready, (index, task))
+                if self._ready:
+                    return heapq.heappop(self._ready)[1]
+                timeout = self._delayed[0][0] - now if self._delayed else None
+                self._cond.wait(timeout)
+
+    def wake(self, predicate, jitter: float = 1.0) -> None:
+        """将满足条件的延迟任务提前到 jitter 秒内就绪"""
+        with self._cond:
+            now = time.monotonic()
+            changed = False
+            for i, (ready_at, index, task) in enumerate(self._delayed):
+                if predicate(task):
+                    new_ready_at = now + random.uniform(0, jitter)
+                    if new_ready_at < ready_at:
+                        self._delayed[i] = (new_ready_at, index, task)
+                        changed = True
+            if changed:
+                heapq.heapify(self._delayed)
+                self._cond.notify_all()
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+
+
+class ChapterPrefetcher:
+    """
+    章节预取: 工作线程学习当前章节(多数时间在视频进度循环中等待)时,
+    由后台线程提前获取后续至多 lookahead 个章节的任务点与测验页面, 并预热答案/OCR缓存。
+
+    预取线程只有一个, 与工作线程共用接口限速器, 已被工作线程领取的章节不会再预取。
+    章节由 JobProcessor 按下标顺序通过 add() 交给预取线程, 预取线程处理后即不再持有。
+    """
+
+    def __init__(self, chaoxing: Chaoxing, course: dict[str, Any], lookahead: int):
+        self.chaoxing = chaoxing
+        self.course = course
+        self.lookahead = lookahead
+        self._pending: deque[ChapterTask] = deque()
+        self._cond = threading.Condition()
+        self._frontier = 0  # 最靠前的未完成章节下标
+        self._max_claimed = -1  # 已被工作线程领取的最大章节下标
+        self._stopped = False
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self.lookahead <= 0:
+            return
+        self._thread = threading.Thread(target=self._run, name="chapter-prefetch", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def add(self, task: ChapterTask) -> None:
+        """登记待预取的章节, 需按下标顺序调用"""
+        if self.lookahead <= 0:
+            return
+        with self._cond:
+            self._pending.append(task)
+            self._cond.notify_all()
+
+    def claim(self, index: int) -> None:
+        """工作线程领取章节时调用, 工作线程按下标顺序领取, 不大于该下标的章节都不再预取"""
+        with self._cond:
+            if index > self._max_claimed:
+                self._max_claimed = index
+                self._cond.notify_all()
+
+    def advance(self, frontier: int) -> None:
+        """最靠前的未完成章节变化时调用, 预取窗口随之后移"""
+        with self._cond:
+            if frontier > self._frontier:
+                self._frontier = frontier
+                self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                # 等工作线程领取首批章节后, 只预取窗口内尚未被领取的章节
+                while not self._stopped and (
+                    self._max_claimed < 0
+                    or not self._pending
+                    or self._pending[0].index > self._frontier + self.lookahead
+                ):
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                task = self._pending.popleft()
+                if task.index <= self._max_claimed or task.point.get("has_finished"):
+                    continue
+            try:
+                logger.debug(f"预取章节: {task.point['title']}")
+                job_list = self.chaoxing.prefetch_chapter(self.course, task.point)
+            except Exception as e:
+                logger.debug(f"预取章节失败: {task.point['title']} {e}")
+                continue
+            with self._cond:
+                claimed = task.index <= self._max_claimed
+            if claimed:
+                # 预取期间章节已被领取, 工作线程自行获取了页面, 预取结果不再使用
+                self.chaoxing.drop_prefetched(task.point, job_list)
+
 
 class JobProcessor:
-    def __init__(self, chaoxing: Chaoxing, course: dict[str, Any], tasks: list[ChapterTask], config: dict[str, Any]):
+    """
+    章节处理器: 多个工作线程从延迟队列领取章节并处理
+
+    tasks 可以是惰性产生章节的迭代器。配置 stream_window 大于 0 时为流式模式,
+    同时在途(已领取但未完成)的章节数不超过该值, 章节完成后才从迭代器继续领取,
+    内存占用与课程的章节总数无关; 否则一开始就领取全部章节。
+    """
+
+    def __init__(self, chaoxing: Chaoxing, course: dict[str, Any], tasks: Iterable[ChapterTask], config: dict[str, Any]):
         self.chaoxing = chaoxing
         self.course = course
         self.speed = config["speed"]
         self.max_tries = 5
-        self.tasks = tasks
+        self.tasks = iter(tasks)
         self.failed_tasks: list[ChapterTask] = []
-        self.task_queue: PriorityQueue[ChapterTask] = PriorityQueue()
-        self.retry_queue: PriorityQueue[ChapterTask] = PriorityQueue()
-        self.wait_queue: PriorityQueue[ChapterTask] = PriorityQueue()
+        self.task_queue = DelayQueue()
         self.threads: list[threading.Thread] = []
         self.worker_num = config["jobs"]
         self.config = config
+        self._lock = threading.Lock()
+        self._unfinished: set[int] = set()
+        self._exhausted = False
+        self._all_done = threading.Event()
+        lookahead = int(config.get("prefetch", 0) or 0)
+        window = int(config.get("stream_window", 0) or 0)
+        # 在途窗口至少容纳所有工作线程与预取范围, 否则会限制并行度
+        self.window = max(window, self.worker_num + lookahead) if window > 0 else 0
+        self.prefetcher = ChapterPrefetcher(chaoxing, course, lookahead)
+
+    def _admit(self) -> None:
+        """从章节迭代器领取章节放入队列, 直到在途章节数达到窗口大小或迭代器耗尽"""
+        while True:
+            with self._lock:
+                if self._exhausted or (self.window and len(self._unfinished) >= self.window):
+                    return
+                task = next(self.tasks, None)
+                if task is None:
+                    self._exhausted = True
+                    return
+                self._unfinished.add(task.index)
+            self.prefetcher.add(task)
+            self.task_queue.put(task)
 
     def run(self):
-        for task in self.tasks:
-            self.task_queue.put(task)
+        self._admit()
+        if not self._unfinished:
+            return
+        self.prefetcher.start()
 
         for i in range(self.worker_num):
             thread = threading.Thread(target=self.worker_thread, daemon=True)
             self.threads.append(thread)
             thread.start()
 
-        threading.Thread(target=self.retry_thread, daemon=True).start()
-
-        self.task_queue.join()
+        self._all_done.wait()
+        self.prefetcher.stop()
+        self.task_queue.shutdown()
         time.sleep(0.5)
 
+    def _finish(self, task: ChapterTask) -> None:
+        """标记章节处理结束(成功/跳过/放弃), 领取后续章节, 并唤醒等待前序章节的未开放章节"""
+        with self._lock:
+            self._unfinished.discard(task.index)
+        self._admit()
+        with self._lock:
+            all_done = self._exhausted and not self._unfinished
+            frontier = min(self._unfinished, default=task.index)
+            logger.debug(f"unfinished task: {len(self._unfinished)}")
+
+        self.prefetcher.advance(frontier)
+        self.task_queue.wake(lambda t: t.result == ChapterResult.NOT_OPEN and t.index > task.index)
+        if all_done:
+            self._all_done.set()
+
+    def _has_pending_predecessor(self, task: ChapterTask) -> bool:
+        with self._lock:
+            return any(index < task.index for index in self._unfinished)
+
+    def _schedule_retry(self, task: ChapterTask) -> None:
+        attempts = task.waits if task.result == ChapterResult.NOT_OPEN else task.tries
+        delay = RETRY_POLICIES[task.result].delay(attempts)
+        logger.debug("Task {} scheduled for retry in {:.1f}s", task.point["title"], delay)
+        self.task_queue.put(task, delay)
 
     @log_error
     def worker_thread(self):
-        tqdm.set_lock(tqdm.get_lock())
         while True:
             try:
                 task = self.task_queue.get()
@@ -309,20 +550,28 @@ class JobProcessor:
                 logger.info("Queue shut down")
                 return
 
+            self.prefetcher.claim(task.index)
             # 处理单个章节，并在需要时通过 config 中的回调上报章节完成进度
             task.result = process_chapter(self.chaoxing, self.course, task.point, self.speed, self.config)
 
             match task.result:
                 case ChapterResult.SUCCESS:
                     logger.debug("Task success: {}", task.point["title"])
-                    self.task_queue.task_done()
-                    logger.debug(f"unfinished task: {self.task_queue.unfinished_tasks}")
+                    self._finish(task)
 
                 case ChapterResult.NOT_OPEN:
-                    # task.tries += 1
                     if self.config["notopen_action"] == "continue":
                         logger.warning("章节未开启: {}, 正在跳过", task.point["title"])
-                        self.task_queue.task_done()
+                        self._finish(task)
+                        continue
+
+                    if self._has_pending_predecessor(task):
+                        # 前序章节仍在处理, 等待其完成后被唤醒, 不计入重试次数
+                        logger.debug("章节未开启: {}, 等待前序章节完成", task.point["title"])
+                        self.task_queue.put(task, RETRY_POLICIES[ChapterResult.NOT_OPEN].max_delay)
+                        # 前序章节可能在检查与入队之间完成, 其唤醒已错过, 这里补一次
+                        if not self._has_pending_predecessor(task):
+                            self.task_queue.wake(lambda t: t is task)
                         continue
 
                     if task.tries >= self.max_tries:
@@ -330,11 +579,12 @@ class JobProcessor:
                             "章节未开启: {} 可能由于上一章节的章节检测未完成, 也可能由于该章节因为时效已关闭，"
                             "请手动检查完成并提交再重试。或者在配置中配置(自动跳过关闭章节/开启题库并启用提交)"
                         , task.point["title"])
-                        self.task_queue.task_done()
+                        self._finish(task)
                         continue
 
-                    # self.wait_queue.put(task)
-                    self.retry_queue.put(task)
+                    # 与原实现一致, 未开放章节不计入重试次数, 按退避时间一直重试到开放为止
+                    task.waits += 1
+                    self._schedule_retry(task)
 
                 case ChapterResult.ERROR:
                     task.tries += 1
@@ -343,43 +593,28 @@ class JobProcessor:
                     if task.tries >= self.max_tries:
                         logger.error("Max retries reached for task: {}", task.point["title"])
                         self.failed_tasks.append(task)
-                        self.task_queue.task_done()
+                        self._finish(task)
                         continue
-                    self.retry_queue.put(task)
+                    self._schedule_retry(task)
 
                 case _:
                     logger.error("Invalid task state {} for task {}", task.result, task.point["title"])
                     self.failed_tasks.append(task)
-                    self.task_queue.task_done()
-
-    @log_error
-    def retry_thread(self):
-        try:
-            while True:
-                task = self.retry_queue.get()
-                self.task_queue.put(task)
-                self.task_queue.task_done() # task_done is not called when a task failed and needs to be retried, so if is reput into the queue, the task num will increase by one and become more than the real task number
-                time.sleep(1)
-        except ShutDown:
-            pass
+                    self._finish(task)
 
 
 def process_chapter(chaoxing: Chaoxing, course:dict[str, Any], point:dict[str, Any], speed:float, config: dict[str, Any] | None = None) -> ChapterResult:
     """处理单个章节
 
-    当所有任务点成功完成时，如果 config 中提供了 chapter_done_callback，
-    则回调通知外部（如 Web 端）更新进度统计。
+    如果 config 中提供了 progress_bus，章节开始、视频进度以及所有任务点成功完成时
+    会发布对应的进度事件，供外部（命令行进度条、Web 端）更新进度统计。
     """
     logger.info(f'当前章节: {point["title"]}')
 
+    progress_bus = config.get("progress_bus") if config else None
     # 通知外部当前章节开始（用于前端显示当前正在学习的章节）
-    if config is not None:
-        start_cb = config.get("chapter_start_callback")
-        if callable(start_cb):
-            try:
-                start_cb(course, point)
-            except Exception as e:
-                logger.debug(f"调用 chapter_start_callback 时出错: {e}")
+    if progress_bus is not None:
+        progress_bus.publish(ChapterStarted(course, point))
     if point["has_finished"]:
         logger.info(f'章节：{point["title"]} 已完成所有任务点')
         # 已经在超星端标记为完成的章节，这里直接视为成功，但不再重复回调
@@ -402,9 +637,8 @@ def process_chapter(chaoxing: Chaoxing, course:dict[str, Any], point:dict[str, A
 
     # TODO: 个别章节很恶心，多到5个点，可以并行处理，将来会让不同课程不同章节的所有任务点共享一个队列，从而实现全局并行
     job_results:list[StudyResult]=[]
-    video_progress_callback = config.get("video_progress_callback") if config else None
     with ThreadPoolExecutor(max_workers=5) as executor:
-        for result in executor.map(lambda job: process_job(chaoxing, course, job, job_info, speed, progress_callback=video_progress_callback), jobs):
+        for result in executor.map(lambda job: process_job(chaoxing, course, job, job_info, speed, progress_bus=progress_bus), jobs):
             job_results.append(result)
     
     for result in job_results:
@@ -412,13 +646,8 @@ def process_chapter(chaoxing: Chaoxing, course:dict[str, Any], point:dict[str, A
             return ChapterResult.ERROR
 
     # 所有任务点均成功，通知外部本章节已完成（用于前端进度统计）
-    if config is not None:
-        callback = config.get("chapter_done_callback")
-        if callable(callback):
-            try:
-                callback(course, point)
-            except Exception as e:
-                logger.debug(f"调用 chapter_done_callback 时出错: {e}")
+    if progress_bus is not None:
+        progress_bus.publish(ChapterDone(course, point))
 
     return ChapterResult.SUCCESS
 
@@ -428,28 +657,19 @@ def process_course(chaoxing: Chaoxing, course:dict[str, Any], config: dict):
     """处理单个课程"""
     logger.info(f"开始学习课程: {course['title']}")
     
-    # 获取当前课程的所有章节
-    point_list = chaoxing.get_course_point(
-        course["courseId"], course["clazzId"], course["cpi"]
-    )
+    # 获取当前课程的所有章节; 流式模式下边解析边处理, 不一次性载入全部章节
+    if int(config.get("stream_window", 0) or 0) > 0:
+        points = chaoxing.iter_course_points(course["courseId"], course["clazzId"], course["cpi"])
+    else:
+        points = chaoxing.get_course_point(
+            course["courseId"], course["clazzId"], course["cpi"]
+        )["points"]
 
     # 为了支持课程任务回滚, 采用下标方式遍历任务点
-
-    _old_format_sizeof = tqdm.format_sizeof
-    tqdm.format_sizeof = format_time
-    tqdm.set_lock(RLock())
-
-    tasks=[]
-
-    for i, point in enumerate(point_list["points"]):
-        task = ChapterTask(point=point, index=i)
-        tasks.append(task)
+    tasks = (ChapterTask(point=point, index=i) for i, point in enumerate(points))
     p = JobProcessor(chaoxing, course, tasks, config)
     p.run()
 
-
-    tqdm.format_sizeof = _old_format_sizeof
-
     """
     while __point_index < len(point_list["points"]):
         point = point_list["points"][__point_index]
@@ -469,6 +689,140 @@ def process_course(chaoxing: Chaoxing, course:dict[str, Any], config: dict):
 
 
 
+def course_worker(worker_id: int, common_config: dict, tiku_config: dict, store: SharedStore, course_queue):
+    """工作进程入口: 从队列领取课程并学习, 章节/视频进度通过共享存储回报给协调进程"""
+    store.attach()
+    chaoxing = init_chaoxing(common_config, tiku_config)
+    # 所有进程共用同一份限速状态, 合计请求频率与单进程时一致
+    chaoxing.rate_limiter = SharedRateLimiter(store, "default", chaoxing.rate_limiter.call_interval)
+    chaoxing.video_log_limiter = SharedRateLimiter(store, "video_log", chaoxing.video_log_limiter.call_interval)
+
+    _login_state = chaoxing.login(login_with_cookies=True)
+    if not _login_state["status"]:
+        logger.error(f"工作进程 {worker_id} 登录失败: {_login_state['msg']}")
+        return
+
+    # 进度事件在本进程内先按频率合并, 再转发给协调进程的进度总线
+    progress_bus = ProgressBus()
+    progress_bus.subscribe(lambda event: store.publish("progress", event),
+                           max_rate=WORKER_PROGRESS_RATE, name="forward")
+    config = dict(common_config)
+    config["progress_bus"] = progress_bus
+
+    try:
+        while True:
+            course = course_queue.get()
+            if course is None:
+                return
+            store.publish("course_start", course)
+            try:
+                process_course(chaoxing, course, config)
+                progress_bus.flush()
+                store.publish("course_done", course, True)
+            except Exception as e:
+                logger.error(f"工作进程 {worker_id} 课程处理失败 {course['title']}: {e}")
+                progress_bus.flush()
+                store.publish("course_done", course, False)
+    finally:
+        progress_bus.close()
+
+
+def run_coordinator(common_config: dict, tiku_config: dict, courses: list[dict]) -> dict[str, bool]:
+    """
+    协调模式: 将课程分配给多个工作进程并行学习
+
+    工作进程按需从队列领取课程, 答案缓存/OCR 缓存/限速状态通过 Manager 共享,
+    进度事件汇总到本进程后重新发布到 common_config 中的 progress_bus(与单进程模式相同),
+    课程开始/结束仍调用 common_config 中的回调。
+    调用前需要已完成登录, 工作进程会复用保存的 cookies。
+
+    Returns:
+        课程ID -> 是否处理成功
+    """
+    processes = max(1, min(int(common_config.get("processes", 1)), len(courses)))
+    logger.info(f"协调模式: {len(courses)} 门课程, {processes} 个工作进程")
+
+    progress_bus = common_config.get("progress_bus")
+    callbacks = {
+        "course_start": common_config.get("course_start_callback"),
+        "course_done": common_config.get("course_done_callback"),
+    }
+    # 回调函数与进度总线无法传递给子进程, 工作进程只拿到普通配置
+    worker_config = {k: v for k, v in common_config.items() if not callable(v) and k != "progress_bus"}
+    worker_config["use_cookies"] = True
+    tiku_config = dict(tiku_config or {})
+
+    cache_dao = CacheDAO()
+    results: dict[str, bool] = {}
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Manager() as manager:
+        store = SharedStore(manager)
+        store.answers.update(cache_dao.load_all())
+        course_queue = manager.Queue()
+        for course in courses:
+            course_queue.put(course)
+        for _ in range(processes):
+            course_queue.put(None)
+
+        workers = [
+            ctx.Process(
+                target=course_worker,
+                args=(i, worker_config, tiku_config, store, course_queue),
+                name=f"course-worker-{i}",
+            )
+            for i in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+
+        def dispatch(kind, args):
+            if kind == "progress":
+                if progress_bus is not None:
+                    progress_bus.publish(args[0])
+                return
+            if kind == "course_done":
+                course, ok = args
+                results[course["courseId"]] = ok
+                # 每门课程结束后把共享答案缓存落盘, 避免协调进程异常退出时丢失
+                cache_dao.update_many(dict(store.answers))
+            callback = callbacks.get(kind)
+            if callable(callback):
+                try:
+                    callback(*args)
+                except Exception as e:
+                    logger.debug(f"调用 {kind} 回调时出错: {e}")
+
+        try:
+            while True:
+                try:
+                    kind, args = store.events.get(timeout=0.5)
+                except queue.Empty:
+                    if not any(worker.is_alive() for worker in workers):
+                        break
+                    continue
+                dispatch(kind, args)
+
+            # 处理进程退出前残留的事件
+            while True:
+                try:
+                    kind, args = store.events.get_nowait()
+                except queue.Empty:
+                    break
+                dispatch(kind, args)
+        finally:
+            for worker in workers:
+                worker.join(timeout=5)
+                if worker.is_alive():
+                    worker.terminate()
+            cache_dao.update_many(dict(store.answers))
+
+    for course in courses:
+        if course["courseId"] not in results:
+            logger.error(f"课程未完成处理(工作进程异常退出): {course['title']}")
+            results[course["courseId"]] = False
+    return results
+
+
 def filter_courses(all_course, course_list):
     """过滤要学习的课程"""
     if not course_list:
@@ -499,23 +853,20 @@ def filter_courses(all_course, course_list):
     return course_task
 
 
-def format_time(num, suffix='', divisor=''):
-    total_time = round(num)
-    sec = total_time % 60
-    mins = (total_time % 3600) // 60
-    hrs = total_time // 3600
-
-    if hrs > 0:
-        return f"{hrs:02d}:{mins:02d}:{sec:02d}"
-
-    return f"{mins:02d}:{sec:02d}"
-
-
 def main():
     """主程序入口"""
+    notification = None
+    progress_bus = None
+    renderer = None
     try:
         # 初始化配置
         common_config, tiku_config, notification_config = init_config()
+
+        # 视频进度通过进度总线发布, 命令行进度条作为订阅者渲染
+        progress_bus = ProgressBus()
+        renderer = TqdmRenderer()
+        progress_bus.subscribe(renderer, max_rate=CLI_PROGRESS_RATE, name="tqdm")
+        common_config["progress_bus"] = progress_bus
         
         # 强制播放按照配置文件调节
         common_config["speed"] = min(2.0, max(1.0, common_config.get("speed", 1.0)))
@@ -543,8 +894,11 @@ def main():
         
         # 开始学习
         logger.info(f"课程列表过滤完毕, 当前课程任务数量: {len(course_task)}")
-        for course in course_task:
-            process_course(chaoxing, course, common_config)
+        if common_config.get("processes", 1) > 1 and len(course_task) > 1:
+            run_coordinator(common_config, tiku_config, course_task)
+        else:
+            for course in course_task:
+                process_course(chaoxing, course, common_config)
         
         logger.info("所有课程学习任务已完成")
         notification.send("chaoxing : 所有课程学习任务已完成")
@@ -563,6 +917,15 @@ def main():
         except Exception:
             pass  # 如果通知发送失败，忽略异常
         raise e
+    finally:
+        if progress_bus is not None:
+            progress_bus.close()
+        # 中断或章节出错时未收到 JobFinished 的进度条需要在这里关闭, 否则会残留在终端上
+        if renderer is not None:
+            renderer.close()
+        # 发送队列中尚未发出的通知后再退出
+        if notification is not None:
+            notification.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,51 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.answer import CacheDAO, Tiku
+from api.answer_index import AnswerIndex, canonical_question, merge_sources
+
+
+class OfflineTiku(Tiku):
+    """只查缓存与答案索引的题库, 在线查询一律失败"""
+
+    def _query(self, q_info):
+        return None
+
+
+@pytest.fixture
+def answer_index(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("CHAOXING_ANSWER_INDEX", str(tmp_path / "answer_index.bin"))
+    monkeypatch.setattr(CacheDAO, "_index", None)
+    monkeypatch.setattr(CacheDAO, "_index_loaded", False)
+
+    def build(records):
+        source = tmp_path / "export.jsonl"
+        source.write_text(
+            "\n".join(json.dumps(record, ensure_ascii=False) for record in records),
+            encoding="utf-8",
+        )
+        merged, _ = merge_sources([str(source)])
+        AnswerIndex.build(merged, tmp_path / "answer_index.bin")
+        return merged
+
+    return build
+
+
+def test_canonical_question_strips_number_score_and_spaces():
+    assert canonical_question("12 下列说法正确的是 （2.0分）") == "下列说法正确的是"
+    assert canonical_question(" 3下列说法正确的是（2.0分）") == "下列说法正确的是"
+
+
+def test_imported_numbered_title_is_found_by_query(answer_index):
+    merged = answer_index([{"question": "1 下列说法正确的是（2.0分）", "answer": "A"}])
+    assert list(merged) == ["下列说法正确的是"]
+
+    answer = OfflineTiku().query({"title": "7 下列说法正确的是 （2.0分）", "type": "single"})
+
+    assert answer == "A"
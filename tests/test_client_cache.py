@@ -0,0 +1,75 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api import client_cache
+from api.base import SessionManager
+from api.client_cache import AuthenticatedClientCache
+
+
+class FakeChaoxing:
+    """登录时把共享会话的 _uid 设为账号名"""
+
+    logins = []
+
+    def __init__(self, account, tiku, **kwargs):
+        self.account = account
+
+    def login(self, login_with_cookies=False):
+        time.sleep(0.02)
+        self.logins.append(self.account.username)
+        if self.account.password != "secret":
+            return {"status": False, "msg": "密码错误"}
+        SessionManager.get_session().cookies.set("_uid", self.account.username)
+        return {"status": True, "msg": "登录成功"}
+
+    def _validate_cookie_session(self):
+        return True
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(client_cache, "Chaoxing", FakeChaoxing)
+    monkeypatch.setattr(FakeChaoxing, "logins", [])
+    SessionManager.get_session().cookies.clear()
+    return AuthenticatedClientCache()
+
+
+def test_concurrent_requests_of_one_account_log_in_once(cache):
+    clients = []
+    threads = [
+        threading.Thread(target=lambda: clients.append(cache.acquire("alice", "secret")[0]))
+        for _ in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert FakeChaoxing.logins == ["alice"]
+    assert len({id(client) for client in clients}) == 1
+
+
+def test_other_account_replaces_entry_without_restoring_cookies(cache):
+    alice, _ = cache.acquire("alice", "secret")
+    bob, _ = cache.acquire("bob", "secret")
+    assert bob is not alice
+    assert SessionManager.get_session().cookies.get("_uid") == "bob"
+
+    # 切回 alice 需要重新登录, 而不是把旧 cookies 写回共享会话
+    again, result = cache.acquire("alice", "secret")
+    assert result["status"]
+    assert again is not alice
+    assert FakeChaoxing.logins == ["alice", "bob", "alice"]
+
+
+def test_wrong_password_is_not_served_from_cache(cache):
+    cache.acquire("alice", "secret")
+    client, result = cache.acquire("alice", "wrong")
+    assert client is None
+    assert not result["status"]
@@ -0,0 +1,84 @@
+import os
+import sys
+
+import pytest
+from bs4 import BeautifulSoup
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api import decode
+from api.decode import _extract_points_from_chapter, decode_course_point, iter_course_points
+
+
+def point_html(point_id, title, tips=None, job_count=None):
+    extra = ""
+    if job_count is not None:
+        extra += f'<input class="knowledgeJobCount" value="{job_count}"/>'
+    if tips:
+        extra += f'<span class="bntHoverTips">{tips}</span>'
+    return (
+        f'<li><div id="cur{point_id}" class="chapter_item">'
+        f'<a class="clicktitle">\n  {title}\n</a>{extra}</div></li>'
+    )
+
+
+def make_page(units=40, points_per_unit=3):
+    parts = ['<html><head><meta charset="utf-8"><title>课程</title></head><body>',
+             '<div class="header"><div class="nav">导航</div></div><div class="content">']
+    n = 0
+    for u in range(units):
+        parts.append(f'<div class="chapter_unit unit{u}"><ul>')
+        for _ in range(points_per_unit):
+            tips = ("已完成", "待解锁任务点", None)[n % 3]
+            parts.append(point_html(1000 + n, f"第{n}节 测试章节", tips, job_count=n % 4 if n % 3 == 2 else None))
+            n += 1
+        parts.append('<li><div class="no-id">无编号</div></li></ul></div>')
+    parts.append("</div></body></html>")
+    return "".join(parts)
+
+
+def reference_points(html_text):
+    soup = BeautifulSoup(html_text, "lxml")
+    points = []
+    for chapter_unit in soup.find_all("div", class_="chapter_unit"):
+        points.extend(_extract_points_from_chapter(chapter_unit))
+    return [dict(point) for point in points]
+
+
+@pytest.mark.parametrize("slice_size", [7, 100, 16 * 1024])
+def test_matches_full_parse_across_slices(monkeypatch, slice_size):
+    monkeypatch.setattr(decode, "_COURSE_PAGE_SLICE", slice_size)
+    html_text = make_page()
+    points = [dict(point) for point in iter_course_points(html_text)]
+    assert len(points) == 120
+    assert points == reference_points(html_text)
+    assert points[0]["title"] == "第0节 测试章节"
+    assert points[0]["has_finished"] and points[1]["need_unlock"]
+
+
+def test_decode_course_point_reports_locked():
+    course_point = decode_course_point(make_page(units=2))
+    assert course_point["hasLocked"]
+    assert len(course_point["points"]) == 6
+
+
+def test_points_are_yielded_before_the_page_is_parsed(monkeypatch):
+    monkeypatch.setattr(decode, "_COURSE_PAGE_SLICE", 256)
+    fed = []
+    original = decode.etree.HTMLPullParser.feed
+
+    class RecordingParser(decode.etree.HTMLPullParser):
+        def feed(self, data):
+            fed.append(len(data))
+            return original(self, data)
+
+    monkeypatch.setattr(decode.etree, "HTMLPullParser", RecordingParser)
+    html_text = make_page()
+    points = iter_course_points(html_text)
+    next(points)
+    assert sum(fed) < len(html_text) // 4
+
+
+def test_empty_page():
+    assert list(iter_course_points("")) == []
+    assert list(iter_course_points("<html><body></body></html>")) == []
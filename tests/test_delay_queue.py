@@ -0,0 +1,131 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import main
+from main import ChapterResult, ChapterTask, DelayQueue, JobProcessor, RetryPolicy, ShutDown
+
+
+def make_task(index):
+    return ChapterTask(index=index, point={"id": str(index), "title": f"第{index}章", "has_finished": False})
+
+
+def test_ready_tasks_leave_in_index_order():
+    queue = DelayQueue()
+    for index in (3, 0, 2):
+        queue.put(make_task(index))
+    queue.put(make_task(1), delay=0.05)
+    assert [queue.get().index for _ in range(3)] == [0, 2, 3]
+    start = time.monotonic()
+    assert queue.get().index == 1
+    assert time.monotonic() - start >= 0.04
+
+
+def test_due_retry_goes_before_later_chapters():
+    queue = DelayQueue()
+    queue.put(make_task(0), delay=0.02)
+    time.sleep(0.03)
+    queue.put(make_task(5))
+    assert [queue.get().index, queue.get().index] == [0, 5]
+
+
+def test_wake_only_moves_matching_tasks_earlier():
+    queue = DelayQueue()
+    queue.put(make_task(1), delay=60)
+    queue.put(make_task(2), delay=60)
+    queue.put(make_task(3), delay=0.01)
+    queue.wake(lambda task: task.index == 2, jitter=0.01)
+    assert [queue.get().index, queue.get().index] == [2, 3]
+    # 唤醒不会推迟本来更早就绪的任务
+    queue.put(make_task(4), delay=0.01)
+    queue.wake(lambda task: True, jitter=30)
+    assert queue.get().index == 4
+
+
+def test_shutdown_unblocks_get():
+    queue = DelayQueue()
+    queue.put(make_task(0), delay=60)
+    errors = []
+
+    def consumer():
+        try:
+            queue.get()
+        except ShutDown as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=consumer)
+    thread.start()
+    time.sleep(0.05)
+    queue.shutdown()
+    thread.join(2)
+    assert not thread.is_alive()
+    assert len(errors) == 1
+
+
+def run_processor(monkeypatch, outcome, chapters, jobs=2):
+    """outcome(index, attempts) 返回章节结果, 返回各章节的处理次数与处理器"""
+    attempts = {}
+    lock = threading.Lock()
+
+    def fake_process_chapter(chaoxing, course, point, speed, config=None):
+        index = int(point["id"])
+        with lock:
+            attempts[index] = attempts.get(index, 0) + 1
+            count = attempts[index]
+        return outcome(index, count)
+
+    monkeypatch.setattr(main, "process_chapter", fake_process_chapter)
+    config = {"speed": 1, "jobs": jobs, "notopen_action": "retry", "prefetch": 0, "stream_window": 0}
+    processor = JobProcessor(None, {"courseId": "c"}, [make_task(i) for i in range(chapters)], config)
+    thread = threading.Thread(target=processor.run, daemon=True)
+    start = time.monotonic()
+    thread.start()
+    thread.join(10)
+    assert not thread.is_alive()
+    return attempts, processor, time.monotonic() - start
+
+
+def test_not_open_chapter_parks_until_predecessor_finishes(monkeypatch):
+    done = threading.Event()
+
+    def outcome(index, count):
+        if index == 0:
+            time.sleep(0.3)
+            done.set()
+            return ChapterResult.SUCCESS
+        return ChapterResult.SUCCESS if done.is_set() else ChapterResult.NOT_OPEN
+
+    attempts, processor, elapsed = run_processor(monkeypatch, outcome, chapters=2)
+    # 第 1 章先因未开放而挂起 (兜底延迟 120s), 第 0 章完成后被唤醒, 不计入重试次数
+    assert attempts == {0: 1, 1: 2}
+    assert not processor.failed_tasks
+    assert elapsed < 5
+
+
+def test_not_open_without_predecessor_retries_past_max_tries(monkeypatch):
+    monkeypatch.setitem(
+        main.RETRY_POLICIES, ChapterResult.NOT_OPEN, RetryPolicy(base=0.01, factor=1, max_delay=0.01)
+    )
+
+    def outcome(index, count):
+        return ChapterResult.SUCCESS if count > 7 else ChapterResult.NOT_OPEN
+
+    attempts, processor, _ = run_processor(monkeypatch, outcome, chapters=1, jobs=1)
+    assert attempts == {0: 8}
+    assert not processor.failed_tasks
+
+
+def test_error_gives_up_after_max_tries(monkeypatch):
+    monkeypatch.setitem(
+        main.RETRY_POLICIES, ChapterResult.ERROR, RetryPolicy(base=0.01, factor=1, max_delay=0.01)
+    )
+    attempts, processor, _ = run_processor(
+        monkeypatch, lambda index, count: ChapterResult.ERROR if index == 1 else ChapterResult.SUCCESS, chapters=3
+    )
+    assert attempts == {0: 1, 1: 5, 2: 1}
+    assert [task.index for task in processor.failed_tasks] == [1]
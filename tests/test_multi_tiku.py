@@ -0,0 +1,94 @@
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.answer import MultiTiku, ProviderStats, Tiku
+
+Q_INFO = {"title": "1+1=?", "type": "single", "options": ["A. 1", "B. 2"]}
+
+
+class StubTiku(Tiku):
+    """固定耗时返回固定答案的题库, 以 bad 开头的答案视为与题型不符"""
+
+    def __init__(self, name, answer, delay=0.0):
+        super().__init__()
+        self.name = name
+        self.answer = answer
+        self.delay = delay
+        self.started = []
+        self.finished = threading.Event()
+
+    def _query(self, q_info):
+        self.started.append(time.monotonic())
+        time.sleep(self.delay)
+        self.finished.set()
+        return self.answer
+
+    def accept_answer(self, answer, q_type):
+        return bool(answer) and not answer.startswith("bad")
+
+
+def make_multi(providers, p95=0.05, workers=8):
+    multi = MultiTiku([p.name for p in providers])
+    multi._providers = list(providers)
+    multi._stats = {id(p): ProviderStats(default_latency=p95) for p in providers}
+    multi._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tiku-hedge")
+    return multi
+
+
+def test_fast_primary_answers_alone():
+    primary, backup = StubTiku("primary", "B"), StubTiku("backup", "A")
+    multi = make_multi([primary, backup])
+    assert multi._query(Q_INFO) == "B"
+    assert not backup.started
+
+
+def test_slow_primary_triggers_hedge_after_p95():
+    primary, backup = StubTiku("primary", "B", delay=0.5), StubTiku("backup", "A")
+    multi = make_multi([primary, backup], p95=0.05)
+    start = time.monotonic()
+    assert multi._query(Q_INFO) == "A"
+    elapsed = time.monotonic() - start
+    assert elapsed < 0.4
+    # 对冲请求在首选题库的 p95 耗时之后才发起
+    assert backup.started[0] - primary.started[0] >= 0.04
+
+
+def test_rejected_answer_launches_next_provider_immediately():
+    primary = StubTiku("primary", "bad answer")
+    backup = StubTiku("backup", "A")
+    # 对冲等待很长, 只有立即改用下一个题库才能很快返回
+    multi = make_multi([primary, backup], p95=30)
+    start = time.monotonic()
+    assert multi._query(Q_INFO) == "A"
+    assert time.monotonic() - start < 1
+    assert multi._stats[id(primary)].success_rate() < multi._stats[id(backup)].success_rate()
+
+
+def test_unstarted_hedges_are_cancelled():
+    primary = StubTiku("primary", "B", delay=0.2)
+    backup = StubTiku("backup", "A")
+    # 只有一个工作线程, 对冲请求排在首选请求之后; 首选请求完成后该线程会立即取到对冲请求,
+    # 对冲请求必须在发起查询之前放弃
+    multi = make_multi([primary, backup], p95=0.02, workers=1)
+    assert multi._query(Q_INFO) == "B"
+    multi._executor.shutdown(wait=True)
+    assert not backup.started
+
+
+def test_ranking_prefers_fast_reliable_provider():
+    slow, fast = StubTiku("slow", "B"), StubTiku("fast", "B")
+    multi = make_multi([slow, fast])
+    for _ in range(10):
+        multi._stats[id(slow)].record(2.0, True)
+        multi._stats[id(fast)].record(0.1, True)
+    assert multi._ranked_providers() == [fast, slow]
+
+
+def test_all_providers_fail():
+    multi = make_multi([StubTiku("a", None), StubTiku("b", "bad")], p95=30)
+    assert multi._query(Q_INFO) is None
@@ -0,0 +1,47 @@
+import io
+import os
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.ocr_preprocess import MAX_DIMENSION, decode_image, enhance
+from benchmark.ocr_preprocess_bench import legacy_pipeline, synthetic_corpus
+
+# 模式 0/1 与旧 PIL 流程逐图的平均绝对误差上限 (0~255 灰度), 当前实现实测为 0
+MAX_MAE = 0.5
+
+
+def encode(img):
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def large_image():
+    img = Image.new("RGB", (2600, 900), (235, 235, 235))
+    draw = ImageDraw.Draw(img)
+    for i in range(20):
+        draw.text((20 + 120 * i, 100 + 30 * i), "x^2+y=1", fill=(30, 30, 30))
+    return encode(img)
+
+
+CORPUS = synthetic_corpus(30) + [large_image()]
+
+
+def test_large_images_are_downscaled():
+    base = decode_image(large_image())
+    assert max(base.shape[:2]) == MAX_DIMENSION
+    assert base.shape[:2] == (692, 2000)
+
+
+@pytest.mark.parametrize("mode", [0, 1])
+def test_modes_match_pil_pipeline(mode):
+    for image_bytes in CORPUS:
+        old = legacy_pipeline(image_bytes, mode).astype(np.int16)
+        new = enhance(decode_image(image_bytes), mode).astype(np.int16)
+        assert new.shape == old.shape
+        assert np.abs(old - new).mean() < MAX_MAE
@@ -0,0 +1,45 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.progress import (
+    ChapterDone,
+    ChapterStarted,
+    JobFinished,
+    JobProgress,
+    JobStarted,
+    Subscription,
+    TqdmRenderer,
+)
+
+COURSE = {"courseId": "c1"}
+
+
+def test_pending_events_are_coalesced_per_job_and_chapter():
+    delivered = []
+    # 限频间隔足够长, 后台线程不会在测试期间投递
+    subscription = Subscription(delivered.append, max_rate=0.001)
+    try:
+        for _ in range(100):
+            for i in range(3):
+                point, job = {"id": f"p{i}"}, {"jobid": f"j{i}"}
+                subscription.offer(ChapterStarted(COURSE, point))
+                subscription.offer(JobStarted(COURSE, job, 0.0, 60.0))
+                subscription.offer(JobProgress(COURSE, job, 30.0, 60.0))
+                subscription.offer(JobFinished(COURSE, job, True))
+                subscription.offer(ChapterDone(COURSE, point))
+        assert len(subscription._pending) == 9
+    finally:
+        subscription.close()
+
+    assert [type(event) for event in delivered[:3]] == [JobProgress, JobFinished, ChapterDone]
+    assert len(delivered) == 9
+
+
+def test_renderer_close_closes_unfinished_bars():
+    renderer = TqdmRenderer()
+    renderer(JobStarted(COURSE, {"jobid": "j1", "name": "video"}, 0.0, 60.0))
+    bar = renderer._bars["j1"]
+    renderer.close()
+    assert bar.disable and not renderer._bars
@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.answer import StreamingAnswerDetector
+
+
+def feed_all(chunks):
+    detector = StreamingAnswerDetector()
+    for chunk in chunks:
+        answers = detector.feed(chunk)
+        if answers:
+            return answers, detector
+    return None, detector
+
+
+def split_every(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_without_think_section():
+    answers, detector = feed_all(split_every('{"Answer": ["A", "C"]} 其余内容', 3))
+    assert answers == ["A", "C"]
+    assert detector.text.startswith('{"Answer"')
+
+
+def test_think_tags_split_across_chunks():
+    text = '<think>考虑 {"Answer": ["错误"]} 的情况</think>\n{"Answer": ["B"]}'
+    for size in range(1, 9):
+        answers, detector = feed_all(split_every(text, size))
+        assert answers == ["B"], size
+    # 标签大小写不敏感, 开头允许空白
+    answers, _ = feed_all(["  <THI", "NK>...</Thi", 'nk>{"answer": ["D"]}'])
+    assert answers == ["D"]
+
+
+def test_unfinished_think_section_returns_nothing():
+    answers, detector = feed_all(["<think>", '{"Answer": ["A"]}', "仍在推理"])
+    assert answers is None
+    assert detector.text == '<think>{"Answer": ["A"]}仍在推理'
+
+
+def test_braces_and_quotes_inside_strings():
+    text = '{"Answer": ["f(x) = {x | x > 0}", "他说\\"}\\""]}'
+    for size in (1, 4, len(text)):
+        answers, _ = feed_all(split_every(text, size))
+        assert answers == ["f(x) = {x | x > 0}", '他说"}"']
+
+
+def test_invalid_first_object_is_skipped():
+    text = '示例 {"foo": 1} 以及 {"Answer": "A"} 最终 {"Answer": ["A", "B"]}'
+    answers, _ = feed_all(split_every(text, 5))
+    assert answers == ["A", "B"]
+
+
+def test_long_think_section_is_scanned_linearly():
+    chunk = "推理内容" * 4
+    start = time.process_time()
+    detector = StreamingAnswerDetector()
+    assert detector.feed("<think>") is None
+    for _ in range(20000):
+        assert detector.feed(chunk) is None
+    assert detector.feed('</think>{"Answer": ["A"]}') == ["A"]
+    assert time.process_time() - start < 0.5
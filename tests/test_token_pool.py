@@ -0,0 +1,84 @@
+import os
+import sys
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.answer import TokenPool
+
+
+def make_pool(balances):
+    pool = TokenPool(list(balances), balances.get, refresh_interval=0)
+    pool.refresh()
+    return pool
+
+
+def test_acquire_prefers_least_used_funded_token():
+    pool = make_pool({"token-a": 5, "token-b": 5, "token-c": 0})
+    picked = [pool.acquire() for _ in range(4)]
+    assert picked == ["token-a", "token-b", "token-a", "token-b"]
+
+
+def test_consume_exhausts_token():
+    pool = make_pool({"token-a": 2, "token-b": 0})
+    assert pool.consume(pool.acquire()) == 1
+    assert pool.consume(pool.acquire()) == 0
+    assert pool.acquire() is None
+    # 余额为 0 时继续扣减不会变成负数
+    assert pool.consume("token-a") == 0
+
+
+def test_concurrent_consume_never_overdraws():
+    pool = make_pool({"token-a": 100, "token-b": 100})
+    remaining = []
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            token = pool.acquire()
+            if token is None:
+                return
+            left = pool.consume(token)
+            with lock:
+                remaining.append(left)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert pool.acquire() is None
+    # 每个 Token 的剩余次数逐次递减; acquire 不预占余额, 余额将尽时可能多次扣到 0
+    assert sorted(r for r in remaining if r > 0) == sorted(list(range(1, 100)) * 2)
+    assert remaining.count(0) >= 2
+
+
+def test_failed_fetch_keeps_previous_balance():
+    balances = {"token-a": 3}
+    pool = make_pool(balances)
+    balances["token-a"] = None
+    pool.refresh()
+    assert pool.acquire() == "token-a"
+    assert pool.consume("token-a") == 2
+
+
+def test_refresh_subtracts_concurrent_consumes():
+    started, release = threading.Event(), threading.Event()
+
+    def slow_fetch(token):
+        started.set()
+        release.wait(5)
+        return 10
+
+    pool = TokenPool(["token-a"], lambda token: 10, refresh_interval=0)
+    pool.refresh()
+    pool._fetch_balance = slow_fetch
+    refresher = threading.Thread(target=pool.refresh)
+    refresher.start()
+    started.wait(5)
+    # 刷新请求在途时扣减 3 次, 旧的余额查询结果不能覆盖这些扣减
+    for _ in range(3):
+        pool.consume(pool.acquire())
+    release.set()
+    refresher.join()
+    assert pool.consume(pool.acquire()) == 6
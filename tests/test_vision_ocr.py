@@ -0,0 +1,105 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.vision_ocr import VisionOCRClient, _split_batch_result
+
+
+class StubClient(VisionOCRClient):
+    """用图片内容充当识别结果, 记录每次 API 调用携带的图片"""
+
+    def __init__(self, batch_size=1, provider="openai", drop_marker=False):
+        super().__init__({"provider": provider, "prompt": "识别", "concurrency": 4, "batch_size": batch_size})
+        self.calls = []
+        self.drop_marker = drop_marker
+        self._calls_lock = threading.Lock()
+
+    def _call(self, images, prompt=None):
+        with self._calls_lock:
+            self.calls.append([image.decode() for image in images])
+        time.sleep(0.05)
+        texts = [f"文字{image.decode()}" for image in images]
+        if len(images) == 1:
+            return texts[0]
+        marked = [f"【图片{k}】\n{text}" for k, text in enumerate(texts, 1)]
+        if self.drop_marker:
+            marked = marked[:-1]
+        return "\n".join(marked)
+
+
+def run_concurrently(func, args_list):
+    results = [None] * len(args_list)
+
+    def worker(i, args):
+        results[i] = func(args)
+
+    threads = [threading.Thread(target=worker, args=(i, args)) for i, args in enumerate(args_list)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_requests_share_one_call_per_digest():
+    client = StubClient()
+    requests = [[b"a", b"b"], [b"b", b"c"], [b"a", b"c", b"a"], [b"c"]] * 3
+    results = run_concurrently(client.ocr_many, requests)
+
+    assert results == [[f"文字{image.decode()}" for image in images] for images in requests]
+    called = sorted(image for call in client.calls for image in call)
+    assert called == ["a", "b", "c"]
+    # 已缓存的图片不再调用 API
+    assert client.ocr(b"b") == "文字b"
+    assert len(client.calls) == 3
+
+
+def test_batches_split_by_marker():
+    client = StubClient(batch_size=3)
+    images = [b"1", b"2", b"3", b"4", b"5"]
+    assert client.ocr_many(images) == [f"文字{i}" for i in range(1, 6)]
+    assert sorted(client.calls) == [["1", "2", "3"], ["4", "5"]]
+
+
+def test_marker_mismatch_falls_back_to_single_images():
+    client = StubClient(batch_size=3, drop_marker=True)
+    images = [b"1", b"2", b"3"]
+    assert client.ocr_many(images) == ["文字1", "文字2", "文字3"]
+    assert client.calls == [["1", "2", "3"], ["1"], ["2"], ["3"]]
+
+
+def test_batching_needs_multi_image_provider():
+    client = StubClient(batch_size=3, provider="openai_compatible")
+    assert client.ocr_many([b"1", b"2"]) == ["文字1", "文字2"]
+    assert sorted(client.calls) == [["1"], ["2"]]
+
+
+def test_failed_call_releases_waiters():
+    class FailingClient(StubClient):
+        def _call(self, images, prompt=None):
+            time.sleep(0.2)
+            raise RuntimeError("network down")
+
+    client = FailingClient()
+    errors = []
+
+    def request(_):
+        try:
+            return client.ocr_many([b"x"])
+        except RuntimeError as e:
+            errors.append(e)
+            return None
+
+    results = run_concurrently(request, [None] * 4)
+    # 负责请求的线程收到异常, 等待同一图片的线程得到空结果而不是一直阻塞
+    assert len(errors) == 1
+    assert results.count([""]) == 3
+
+
+def test_split_batch_result():
+    assert _split_batch_result("【图片1】\nx\n【图片2】[空]", 2) == ["x", ""]
+    assert _split_batch_result("【图片1】x", 2) is None
+    assert _split_batch_result("【图片2】y\n【图片1】x", 2) == ["x", "y"]